@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures the collection of synthetic Click, Typer and argparse CLIs for every level of aggregation, reporting the
+time of walking the commands and building the tools, the peak memory allocated while doing so, and the size of the
+serialized response to `tools/list`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import click
+import typer
+from mcp.types import Tool
+
+from pycli_mcp.metadata.interface import get_tool_name
+from pycli_mcp.metadata.query import walk_commands
+from pycli_mcp.server import ToolCatalog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+AGGREGATIONS = ("root", "group", "none", "summary")
+CHOICES = ("a", "b", "c")
+
+
+def get_child_name(index: int, depth: int) -> str:
+    return f"group{index}" if depth > 1 else f"cmd{index}"
+
+
+def create_click_command(name: str, width: int, depth: int, options: int) -> click.Command:
+    if depth == 0:
+        params: list[click.Parameter] = [click.Argument(["name"])]
+        for i in range(options):
+            kind = i % 4
+            if kind == 0:
+                params.append(click.Option([f"--opt{i}"], default="", help=f"Option {i}"))
+            elif kind == 1:
+                params.append(click.Option([f"--opt{i}"], type=int, default=0, help=f"Option {i}"))
+            elif kind == 2:  # noqa: PLR2004
+                params.append(click.Option([f"--opt{i}"], is_flag=True, help=f"Option {i}"))
+            else:
+                params.append(click.Option([f"--opt{i}"], type=click.Choice(CHOICES), default="a", help=f"Option {i}"))
+
+        return click.Command(name, params=params, help=f"Command {name}.", callback=lambda **_: None)
+
+    group = click.Group(name, help=f"Group {name}.")
+    for i in range(width):
+        group.add_command(create_click_command(get_child_name(i, depth), width, depth - 1, options))
+
+    return group
+
+
+def create_typer_callback(name: str, options: int) -> Any:
+    parameters = ["name: str"]
+    for i in range(options):
+        annotation, default = (("str", "''"), ("int", "0"), ("bool", "False"), ("float", "0.0"))[i % 4]
+        parameters.append(f"opt{i}: {annotation} = typer.Option({default}, help='Option {i}')")
+
+    namespace: dict[str, Any] = {"typer": typer}
+    exec(f"def {name}({', '.join(parameters)}):\n    '''Command {name}.'''\n", namespace)  # noqa: S102
+    return namespace[name]
+
+
+def create_typer_app(name: str, width: int, depth: int, options: int) -> typer.Typer:
+    app = typer.Typer(name=name, help=f"Group {name}.", add_completion=False)
+    for i in range(width):
+        child_name = get_child_name(i, depth)
+        if depth > 1:
+            app.add_typer(create_typer_app(child_name, width, depth - 1, options), name=child_name)
+        else:
+            app.command(child_name)(create_typer_callback(child_name, options))
+
+    return app
+
+
+def add_argparse_commands(parser: argparse.ArgumentParser, width: int, depth: int, options: int) -> None:
+    if depth == 0:
+        parser.add_argument("name")
+        for i in range(options):
+            kind = i % 4
+            if kind == 0:
+                parser.add_argument(f"--opt{i}", default="", help=f"Option {i}")
+            elif kind == 1:
+                parser.add_argument(f"--opt{i}", type=int, default=0, help=f"Option {i}")
+            elif kind == 2:  # noqa: PLR2004
+                parser.add_argument(f"--opt{i}", action="store_true", help=f"Option {i}")
+            else:
+                parser.add_argument(f"--opt{i}", choices=CHOICES, default="a", help=f"Option {i}")
+
+        return
+
+    subparsers = parser.add_subparsers(dest=f"command{depth}", required=True)
+    for i in range(width):
+        child_name = get_child_name(i, depth)
+        subparser = subparsers.add_parser(child_name, help=f"Command {child_name}.")
+        add_argparse_commands(subparser, width, depth - 1, options)
+
+
+def create_argparse_parser(name: str, width: int, depth: int, options: int) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=name, description=f"Group {name}.")
+    add_argparse_commands(parser, width, depth, options)
+    return parser
+
+
+GENERATORS: dict[str, Callable[[str, int, int, int], Any]] = {
+    "click": create_click_command,
+    "typer": create_typer_app,
+    "argparse": create_argparse_parser,
+}
+
+
+def collect(command: Any, aggregate: str) -> list[Tool]:
+    # The same tools that the server builds from the collected metadata
+    return [
+        Tool(name=get_tool_name(metadata.path), description=metadata.schema["description"], inputSchema=metadata.schema)
+        for metadata in walk_commands(command, aggregate=aggregate, name="cli")  # type: ignore[arg-type]
+    ]
+
+
+def measure(create: Callable[[], Any], aggregate: str, rounds: int) -> tuple[int, float, int, int]:
+    """
+    Every round collects a new CLI so that memoization of previous rounds does not skew the results.
+
+    Returns:
+        The number of tools, the fastest time of the rounds, the peak memory and the size of `tools/list`.
+    """
+    # The first collection imports the modules of the framework
+    collect(create(), aggregate)
+
+    elapsed = float("inf")
+    for _ in range(rounds):
+        command = create()
+        start = time.perf_counter()
+        tools = collect(command, aggregate)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    # Tracing allocations slows collection down, so memory is measured separately
+    command = create()
+    tracemalloc.start()
+    try:
+        collect(command, aggregate)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return len(tools), elapsed, peak_memory, ToolCatalog(tools).size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=10, help="The number of subcommands of every group (default: 10)")
+    parser.add_argument("--depth", type=int, default=2, help="The number of levels of groups (default: 2)")
+    parser.add_argument("--options", type=int, default=10, help="The number of options per command (default: 10)")
+    parser.add_argument("--rounds", type=int, default=5, help="The number of timed collections (default: 5)")
+    parser.add_argument(
+        "--framework",
+        dest="frameworks",
+        action="append",
+        choices=list(GENERATORS),
+        help="The frameworks to measure, which may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--aggregate",
+        dest="aggregations",
+        action="append",
+        choices=AGGREGATIONS,
+        help="The levels of aggregation to measure, which may be repeated (default: root, group and none)",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{args.width**args.depth} commands in {args.depth} levels of {args.width} subcommands "
+        f"with {args.options} options each"
+    )
+    print(f"{'framework':>9} {'aggregate':>9} {'tools':>6} {'time':>10} {'peak memory':>12} {'tools/list':>11}")
+    for framework in args.frameworks or GENERATORS:
+        generate = GENERATORS[framework]
+        for aggregate in args.aggregations or AGGREGATIONS[:3]:
+            create = partial(generate, "cli", args.width, args.depth, args.options)
+            tools, elapsed, peak_memory, size = measure(create, aggregate, args.rounds)
+            print(
+                f"{framework:>9} {aggregate:>9} {tools:>6} {elapsed * 1000:>8.1f}ms "
+                f"{peak_memory / 1024 / 1024:>9.2f}MiB {size / 1024:>8.1f}KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures the throughput of many concurrent long-running tool calls, comparing the subprocess executor with the
+previous approach of offloading `subprocess.run` to the default thread pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import shutil
+import subprocess
+import sys
+import time
+
+from pycli_mcp.execution.process import SubprocessExecutor
+
+
+async def run_threaded(command: list[str], calls: int) -> None:
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(subprocess.run, command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False)
+            for _ in range(calls)
+        )
+    )
+
+
+async def run_executor(command: list[str], calls: int) -> None:
+    executor = SubprocessExecutor()
+    await executor.start()
+    try:
+        await asyncio.gather(*(executor.execute(command, env={}) for _ in range(calls)))
+    finally:
+        await executor.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=250, help="The number of concurrent calls (default: 250)")
+    parser.add_argument("--duration", type=float, default=1, help="The duration of each call in seconds (default: 1)")
+    args = parser.parse_args()
+
+    if sleep := shutil.which("sleep"):
+        command = [sleep, str(args.duration)]
+    else:
+        command = [sys.executable, "-c", f"import time; time.sleep({args.duration})"]
+
+    for name, runner in (("thread pool", run_threaded), ("executor", run_executor)):
+        start = time.perf_counter()
+        asyncio.run(runner(command, args.calls))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12}: {elapsed:.2f}s for {args.calls} calls ({args.calls / elapsed:.1f} calls/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures constructing the command line of a Click command with many options, comparing the compiled builders with
+the previous approach of branching on the kind of every option for every call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any
+
+import click
+
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.metadata.types.click import ClickCommandMetadata
+
+
+def construct_uncompiled(metadata: ClickCommandMetadata, arguments: dict[str, Any]) -> list[str]:
+    command = metadata.path.split()
+    args: list[Any] = []
+    opts: list[Any] = []
+    flags: list[str] = []
+    for option_name, value in arguments.items():
+        option = metadata.options[option_name]
+        if option.type == "argument":
+            if isinstance(value, list):
+                args.extend(value)
+            else:
+                args.append(value)
+
+            continue
+
+        if option.flag:
+            if value:
+                flags.append(option.flag_name)
+        elif option.multiple:
+            if option.container:
+                for v in value:
+                    opts.append(option.flag_name)
+                    opts.extend(v)
+            else:
+                for v in value:
+                    opts.extend((option.flag_name, v))
+        elif option.container:
+            opts.append(option.flag_name)
+            opts.extend(value)
+        else:
+            opts.extend((option.flag_name, value))
+
+    command.extend(flags)
+    command.extend(map(str, opts))
+    if args:
+        command.append("--")
+        command.extend(map(str, args))
+
+    return command
+
+
+def create_command(options: int) -> tuple[click.Command, dict[str, Any]]:
+    params: list[click.Parameter] = [click.Argument(["sources"], nargs=-1)]
+    arguments: dict[str, Any] = {"sources": ["a", "b"]}
+    for i in range(options):
+        kind = i % 5
+        if kind == 0:
+            params.append(click.Option([f"--text-{i}"]))
+            arguments[f"text_{i}"] = f"value{i}"
+        elif kind == 1:
+            params.append(click.Option([f"--number-{i}"], type=int))
+            arguments[f"number_{i}"] = i
+        elif kind == 2:
+            params.append(click.Option([f"--flag-{i}"], is_flag=True))
+            arguments[f"flag_{i}"] = True
+        elif kind == 3:
+            params.append(click.Option([f"--many-{i}"], multiple=True))
+            arguments[f"many_{i}"] = ["x", "y", "z"]
+        else:
+            params.append(click.Option([f"--pair-{i}"], type=(str, int)))
+            arguments[f"pair_{i}"] = ["k", 1]
+
+    return click.Command("cmd", params=params), arguments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--options", type=int, default=60, help="The number of options (default: 60)")
+    parser.add_argument("--calls", type=int, default=20_000, help="The number of calls to time (default: 20000)")
+    args = parser.parse_args()
+
+    command, arguments = create_command(args.options)
+    (metadata,) = CommandQuery(command, aggregate="none")
+    assert isinstance(metadata, ClickCommandMetadata)
+    assert metadata.construct(arguments) == construct_uncompiled(metadata, arguments)
+
+    print(f"{args.options} options, {len(metadata.construct(arguments))} command line arguments")
+    for name, func in (
+        ("uncompiled", lambda: construct_uncompiled(metadata, arguments)),
+        ("compiled", lambda: metadata.construct(arguments)),
+    ):
+        elapsed = min(timeit.repeat(func, number=args.calls, repeat=5))
+        print(f"{name:>10}: {elapsed / args.calls * 1_000_000:.2f}us per call")
+
+
+if __name__ == "__main__":
+    main()
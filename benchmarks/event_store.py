@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures the throughput of storing events and replaying them to reconnecting clients for the in-memory and SQLite
+event stores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mcp.types import JSONRPCMessage, JSONRPCNotification
+
+from pycli_mcp.events.memory import MemoryEventStore
+from pycli_mcp.events.sqlite import SQLiteEventStore
+
+if TYPE_CHECKING:
+    from mcp.server.streamable_http import EventMessage, EventStore
+
+
+def create_message(index: int, payload: str) -> JSONRPCMessage:
+    return JSONRPCMessage(
+        JSONRPCNotification(
+            jsonrpc="2.0",
+            method="notifications/progress",
+            params={"progressToken": index, "progress": index, "message": payload},
+        )
+    )
+
+
+async def measure(event_store: EventStore, messages: list[JSONRPCMessage], streams: int) -> tuple[float, float, int]:
+    first_event_ids: dict[str, str] = {}
+    start = time.perf_counter()
+    for index, message in enumerate(messages):
+        stream_id = str(index % streams)
+        event_id = await event_store.store_event(stream_id, message)
+        first_event_ids.setdefault(stream_id, event_id)
+
+    append_time = time.perf_counter() - start
+
+    replayed = 0
+
+    async def send(event: EventMessage) -> None:  # noqa: ARG001
+        nonlocal replayed
+        replayed += 1
+
+    start = time.perf_counter()
+    for event_id in first_event_ids.values():
+        await event_store.replay_events_after(event_id, send)
+
+    return append_time, time.perf_counter() - start, replayed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000, help="The number of events to store (default: 50000)")
+    parser.add_argument("--streams", type=int, default=100, help="The number of streams (default: 100)")
+    parser.add_argument("--size", type=int, default=200, help="The size of the payload of events (default: 200)")
+    args = parser.parse_args()
+
+    messages = [create_message(i, "x" * args.size) for i in range(args.events)]
+    # Every stream keeps all of its events so that replays are comparable
+    limits = {"max_events": args.events, "max_bytes": args.events * (args.size + 1024), "max_age": 3600}
+    print(f"{args.events} events across {args.streams} streams with {args.size} byte payloads")
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_store = SQLiteEventStore(Path(directory) / "events.db", **limits)
+        try:
+            for name, event_store in (
+                ("memory", MemoryEventStore(max_streams=args.streams, **limits)),
+                ("sqlite", sqlite_store),
+            ):
+                append_time, replay_time, replayed = asyncio.run(measure(event_store, messages, args.streams))
+                print(
+                    f"{name:>6}: {args.events / append_time:,.0f} appends/s, "
+                    f"{replayed / replay_time:,.0f} replayed events/s"
+                )
+        finally:
+            sqlite_store.close()
+
+
+if __name__ == "__main__":
+    main()
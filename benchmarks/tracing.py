@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures the overhead of the default tracer, which does nothing, by timing the spans that every tool call starts
+on their own and comparing them with the time of entire tool calls that run a command instantly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import timeit
+from typing import TYPE_CHECKING, Any
+
+import click
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from pycli_mcp.tracing import Span, Tracer, get_current_span, use_span
+
+if TYPE_CHECKING:
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+
+class InstantExecutor(CommandExecutor):
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],  # noqa: ARG002
+        timeout: float | None = None,  # noqa: ARG002
+        on_output: OutputCallback | None = None,  # noqa: ARG002
+        output_limit: OutputLimit | None = None,  # noqa: ARG002
+        profile: ResolvedProfile | None = None,  # noqa: ARG002
+    ) -> ExecutionResult:
+        return ExecutionResult(output=" ".join(command), exit_code=0)
+
+
+class CountingSpan(Span):
+    __slots__ = ("tracer",)
+
+    def __init__(self, tracer: CountingTracer) -> None:
+        self.tracer = tracer
+        tracer.spans += 1
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:  # noqa: ARG002
+        return CountingSpan(self.tracer)
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:  # noqa: ARG002
+        self.tracer.events += 1
+
+
+class CountingTracer(Tracer):
+    def __init__(self) -> None:
+        self.spans = 0
+        self.events = 0
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:  # noqa: ARG002
+        return CountingSpan(self)
+
+
+@click.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    pass
+
+
+def trace_tool_call(tracer: Tracer) -> None:
+    # The same spans and events as a tool call that runs a command in a new process
+    with tracer.start_span("tools/call", {"tool": "greet"}) as span:
+        with span.start_span("validate"):
+            pass
+        with span.start_span("construct"):
+            pass
+        with span.start_span("execute") as execute_span, use_span(execute_span):
+            with get_current_span().start_span("spawn"):
+                pass
+            get_current_span().add_event("first_byte")
+            get_current_span().add_event("exit", {"exit_code": 0, "timed_out": False})
+        with span.start_span("serialize"):
+            pass
+
+
+async def call_tools(tracer: Tracer, calls: int) -> float:
+    server = CommandMCPServer([CommandQuery(greet, aggregate="none", executor=InstantExecutor())], tracer=tracer)
+    async with server.executors(), create_connected_server_and_client_session(server.server) as client:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await client.call_tool("greet", {"name": "foo"})
+
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000, help="The number of tool calls (default: 2000)")
+    parser.add_argument("--iterations", type=int, default=200_000, help="The number of span timings (default: 200000)")
+    args = parser.parse_args()
+
+    tracer = Tracer()
+    span_time = timeit.timeit(lambda: trace_tool_call(tracer), number=args.iterations) / args.iterations
+    print(f"no-op spans: {span_time * 1e6:.2f}us per tool call")
+
+    for name, current_tracer in (("no-op", tracer), ("counting", CountingTracer())):
+        elapsed = asyncio.run(call_tools(current_tracer, args.calls))
+        call_time = elapsed / args.calls
+        print(f"{name:>11}: {call_time * 1e6:.1f}us per tool call ({args.calls / elapsed:,.0f} calls/s)")
+        if current_tracer is tracer:
+            print(f"{'':>11}  no-op spans are {span_time / call_time:.2%} of a tool call")
+
+
+if __name__ == "__main__":
+    main()
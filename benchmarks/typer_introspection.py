@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+"""
+Measures collection of a synthetic Typer application, comparing memoized introspection with the previous approach
+of converting the application on every walk and inspecting the signature of a callback for every parameter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import typer
+
+from pycli_mcp.metadata.query import walk_commands
+from pycli_mcp.metadata.types import typer as typer_types
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def create_command(index: int, options: int) -> Any:
+    parameters = ", ".join(f"opt{i}: str = typer.Option('', help='Option {i}')" for i in range(options))
+    namespace: dict[str, Any] = {"typer": typer}
+    exec(f"def cmd{index}(name: str, {parameters}):\n    '''Command {index}.'''\n", namespace)  # noqa: S102
+    return namespace[f"cmd{index}"]
+
+
+def create_app(commands: int, options: int) -> typer.Typer:
+    app = typer.Typer(add_completion=False)
+    for i in range(commands):
+        app.command()(create_command(i, options))
+
+    return app
+
+
+@contextmanager
+def uncached() -> Iterator[None]:
+    from typer.main import get_command
+
+    original_get_typer_command = typer_types.get_typer_command
+    original_get_introspection = typer_types.get_typer_callback_introspection
+    typer_types.get_typer_command = lambda command: (
+        get_command(command) if typer_types.is_typer_app(command) else command
+    )
+    typer_types.get_typer_callback_introspection = typer_types.TyperCallbackIntrospection
+    try:
+        yield
+    finally:
+        typer_types.get_typer_command = original_get_typer_command
+        typer_types.get_typer_callback_introspection = original_get_introspection
+
+
+def measure(app: typer.Typer, aggregate: str) -> float:
+    start = time.perf_counter()
+    for _ in walk_commands(app, aggregate=aggregate, name="app"):  # type: ignore[arg-type]
+        pass
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=500, help="The number of commands (default: 500)")
+    parser.add_argument("--options", type=int, default=10, help="The number of options per command (default: 10)")
+    args = parser.parse_args()
+
+    app = create_app(args.commands, args.options)
+    print(f"{args.commands} commands with {args.options} options each")
+    for aggregate in ("none", "group", "root"):
+        with uncached():
+            baseline = measure(app, aggregate)
+
+        typer_types.TYPER_COMMAND_CACHE.clear()
+        typer_types.TYPER_CALLBACK_CACHE.clear()
+        cold = measure(app, aggregate)
+        warm = measure(app, aggregate)
+        print(
+            f"{aggregate:>6}: uncached {baseline:.3f}s, first walk {cold:.3f}s, repeated walk {warm:.3f}s "
+            f"({baseline / warm:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
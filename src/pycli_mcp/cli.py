@@ -2,15 +2,38 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import json
 import logging
+import os
 import re
 import shutil
-from importlib import import_module
-from typing import Any
+import sys
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import click
 
 from pycli_mcp import CommandMCPServer, CommandQuery
+from pycli_mcp.execution.admission import AdmissionController
+from pycli_mcp.execution.cache import ResultCache
+from pycli_mcp.execution.coalescing import CallCoalescer
+from pycli_mcp.execution.output import OutputLimit
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.execution.profile import ExecutionProfile
+from pycli_mcp.metadata.cache import CatalogCache
+from pycli_mcp.metadata.query import load_spec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mcp.server.streamable_http import EventStore
+    from starlette.applications import Starlette
+
+    from pycli_mcp.execution.interface import CommandExecutor
+
+T = TypeVar("T")
+
+# The options of the command line that worker processes use to rebuild the server
+APP_SETTINGS_ENV_VAR = "PYCLI_MCP_APP_SETTINGS"
 
 
 def configure_project_logging(log_level: str | None, log_config: str | None) -> None:
@@ -44,6 +67,211 @@ def parse_target_option(specs: dict[str, Any], raw_value: str) -> tuple[str, str
     return target_spec, value
 
 
+def parse_tool_option(raw_value: str, value_type: Callable[[str], T]) -> tuple[str, T]:
+    tool_name, sep, value = raw_value.partition("=")
+    if not sep or not tool_name:
+        msg = f"No tool name in option: {raw_value}"
+        raise ValueError(msg)
+
+    try:
+        return tool_name, value_type(value)
+    except ValueError:
+        msg = f"Invalid value in option: {raw_value}"
+        raise ValueError(msg) from None
+
+
+def create_server(
+    *,
+    specs: tuple[str, ...],
+    aggregations: tuple[str, ...],
+    names: tuple[str, ...],
+    includes: tuple[str, ...],
+    excludes: tuple[str, ...],
+    executors: tuple[str, ...],
+    env_include: str | None,
+    env_exclude: str | None,
+    env_vars: tuple[str, ...],
+    cwd: str | None,
+    max_concurrency: int | None,
+    tool_concurrency: tuple[str, ...],
+    max_queue: int | None,
+    queue_timeout: float | None,
+    timeout: float | None,
+    tool_timeouts: tuple[str, ...],
+    grace_period: float | None,
+    output_limit: str | None,
+    tool_output_limits: tuple[str, ...],
+    cache_include: str | None,
+    cache_ttl: float | None,
+    cache_max_entries: int | None,
+    cache_max_bytes: int | None,
+    cache_watch_paths: bool,
+    coalesce_include: str | None,
+    stream: bool,
+    event_store_type: str | None,
+    event_store_path: str | None,
+    event_store_max_events: int | None,
+    event_store_max_bytes: int | None,
+    event_store_max_age: float | None,
+    page_size: int | None,
+    catalog_cache_dir: str | None,
+    strict_types: bool,
+    lazy: bool,
+    debug: bool,
+) -> CommandMCPServer:
+    """
+    Returns:
+        The server configured by the options of the command line, excluding those that control how it runs.
+
+    Raises:
+        ValueError: If a command spec or per-target option is invalid.
+    """
+    # Deduplicate
+    command_specs: dict[str, dict[str, Any]] = {spec: {} for spec in dict.fromkeys(specs)}
+
+    for aggregation_entry in aggregations:
+        target_spec, aggregation = parse_target_option(command_specs, aggregation_entry)
+        command_specs[target_spec]["aggregate"] = aggregation
+
+    for name_entry in names:
+        target_spec, name = parse_target_option(command_specs, name_entry)
+        command_specs[target_spec]["name"] = name
+
+    for include_entry in includes:
+        target_spec, include_pattern = parse_target_option(command_specs, include_entry)
+        command_specs[target_spec]["include"] = re.compile(include_pattern)
+
+    for exclude_entry in excludes:
+        target_spec, exclude_pattern = parse_target_option(command_specs, exclude_entry)
+        command_specs[target_spec]["exclude"] = re.compile(exclude_pattern)
+
+    for executor_entry in executors:
+        target_spec, executor = parse_target_option(command_specs, executor_entry)
+        if executor not in {"subprocess", "inprocess", "fork"}:
+            msg = f"Unknown executor `{executor}` in option: {executor_entry}"
+            raise ValueError(msg)
+
+        command_specs[target_spec]["executor"] = executor
+
+    static_env: dict[str, str] = {}
+    for env_entry in env_vars:
+        key, sep, value = env_entry.partition("=")
+        if not sep or not key:
+            msg = f"Invalid environment variable, expected KEY=VALUE: {env_entry}"
+            raise ValueError(msg)
+
+        static_env[key] = value
+
+    profile = ExecutionProfile(env_include=env_include, env_exclude=env_exclude, env=static_env, cwd=cwd)
+
+    executor_settings: dict[str, Any] = {}
+    if grace_period is not None:
+        executor_settings["grace_period"] = grace_period
+
+    command_queries: list[CommandQuery] = []
+    for spec, data in command_specs.items():
+        obj = load_spec(spec)
+
+        command_executor: CommandExecutor | None = None
+        if data.get("executor") == "inprocess":
+            from pycli_mcp.execution.inprocess import InProcessExecutor
+
+            command_executor = InProcessExecutor(obj)
+        elif data.get("executor") == "fork":
+            from pycli_mcp.execution.fork import ForkServerExecutor
+
+            command_executor = ForkServerExecutor(spec, **executor_settings)
+
+        command_query = CommandQuery(
+            obj,
+            aggregate=data.get("aggregate"),
+            name=data.get("name"),
+            include=data.get("include"),
+            exclude=data.get("exclude"),
+            strict_types=strict_types,
+            lazy=lazy,
+            executor=command_executor,
+            profile=profile,
+            catalog_cache=(
+                None if catalog_cache_dir is None else CatalogCache(catalog_cache_dir, modules=[spec.partition(":")[0]])
+            ),
+        )
+        command_queries.append(command_query)
+
+    tool_limits = dict(parse_tool_option(entry, int) for entry in tool_concurrency)
+    tool_timeout_values = dict(parse_tool_option(entry, float) for entry in tool_timeouts)
+    tool_output_limit_values = dict(parse_tool_option(entry, OutputLimit.parse) for entry in tool_output_limits)
+    admission = AdmissionController(
+        max_concurrency=max_concurrency,
+        tool_concurrency=tool_limits,
+        max_queue=max_queue,
+        queue_timeout=queue_timeout,
+    )
+
+    result_cache = None
+    if cache_include is not None:
+        cache_settings: dict[str, Any] = {"include": cache_include, "watch_paths": cache_watch_paths}
+        if cache_ttl is not None:
+            cache_settings["ttl"] = cache_ttl
+        if cache_max_entries is not None:
+            cache_settings["max_entries"] = cache_max_entries
+        if cache_max_bytes is not None:
+            cache_settings["max_bytes"] = cache_max_bytes
+
+        result_cache = ResultCache(**cache_settings)
+
+    event_store: EventStore | None = None
+    if event_store_type is not None:
+        event_store_settings: dict[str, Any] = {}
+        if event_store_max_events is not None:
+            event_store_settings["max_events"] = event_store_max_events
+        if event_store_max_bytes is not None:
+            event_store_settings["max_bytes"] = event_store_max_bytes
+        if event_store_max_age is not None:
+            event_store_settings["max_age"] = event_store_max_age
+
+        if event_store_type == "sqlite":
+            if event_store_path is None:
+                msg = "The `sqlite` event store requires the `--event-store-path` option"
+                raise ValueError(msg)
+
+            from pycli_mcp.events.sqlite import SQLiteEventStore
+
+            event_store = SQLiteEventStore(event_store_path, **event_store_settings)
+        else:
+            from pycli_mcp.events.memory import MemoryEventStore
+
+            event_store = MemoryEventStore(**event_store_settings)
+
+    app_settings: dict[str, Any] = {}
+    if debug:
+        app_settings["debug"] = True
+
+    server = CommandMCPServer(
+        command_queries,
+        # Resuming streams requires sessions
+        event_store=event_store,
+        stateless=event_store is None,
+        streaming=stream,
+        executor=SubprocessExecutor(**executor_settings),
+        admission=admission,
+        timeout=timeout,
+        tool_timeouts=tool_timeout_values,
+        output_limit=None if output_limit is None else OutputLimit.parse(output_limit),
+        tool_output_limits=tool_output_limit_values,
+        result_cache=result_cache,
+        coalescer=None if coalesce_include is None else CallCoalescer(include=coalesce_include),
+        page_size=page_size,
+        **app_settings,
+    )
+    per_tool_options = {*tool_limits, *tool_timeout_values, *tool_output_limit_values}
+    if unknown_tools := sorted(per_tool_options.difference(server.commands)):
+        msg = f"Unknown tools in per-tool options: {', '.join(unknown_tools)}"
+        raise ValueError(msg)
+
+    return server
+
+
 @click.command(
     context_settings={
         "help_option_names": ["-h", "--help"],
@@ -55,7 +283,7 @@ def parse_target_option(specs: dict[str, Any], raw_value: str) -> tuple[str, str
     "--aggregate",
     "-a",
     "aggregations",
-    type=click.Choice(["root", "group", "none"]),
+    type=click.Choice(["root", "group", "none", "summary"]),
     multiple=True,
     help=(
         "The level of aggregation to use, with less improving type information at the expense "
@@ -86,7 +314,117 @@ def parse_target_option(specs: dict[str, Any], raw_value: str) -> tuple[str, str
     multiple=True,
     help="The regular expression filter to exclude subcommands. Multiple specs make the format: spec=regex",
 )
+@click.option(
+    "--executor",
+    "-x",
+    "executors",
+    multiple=True,
+    help=(
+        "The method used to run commands, either `subprocess` (default), or one of `inprocess` and `fork` for Click "
+        "and Typer commands. Multiple specs make the format: spec=executor"
+    ),
+)
+@click.option("--env-include", help="The regular expression matching environment variables that commands inherit")
+@click.option(
+    "--env-exclude", help="The regular expression matching environment variables that commands do not inherit"
+)
+@click.option(
+    "--env",
+    "env_vars",
+    multiple=True,
+    help="An environment variable to set for every command (multiple allowed) e.g. KEY=VALUE",
+)
+@click.option("--cwd", help="The working directory of commands (default: the current directory)")
+@click.option("--max-concurrency", type=int, help="The maximum number of tool calls running at the same time")
+@click.option(
+    "--tool-concurrency",
+    "tool_concurrency",
+    multiple=True,
+    help="The maximum number of calls running at the same time for a tool (multiple allowed) e.g. tool=limit",
+)
+@click.option("--max-queue", type=int, help="The maximum number of tool calls waiting to run before rejecting calls")
+@click.option("--queue-timeout", type=float, help="The maximum number of seconds a tool call may wait to run")
+@click.option("--timeout", type=float, help="The number of seconds after which commands are stopped")
+@click.option(
+    "--tool-timeout",
+    "tool_timeouts",
+    multiple=True,
+    help="The number of seconds after which commands of a tool are stopped (multiple allowed) e.g. tool=seconds",
+)
+@click.option(
+    "--grace-period",
+    type=float,
+    help="The number of seconds to wait for stopped commands to exit before killing them (default: 5)",
+)
+@click.option(
+    "--output-limit",
+    help="The number of bytes of output kept for every command as either BYTES or HEAD:TAIL, discarding the middle",
+)
+@click.option(
+    "--tool-output-limit",
+    "tool_output_limits",
+    multiple=True,
+    help="The number of bytes of output kept for a tool (multiple allowed) e.g. tool=bytes or tool=head:tail",
+)
+@click.option("--cache", "cache_include", help="The regular expression matching tools whose results are cached")
+@click.option("--cache-ttl", type=float, help="The number of seconds for which cached results are reused (default: 60)")
+@click.option("--cache-max-entries", type=int, help="The maximum number of cached results (default: 1024)")
+@click.option("--cache-max-bytes", type=int, help="The maximum total size of cached output (default: 64 MiB)")
+@click.option(
+    "--cache-watch-paths",
+    is_flag=True,
+    help="Invalidate cached results when files passed to path parameters are modified",
+)
+@click.option(
+    "--coalesce",
+    "coalesce_include",
+    help="The regular expression matching tools whose identical concurrent calls share a single run",
+)
+@click.option(
+    "--stream", is_flag=True, help="Forward command output to clients as progress notifications while it runs"
+)
+@click.option(
+    "--event-store",
+    "event_store_type",
+    type=click.Choice(["memory", "sqlite"]),
+    help="Keep recent events so that clients may resume streams after reconnecting, which enables stateful sessions",
+)
+@click.option("--event-store-path", help="The path to the database used by the `sqlite` event store")
+@click.option("--event-store-max-events", type=int, help="The maximum number of events kept per stream (default: 1024)")
+@click.option(
+    "--event-store-max-bytes", type=int, help="The maximum total size of events kept per stream (default: 1 MiB)"
+)
+@click.option(
+    "--event-store-max-age", type=float, help="The number of seconds for which events are kept (default: 300)"
+)
+@click.option(
+    "--page-size", type=click.IntRange(min=1), help="The maximum number of tools in each response to tools/list"
+)
+@click.option(
+    "--catalog-cache",
+    "catalog_cache_dir",
+    help="The directory used to cache collected command metadata between runs",
+)
 @click.option("--strict-types", is_flag=True, help="Error on unknown types")
+@click.option(
+    "--lazy",
+    is_flag=True,
+    help=(
+        "Only list the names of subcommands of Click groups that load them lazily, rather than importing them. "
+        "Other types of commands are not supported"
+    ),
+)
+@click.option(
+    "--transport",
+    type=click.Choice(["http", "stdio"]),
+    default="http",
+    help="The transport used to serve clients, `stdio` is for clients that start the server themselves (default: http)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="The number of worker processes, each serving its own instance of the server (default: 1)",
+)
 @click.option("--debug", is_flag=True, help="Enable debug mode")
 @click.option("--host", help="The host used to run the server (default: 127.0.0.1)")
 @click.option("--port", type=int, help="The port used to run the server (default: 8000)")
@@ -104,18 +442,14 @@ def parse_target_option(specs: dict[str, Any], raw_value: str) -> tuple[str, str
 def pycli_mcp(
     ctx: click.Context,
     *,
-    specs: tuple[str, ...],
-    aggregations: tuple[str, ...],
-    names: tuple[str, ...],
-    includes: tuple[str, ...],
-    excludes: tuple[str, ...],
-    strict_types: bool,
-    debug: bool,
+    transport: str,
+    workers: int | None,
     host: str | None,
     port: int | None,
     log_level: str | None,
     log_config: str | None,
     options: tuple[tuple[str, str], ...],
+    **settings: Any,
 ) -> None:
     """
     \b
@@ -147,63 +481,28 @@ def pycli_mcp(
     Raises:
         ValueError: If a command spec or per-target option is invalid.
     """
-    if not specs:
+    if not settings["specs"]:
         click.echo(ctx.get_help())
         return
 
-    # Deduplicate
-    command_specs: dict[str, dict[str, Any]] = {spec: {} for spec in dict.fromkeys(specs)}
-
-    for aggregation_entry in aggregations:
-        target_spec, aggregation = parse_target_option(command_specs, aggregation_entry)
-        command_specs[target_spec]["aggregate"] = aggregation
-
-    for name_entry in names:
-        target_spec, name = parse_target_option(command_specs, name_entry)
-        command_specs[target_spec]["name"] = name
-
-    for include_entry in includes:
-        target_spec, include_pattern = parse_target_option(command_specs, include_entry)
-        command_specs[target_spec]["include"] = re.compile(include_pattern)
-
-    for exclude_entry in excludes:
-        target_spec, exclude_pattern = parse_target_option(command_specs, exclude_entry)
-        command_specs[target_spec]["exclude"] = re.compile(exclude_pattern)
-
-    command_queries: list[CommandQuery] = []
-    spec_pattern = re.compile(r"^(?P<spec>(?P<module>[\w.]+):(?P<attr>[\w.]+))$")
-    for spec, data in command_specs.items():
-        match = spec_pattern.search(spec)
-        if match is None:
-            msg = f"Invalid spec: {spec}"
-            raise ValueError(msg)
-
-        obj = import_module(match.group("module"))
-        for attr in match.group("attr").split("."):
-            obj = getattr(obj, attr)
-
-        command_query = CommandQuery(
-            obj,
-            aggregate=data.get("aggregate"),
-            name=data.get("name"),
-            include=data.get("include"),
-            exclude=data.get("exclude"),
-            strict_types=strict_types,
-        )
-        command_queries.append(command_query)
+    if workers is not None and transport == "stdio":
+        msg = "Multiple workers are not supported by the stdio transport"
+        raise ValueError(msg)
+    if workers is not None and settings["event_store_type"] is not None:
+        msg = "Multiple workers are not supported by event stores, which require sessions that belong to one worker"
+        raise ValueError(msg)
 
-    app_settings: dict[str, Any] = {}
-    if debug:
-        app_settings["debug"] = True
+    server = create_server(**settings)
 
-    server = CommandMCPServer(command_queries, stateless=True, **app_settings)
-    if debug:
+    # Standard output is reserved for messages when using the stdio transport
+    output = sys.stderr if transport == "stdio" else sys.stdout
+    if settings["debug"]:
         from pprint import pprint
 
-        pprint({c.metadata.path: c.metadata.schema for c in server.commands.values()})
+        pprint({c.metadata.path: c.metadata.schema for c in server.commands.values()}, stream=output)
     else:
         for command in server.commands.values():
-            print(f"Serving: {command.metadata.path}")
+            print(f"Serving: {command.metadata.path}", file=output)
 
     server_settings: dict[str, Any] = {}
     if host is not None:
@@ -219,7 +518,42 @@ def pycli_mcp(
         server_settings.setdefault(key, value)
 
     configure_project_logging(log_level, log_config)
-    server.run(**server_settings)
+    if transport == "stdio":
+        server.run_stdio()
+    elif workers is not None:
+        import uvicorn
+
+        # Every worker process rebuilds the server from the same options, and the variable is only kept for as long
+        # as workers may be started so that commands never inherit it
+        os.environ[APP_SETTINGS_ENV_VAR] = json.dumps({
+            "settings": settings,
+            "log_level": log_level,
+            "log_config": log_config,
+        })
+        try:
+            uvicorn.run(f"{__name__}:create_app", factory=True, workers=workers, **server_settings)
+        finally:
+            os.environ.pop(APP_SETTINGS_ENV_VAR, None)
+    else:
+        server.run(**server_settings)
+
+
+def create_app() -> Starlette:
+    """
+    The application factory used by the worker processes started with the `--workers` option.
+
+    Returns:
+        The application of the server configured by the options of the command line.
+    """
+    # The commands that the worker runs must not inherit the settings
+    data = json.loads(os.environ.pop(APP_SETTINGS_ENV_VAR))
+    configure_project_logging(data["log_level"], data["log_config"])
+
+    # Options that may be passed multiple times are encoded as arrays
+    settings: dict[str, Any] = {
+        key: tuple(value) if isinstance(value, list) else value for key, value in data["settings"].items()
+    }
+    return create_server(**settings).create_app()
 
 
 def main() -> None:
@@ -0,0 +1,14 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from mcp.types import JSONRPCMessage
+
+
+def encode_message(message: JSONRPCMessage) -> bytes:
+    # Stored events are bounded by the size of what would be sent to clients
+    return message.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")
+
+
+def decode_message(data: bytes) -> JSONRPCMessage:
+    return JSONRPCMessage.model_validate_json(data)
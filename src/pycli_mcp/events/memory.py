@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import itertools
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING
+
+from mcp.server.streamable_http import EventMessage, EventStore
+
+from pycli_mcp.events.encoding import decode_message, encode_message
+
+if TYPE_CHECKING:
+    from mcp.server.streamable_http import EventCallback, EventId, StreamId
+    from mcp.types import JSONRPCMessage
+
+
+class StreamBuffer:
+    __slots__ = ("events", "last_dropped", "size")
+
+    def __init__(self) -> None:
+        # Sequence number, creation time and encoded message, which is `None` for priming events
+        self.events: deque[tuple[int, float, bytes | None]] = deque()
+        self.size = 0
+        # The sequence number of the newest event that was dropped
+        self.last_dropped = 0
+
+    def pop_oldest(self) -> None:
+        self.last_dropped, _, data = self.events.popleft()
+        if data is not None:
+            self.size -= len(data)
+
+
+class MemoryEventStore(EventStore):
+    """
+    An [event store](https://github.com/modelcontextprotocol/python-sdk/blob/v1.9.4/src/mcp/server/streamable_http.py#L79)
+    that keeps recent events in memory so that clients may reconnect to a stream and receive the events that they
+    missed. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.events.memory import MemoryEventStore
+
+    from mypkg.cli import cmd
+
+    server = CommandMCPServer(commands=[cmd], event_store=MemoryEventStore(max_age=60), streaming=True)
+    server.run()
+    ```
+
+    Every stream has its own buffer from which the oldest events are dropped when either of its limits is reached or
+    when they expire. The streams that received events least recently are dropped when there are too many. Clients
+    cannot resume a stream once events after the last one they received were dropped, rather than miss some of them.
+
+    Parameters:
+        max_events: The maximum number of events kept for each stream.
+        max_bytes: The maximum total size of the messages kept for each stream.
+        max_age: The number of seconds for which events are kept.
+        max_streams: The maximum number of streams for which events are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_events: int = 1024,
+        max_bytes: int = 1024 * 1024,
+        max_age: float = 300,
+        max_streams: int = 1024,
+    ) -> None:
+        self.__max_events = max_events
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
+        self.__max_streams = max_streams
+        self.__streams: OrderedDict[StreamId, StreamBuffer] = OrderedDict()
+        self.__sequence = itertools.count(1)
+
+    # The transport checks the truthiness of event stores, so this must not be `__len__`
+    @property
+    def count(self) -> int:
+        """
+        Returns:
+            The number of events kept for all streams.
+        """
+        return sum(len(buffer.events) for buffer in self.__streams.values())
+
+    @property
+    def size(self) -> int:
+        """
+        Returns:
+            The total size of the messages kept for all streams.
+        """
+        return sum(buffer.size for buffer in self.__streams.values())
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage | None) -> EventId:
+        now = time.monotonic()
+        data = None if message is None else encode_message(message)
+        if (buffer := self.__streams.get(stream_id)) is None:
+            buffer = self.__streams[stream_id] = StreamBuffer()
+        else:
+            self.__streams.move_to_end(stream_id)
+
+        sequence = next(self.__sequence)
+        buffer.events.append((sequence, now, data))
+        if data is not None:
+            buffer.size += len(data)
+
+        while len(buffer.events) > self.__max_events or buffer.size > self.__max_bytes:
+            buffer.pop_oldest()
+
+        while len(self.__streams) > self.__max_streams:
+            self.__streams.popitem(last=False)
+
+        self.__expire_events(buffer, now)
+        self.__expire_streams(now)
+        return f"{sequence}:{stream_id}"
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        sequence, sep, stream_id = last_event_id.partition(":")
+        if not sep or not sequence.isdigit() or (buffer := self.__streams.get(stream_id)) is None:
+            return None
+
+        self.__expire_events(buffer, time.monotonic())
+        last_sequence = int(sequence)
+        # Events after the last one that the client received were dropped, so replaying would leave a gap
+        if last_sequence < buffer.last_dropped:
+            return None
+
+        # New events may be stored while the callback sends events
+        for event_sequence, _, data in list(buffer.events):
+            if event_sequence > last_sequence and data is not None:
+                await send_callback(EventMessage(decode_message(data), f"{event_sequence}:{stream_id}"))
+
+        return stream_id
+
+    def __expire_events(self, buffer: StreamBuffer, now: float) -> None:
+        cutoff = now - self.__max_age
+        while buffer.events and buffer.events[0][1] < cutoff:
+            buffer.pop_oldest()
+
+    def __expire_streams(self, now: float) -> None:
+        # Streams are ordered by when they last received an event, so expiry stops at the first stream with a
+        # recent event
+        cutoff = now - self.__max_age
+        while self.__streams:
+            buffer = next(iter(self.__streams.values()))
+            if buffer.events and buffer.events[-1][1] >= cutoff:
+                break
+
+            self.__streams.popitem(last=False)
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+from mcp.server.streamable_http import EventMessage, EventStore
+
+from pycli_mcp.events.encoding import decode_message, encode_message
+
+if TYPE_CHECKING:
+    import os
+
+    from mcp.server.streamable_http import EventCallback, EventId, StreamId
+    from mcp.types import JSONRPCMessage
+
+# The minimum number of seconds between removals of expired events
+EXPIRY_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    size INTEGER NOT NULL,
+    message BLOB
+);
+CREATE INDEX IF NOT EXISTS events_by_stream ON events (stream_id, id);
+CREATE INDEX IF NOT EXISTS events_by_creation ON events (created);
+"""
+
+
+class SQLiteEventStore(EventStore):
+    """
+    An [event store](https://github.com/modelcontextprotocol/python-sdk/blob/v1.9.4/src/mcp/server/streamable_http.py#L79)
+    backed by an SQLite database in [WAL](https://www.sqlite.org/wal.html) mode, so that events survive restarts of
+    the server. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.events.sqlite import SQLiteEventStore
+
+    from mypkg.cli import cmd
+
+    server = CommandMCPServer(commands=[cmd], event_store=SQLiteEventStore("events.db"), streaming=True)
+    server.run()
+    ```
+
+    The limits are the same as those of the [in-memory store][pycli_mcp.events.memory.MemoryEventStore], except
+    that expired streams are removed along with their events. Writes are not synced to disk after every event, so
+    the most recent events may be lost if the machine rather than the server stops.
+
+    Parameters:
+        path: The path to the database, which is created if it does not exist.
+        max_events: The maximum number of events kept for each stream.
+        max_bytes: The maximum total size of the messages kept for each stream.
+        max_age: The number of seconds for which events are kept.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_events: int = 1024,
+        max_bytes: int = 1024 * 1024,
+        max_age: float = 300,
+    ) -> None:
+        self.__max_events = max_events
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
+        # Statements run in autocommit mode, each being short enough to not block the event loop for long
+        self.__connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+        # The number and total size of the events of streams, loaded when a stream first receives an event
+        self.__streams: dict[StreamId, list[int]] = {}
+        self.__last_expiry = 0.0
+
+    # The transport checks the truthiness of event stores, so this must not be `__len__`
+    @property
+    def count(self) -> int:
+        """
+        Returns:
+            The number of events kept for all streams.
+        """
+        return self.__connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage | None) -> EventId:
+        now = time.time()
+        if now - self.__last_expiry >= EXPIRY_INTERVAL:
+            self.__connection.execute("DELETE FROM events WHERE created < ?", (now - self.__max_age,))
+            self.__streams.clear()
+            self.__last_expiry = now
+
+        if (stats := self.__streams.get(stream_id)) is None:
+            count, size = self.__connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM events WHERE stream_id = ?", (stream_id,)
+            ).fetchone()
+            stats = self.__streams[stream_id] = [count, size]
+
+        data = None if message is None else encode_message(message)
+        event_size = 0 if data is None else len(data)
+        cursor = self.__connection.execute(
+            "INSERT INTO events (stream_id, created, size, message) VALUES (?, ?, ?, ?)",
+            (stream_id, now, event_size, data),
+        )
+        stats[0] += 1
+        stats[1] += event_size
+        if stats[0] > self.__max_events or stats[1] > self.__max_bytes:
+            self.__trim_stream(stream_id, stats)
+
+        return str(cursor.lastrowid)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        if not last_event_id.isdigit():
+            return None
+
+        # Events are removed oldest first, so the stream cannot be replayed without gaps once the last event that
+        # the client received is removed or has expired
+        cutoff = time.time() - self.__max_age
+        row = self.__connection.execute(
+            "SELECT stream_id FROM events WHERE id = ? AND created >= ?", (int(last_event_id), cutoff)
+        ).fetchone()
+        if row is None:
+            return None
+
+        stream_id: StreamId = row[0]
+        events = self.__connection.execute(
+            "SELECT id, message FROM events WHERE stream_id = ? AND id > ? ORDER BY id", (stream_id, int(last_event_id))
+        ).fetchall()
+        for event_id, data in events:
+            if data is not None:
+                await send_callback(EventMessage(decode_message(data), str(event_id)))
+
+        return stream_id
+
+    def __trim_stream(self, stream_id: StreamId, stats: list[int]) -> None:
+        last_removed = None
+        if stats[0] > self.__max_events:
+            # The newest event to remove for the limit on the number of events is found through the index
+            last_removed, count, size = self.__connection.execute(
+                """
+                SELECT MAX(id), COUNT(*), COALESCE(SUM(size), 0) FROM events WHERE stream_id = ? AND id <= (
+                    SELECT id FROM events WHERE stream_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+                """,
+                (stream_id, stream_id, self.__max_events),
+            ).fetchone()
+            stats[0] -= count
+            stats[1] -= size
+
+        if stats[1] > self.__max_bytes:
+            # Only the events that must be removed are read, starting from the oldest
+            cursor = self.__connection.execute(
+                "SELECT id, size FROM events WHERE stream_id = ? AND id > ? ORDER BY id",
+                (stream_id, last_removed or 0),
+            )
+            for event_id, event_size in cursor:
+                if stats[1] <= self.__max_bytes:
+                    break
+
+                stats[0] -= 1
+                stats[1] -= event_size
+                last_removed = event_id
+
+            cursor.close()
+
+        if last_removed is not None:
+            self.__connection.execute("DELETE FROM events WHERE stream_id = ? AND id <= ?", (stream_id, last_removed))
@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class ServerBusyError(Exception):
+    pass
+
+
+class AdmissionController:
+    """
+    Limits the number of tool calls that run at the same time. Calls that cannot run immediately wait in a bounded
+    queue, and are rejected when the queue is full or they wait for too long. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.execution.admission import AdmissionController
+
+    from mypkg.cli import cmd
+
+    admission = AdmissionController(max_concurrency=8, tool_concurrency={"cmd.build": 1}, max_queue=32)
+    server = CommandMCPServer(commands=[cmd], admission=admission)
+    server.run()
+    ```
+
+    Parameters:
+        max_concurrency: The maximum number of tool calls running at the same time across all tools.
+        tool_concurrency: The maximum number of calls running at the same time for specific tool names.
+        max_queue: The maximum number of calls waiting to run, beyond which calls are rejected immediately.
+        queue_timeout: The maximum number of seconds a call may wait to run before being rejected.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        tool_concurrency: dict[str, int] | None = None,
+        max_queue: int | None = None,
+        queue_timeout: float | None = None,
+    ) -> None:
+        self.__global_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        self.__tool_semaphores = {name: asyncio.Semaphore(limit) for name, limit in (tool_concurrency or {}).items()}
+        self.__max_queue = max_queue
+        self.__queue_timeout = queue_timeout
+        self.__waiting = 0
+        self.__running = 0
+
+    @property
+    def tool_names(self) -> list[str]:
+        """
+        Returns:
+            The tool names that have their own concurrency limit.
+        """
+        return list(self.__tool_semaphores)
+
+    @property
+    def waiting(self) -> int:
+        return self.__waiting
+
+    @property
+    def running(self) -> int:
+        return self.__running
+
+    @asynccontextmanager
+    async def admit(self, tool_name: str) -> AsyncIterator[float]:
+        """
+        Yields:
+            The number of seconds the call waited to run.
+
+        Raises:
+            ServerBusyError: If the call cannot be admitted.
+        """
+        # The tool limit is acquired first so that waiting for it never holds a global slot
+        semaphores = [
+            semaphore
+            for semaphore in (self.__tool_semaphores.get(tool_name), self.__global_semaphore)
+            if semaphore is not None
+        ]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if any(semaphore.locked() for semaphore in semaphores):
+            await self.__wait(semaphores)
+        else:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+
+        waited = loop.time() - start
+        self.__running += 1
+        try:
+            yield waited
+        finally:
+            self.__running -= 1
+            for semaphore in semaphores:
+                semaphore.release()
+
+    async def __wait(self, semaphores: list[asyncio.Semaphore]) -> None:
+        if self.__max_queue is not None and self.__waiting >= self.__max_queue:
+            msg = "Server busy: too many tool calls are waiting to run, try again later"
+            raise ServerBusyError(msg)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if self.__queue_timeout is None else loop.time() + self.__queue_timeout
+        acquired: list[asyncio.Semaphore] = []
+        self.__waiting += 1
+        try:
+            for semaphore in semaphores:
+                timeout = None if deadline is None else max(0, deadline - loop.time())
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+                acquired.append(semaphore)
+        except asyncio.TimeoutError:
+            for semaphore in acquired:
+                semaphore.release()
+
+            msg = f"Server busy: the tool call waited more than {self.__queue_timeout} seconds to run, try again later"
+            raise ServerBusyError(msg) from None
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            self.__waiting -= 1
@@ -0,0 +1,220 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from pycli_mcp.execution.selection import ToolSelector
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Sequence
+
+    from pycli_mcp.execution.interface import ExecutionResult
+
+
+def get_cache_key(tool_name: str, arguments: dict[str, Any] | None) -> str:
+    # Equivalent arguments must produce the same key regardless of the order in which they were sent
+    return f"{tool_name}\0{json.dumps(arguments or {}, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+def get_modification_times(paths: Sequence[str]) -> tuple[int | None, ...]:
+    times: list[int | None] = []
+    for path in paths:
+        try:
+            times.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            times.append(None)
+
+    return tuple(times)
+
+
+class CacheEntry:
+    __slots__ = ("__expires", "__modification_times", "__paths", "__result", "__size")
+
+    def __init__(
+        self,
+        *,
+        result: ExecutionResult,
+        expires: float,
+        size: int,
+        paths: Sequence[str],
+        modification_times: tuple[int | None, ...],
+    ) -> None:
+        self.__result = result
+        self.__expires = expires
+        self.__size = size
+        self.__paths = paths
+        self.__modification_times = modification_times
+
+    @property
+    def result(self) -> ExecutionResult:
+        return self.__result
+
+    @property
+    def expires(self) -> float:
+        return self.__expires
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def paths(self) -> Sequence[str]:
+        return self.__paths
+
+    @property
+    def modification_times(self) -> tuple[int | None, ...]:
+        return self.__modification_times
+
+
+class ResultCache:
+    """
+    Memoizes the results of tool calls so that repeated calls with the same arguments do not run the command
+    again. Only enable this for tools that do not have side effects. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.execution.cache import ResultCache
+
+    from mypkg.cli import cmd
+
+    cache = ResultCache(include=r"\\.(status|list|describe)$", ttl=30)
+    server = CommandMCPServer(commands=[cmd], result_cache=cache)
+    server.run()
+    ```
+
+    Only successful results are cached. Entries expire after the time-to-live, and the least recently used entries
+    are evicted when either limit is reached.
+
+    Parameters:
+        include: A regular expression matching the names of tools whose results are cached. If `None`, all tools
+            are cached.
+        exclude: A regular expression matching the names of tools whose results are not cached.
+        ttl: The number of seconds for which results are reused.
+        max_entries: The maximum number of cached results.
+        max_bytes: The maximum total size of the output of cached results.
+        watch_paths: Whether to invalidate results when the modification time of files passed to path or file
+            parameters changes.
+    """
+
+    def __init__(
+        self,
+        *,
+        include: str | re.Pattern | None = None,
+        exclude: str | re.Pattern | None = None,
+        ttl: float = 60,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        watch_paths: bool = False,
+    ) -> None:
+        self.__selector = ToolSelector(include=include, exclude=exclude)
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__watch_paths = watch_paths
+        self.__entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def watch_paths(self) -> bool:
+        return self.__watch_paths
+
+    @property
+    def size(self) -> int:
+        """
+        Returns:
+            The total size of the output of cached results.
+        """
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def enabled(self, tool_name: str) -> bool:
+        return self.__selector(tool_name)
+
+    def get(self, key: str) -> ExecutionResult | None:
+        """
+        Returns:
+            The cached result, if it is still valid.
+        """
+        if (entry := self.__entries.get(key)) is None:
+            self.__misses += 1
+            return None
+
+        if entry.expires <= time.monotonic() or (
+            entry.paths and get_modification_times(entry.paths) != entry.modification_times
+        ):
+            self.__remove(key)
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry.result
+
+    def set(
+        self,
+        key: str,
+        result: ExecutionResult,
+        *,
+        paths: Sequence[str] = (),
+        modification_times: tuple[int | None, ...] | None = None,
+    ) -> None:
+        """
+        Parameters:
+            key: The key returned by `get_cache_key`.
+            result: The result of the tool call, which is ignored unless it is successful.
+            paths: The files that the result depends on, which are only used if `watch_paths` is enabled.
+            modification_times: The modification times of the paths from before the command ran, so that changes
+                made while it was running also invalidate the result. If `None`, they are read now.
+        """
+        if result.exit_code or result.timed_out:
+            return
+
+        size = len(result.output.encode("utf-8"))
+        if size > self.__max_bytes:
+            return
+
+        if key in self.__entries:
+            self.__remove(key)
+
+        if not self.__watch_paths:
+            paths = ()
+            modification_times = ()
+        elif modification_times is None:
+            modification_times = get_modification_times(paths)
+
+        self.__entries[key] = CacheEntry(
+            result=result,
+            expires=time.monotonic() + self.__ttl,
+            size=size,
+            paths=paths,
+            modification_times=modification_times,
+        )
+        self.__size += size
+        while len(self.__entries) > self.__max_entries or self.__size > self.__max_bytes:
+            self.__remove(next(iter(self.__entries)))
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__size = 0
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key)
+        self.__size -= entry.size
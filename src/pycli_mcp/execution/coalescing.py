@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from pycli_mcp.execution.selection import ToolSelector
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Awaitable, Callable, Hashable
+
+T = TypeVar("T")
+
+
+class Flight(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[T]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class CallCoalescer:
+    """
+    Shares a single run between identical tool calls that are in flight at the same time, so that every caller
+    receives the result of one command. Only enable this for tools that do not have side effects, since callers
+    that would have run the command separately see a single run. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.execution.coalescing import CallCoalescer
+
+    from mypkg.cli import cmd
+
+    server = CommandMCPServer(commands=[cmd], coalescer=CallCoalescer(include=r"\\.(status|list)$"))
+    server.run()
+    ```
+
+    Calls are identical when they are for the same tool and construct the same command line. The shared run is
+    only stopped when every caller waiting for it is cancelled, and output is only streamed to the first caller.
+
+    Parameters:
+        include: A regular expression matching the names of tools whose calls are coalesced. If `None`, all tools
+            are coalesced.
+        exclude: A regular expression matching the names of tools whose calls are not coalesced.
+    """
+
+    def __init__(self, *, include: str | re.Pattern | None = None, exclude: str | re.Pattern | None = None) -> None:
+        self.__selector = ToolSelector(include=include, exclude=exclude)
+        self.__flights: dict[Hashable, Flight] = {}
+        self.__coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """
+        Returns:
+            The number of calls that received the result of a run started by another call.
+        """
+        return self.__coalesced
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__flights)
+
+    def enabled(self, tool_name: str) -> bool:
+        return self.__selector(tool_name)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Parameters:
+            key: The identity of the call.
+            func: Starts the run if no identical call is in flight.
+
+        Returns:
+            The result of the shared run.
+        """
+        flight: Flight[T] | None = self.__flights.get(key)
+        if flight is None:
+            flight = self.__flights[key] = Flight(asyncio.ensure_future(func()))
+            flight.task.add_done_callback(lambda _: self.__land(key, flight))
+        else:
+            self.__coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                self.__land(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def __land(self, key: Hashable, flight: Flight) -> None:
+        # A new run may have started for the same key after this one was cancelled
+        if self.__flights.get(key) is flight:
+            del self.__flights[key]
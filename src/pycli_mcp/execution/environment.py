@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+# In-process commands temporarily replace the environment variables and working directory of the server, so these
+# are the values from before the replacement for anything that starts other commands in the meantime
+LOCK = threading.Lock()
+saved_env: dict[str, str] | None = None
+saved_cwd: str | None = None
+
+
+def get_server_environment() -> dict[str, str]:
+    """
+    Returns:
+        A copy of the environment variables of the server, excluding those set for an in-process command.
+    """
+    with LOCK:
+        return dict(os.environ) if saved_env is None else dict(saved_env)
+
+
+def get_server_cwd() -> str:
+    """
+    Returns:
+        The working directory of the server, even while an in-process command runs in another directory.
+    """
+    with LOCK:
+        return os.getcwd() if saved_cwd is None else saved_cwd
+
+
+def apply_environment(env: dict[str, str | None]) -> None:
+    for key, value in env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+@contextmanager
+def replace_environment(
+    env: dict[str, str | None],
+    *,
+    base_env: Mapping[str, str] | None = None,
+    cwd: str | None = None,
+) -> Iterator[None]:
+    """
+    Replaces the environment variables and working directory of the process within the block. Callers must ensure
+    that blocks do not overlap.
+
+    Parameters:
+        env: Environment variables to set, with `None` values meaning that the variable is unset.
+        base_env: The environment variables to start from. If `None`, the current variables are kept.
+        cwd: The working directory. If `None`, the current directory is kept.
+    """
+    global saved_env, saved_cwd  # noqa: PLW0603
+
+    with LOCK:
+        saved_env = dict(os.environ)
+        saved_cwd = os.getcwd()
+        try:
+            if base_env is not None:
+                os.environ.clear()
+                os.environ.update(base_env)
+
+            apply_environment(env)
+            if cwd is not None:
+                os.chdir(cwd)
+        except BaseException:
+            restore_environment()
+            raise
+
+    try:
+        yield
+    finally:
+        with LOCK:
+            restore_environment()
+
+
+def restore_environment() -> None:
+    global saved_env, saved_cwd  # noqa: PLW0603
+
+    if saved_cwd is not None and os.getcwd() != saved_cwd:
+        os.chdir(saved_cwd)
+
+    if saved_env is not None:
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+    saved_env = saved_cwd = None
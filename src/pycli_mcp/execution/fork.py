@@ -0,0 +1,455 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, Any
+
+from pycli_mcp.execution.environment import get_server_cwd, get_server_environment
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+from pycli_mcp.execution.output import OutputCapture
+from pycli_mcp.execution.process import ProcessReaper, drain_output, read_output
+from pycli_mcp.tracing import get_current_span
+
+if TYPE_CHECKING:
+    import click
+
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+# The largest request is the command line and environment overlay of a single tool call
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+
+class ForkServerExecutor(CommandExecutor):
+    """
+    An executor that starts a template process which imports a command once, and then forks that process for every
+    tool call. Each call still runs in its own process, but does not pay for interpreter startup or imports.
+    Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer, CommandQuery
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    from mypkg.cli import cmd
+
+    query = CommandQuery(cmd, executor=ForkServerExecutor("mypkg.cli:cmd"))
+    server = CommandMCPServer(commands=[query])
+    server.run()
+    ```
+
+    This is only available on platforms that support `os.fork`.
+
+    Like with the [subprocess executor][pycli_mcp.execution.process.SubprocessExecutor], every command runs in its
+    own process group.
+
+    Parameters:
+        spec: The import path of the Click command or Typer application in the form `module:attr`.
+        grace_period: The number of seconds to wait for a process group to exit after `SIGTERM` before sending
+            `SIGKILL`.
+    """
+
+    def __init__(self, spec: str, *, grace_period: float = 5) -> None:
+        if not hasattr(os, "fork"):
+            msg = "Fork server execution requires a platform that supports `os.fork`"
+            raise NotImplementedError(msg)
+
+        self.__spec = spec
+        self.__reaper = ProcessReaper(grace_period)
+        self.__ids = itertools.count()
+        self.__pending: dict[int, tuple[asyncio.Future[int], asyncio.Future[int]]] = {}
+        self.__sock: socket.socket | None = None
+        self.__process: asyncio.subprocess.Process | None = None
+        self.__receiver: asyncio.Task[None] | None = None
+        self.__monitor: asyncio.Task[None] | None = None
+
+    @property
+    def spec(self) -> str:
+        return self.__spec
+
+    async def start(self) -> None:
+        if self.__process is not None:
+            return
+
+        parent_sock, child_sock = create_socket_pair()
+        with child_sock:
+            self.__process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                "from pycli_mcp.execution.fork import serve_template; serve_template()",
+                self.__spec,
+                str(child_sock.fileno()),
+                pass_fds=(child_sock.fileno(),),
+                stdin=asyncio.subprocess.DEVNULL,
+                env=get_server_environment(),
+                cwd=get_server_cwd(),
+            )
+
+        parent_sock.setblocking(False)
+        self.__sock = parent_sock
+        self.__monitor = asyncio.create_task(self.__wait_for_exit(self.__process))
+
+        loop = asyncio.get_running_loop()
+        ready = asyncio.ensure_future(loop.sock_recv(parent_sock, MAX_MESSAGE_SIZE))
+        await asyncio.wait((ready, self.__monitor), return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            ready.cancel()
+            message = {"error": "the process exited"}
+        else:
+            message = json.loads(ready.result() or b"{}")
+
+        if not message.get("ready"):
+            await self.stop()
+            msg = f"Unable to load `{self.__spec}` in the template process: {message.get('error', 'unknown error')}"
+            raise RuntimeError(msg)
+
+        self.__receiver = asyncio.create_task(self.__receive())
+
+    async def stop(self) -> None:
+        await self.__reaper.wait()
+        for task in (self.__receiver, self.__monitor):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        self.__receiver = self.__monitor = None
+
+        if self.__sock is not None:
+            self.__sock.close()
+            self.__sock = None
+
+        if self.__process is not None:
+            with contextlib.suppress(ProcessLookupError):
+                self.__process.terminate()
+            await self.__process.wait()
+            self.__process = None
+
+        self.__fail_pending(RuntimeError("The template process has stopped"))
+
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],
+        timeout: float | None = None,
+        on_output: OutputCallback | None = None,
+        output_limit: OutputLimit | None = None,
+        profile: ResolvedProfile | None = None,
+    ) -> ExecutionResult:
+        # Restart the template process if it exited unexpectedly
+        if self.__process is not None and self.__process.returncode is not None:
+            await self.stop()
+        if self.__process is None:
+            await self.start()
+
+        loop = asyncio.get_running_loop()
+        request_id = next(self.__ids)
+        pid_future: asyncio.Future[int] = loop.create_future()
+        exit_future: asyncio.Future[int] = loop.create_future()
+        self.__pending[request_id] = (pid_future, exit_future)
+        exit_future.add_done_callback(lambda _: self.__pending.pop(request_id, None))
+        # The template process reports the PID as soon as the command is forked
+        started: list[float] = []
+        spawn_span = get_current_span().start_span("spawn")
+
+        def on_spawn(_: asyncio.Future[int]) -> None:
+            started.append(time.perf_counter())
+            spawn_span.end()
+
+        pid_future.add_done_callback(on_spawn)
+
+        read_fd, write_fd = os.pipe()
+        try:
+            try:
+                message = {
+                    "id": request_id,
+                    "argv": command,
+                    "env": env,
+                    "base_env": None if profile is None else dict(profile.env),
+                    "cwd": None if profile is None else profile.cwd,
+                }
+                await self.__send(message, write_fd)
+            except BaseException as e:
+                self.__pending.pop(request_id, None)
+                spawn_span.end(e)
+                raise
+            finally:
+                os.close(write_fd)
+
+            reader = asyncio.StreamReader()
+            try:
+                with os.fdopen(read_fd, "rb", buffering=0, closefd=False) as pipe:
+                    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+                    try:
+                        return await self.__wait(
+                            reader, pid_future, exit_future, timeout, on_output, OutputCapture(output_limit), started
+                        )
+                    finally:
+                        transport.close()
+            except BaseException:
+                # The call was cancelled or the output callback failed, perhaps before the command was forked
+                self.__terminate_when_forked(pid_future, exit_future)
+                raise
+        finally:
+            os.close(read_fd)
+
+    async def __wait(
+        self,
+        reader: asyncio.StreamReader,
+        pid_future: asyncio.Future[int],
+        exit_future: asyncio.Future[int],
+        timeout: float | None,
+        on_output: OutputCallback | None,
+        capture: OutputCapture,
+        started: list[float],
+    ) -> ExecutionResult:
+        async def communicate() -> int:
+            await read_output(reader, capture, on_output)
+            return await exit_future
+
+        communication = asyncio.ensure_future(communicate())
+        timed_out = False
+        try:
+            exit_code = await asyncio.wait_for(asyncio.shield(communication), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            await self.__reaper.terminate(await pid_future, exit_future)
+            await drain_output(communication)
+            exit_code = exit_future.result()
+        except BaseException:
+            # The call was cancelled or the output callback failed, so nothing will read the output anymore
+            communication.cancel()
+            raise
+
+        return ExecutionResult(
+            output=capture.getvalue(),
+            exit_code=exit_code,
+            timed_out=timed_out,
+            elided=capture.elided,
+            started=started[0] if started else None,
+        )
+
+    def __terminate_when_forked(self, pid_future: asyncio.Future[int], exit_future: asyncio.Future[int]) -> None:
+        def terminate(future: asyncio.Future[int]) -> None:
+            if not future.cancelled() and future.exception() is None and not exit_future.done():
+                self.__reaper.terminate_later(future.result(), exit_future)
+
+        # Stopping the executor waits for the commands that are being stopped, so they are known right away if the
+        # template process has already reported the PID
+        if pid_future.done():
+            terminate(pid_future)
+        else:
+            pid_future.add_done_callback(terminate)
+
+    async def __send(self, message: dict[str, Any], fd: int) -> None:
+        if self.__sock is None:
+            msg = "The template process is not running"
+            raise RuntimeError(msg)
+
+        loop = asyncio.get_running_loop()
+        data = json.dumps(message).encode("utf-8")
+        while True:
+            try:
+                socket.send_fds(self.__sock, [data], [fd])
+            except BlockingIOError:
+                writable = loop.create_future()
+                loop.add_writer(self.__sock, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(self.__sock)
+            else:
+                return
+
+    async def __receive(self) -> None:
+        if self.__sock is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        while data := await loop.sock_recv(self.__sock, MAX_MESSAGE_SIZE):
+            message = json.loads(data)
+            if (futures := self.__pending.get(message["id"])) is None:
+                continue
+
+            pid_future, exit_future = futures
+            if "pid" in message:
+                pid_future.set_result(message["pid"])
+            elif "exit_code" in message:
+                exit_future.set_result(message["exit_code"])
+            else:
+                exit_future.set_exception(RuntimeError(message.get("error", "unknown error")))
+
+    async def __wait_for_exit(self, process: asyncio.subprocess.Process) -> None:
+        await process.wait()
+        self.__fail_pending(RuntimeError(f"The template process exited with code `{process.returncode}`"))
+
+    def __fail_pending(self, exc: Exception) -> None:
+        for _, exit_future in self.__pending.values():
+            if not exit_future.done():
+                exit_future.set_exception(exc)
+
+
+def create_socket_pair() -> tuple[socket.socket, socket.socket]:
+    # Sequenced packets preserve message boundaries like datagrams, but also signal when the other end closes
+    try:
+        return socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    except OSError:
+        return socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+
+def serve_template() -> None:
+    spec, fd = sys.argv[1], int(sys.argv[2])
+    sock = socket.socket(fileno=fd)
+
+    # The standard output of the server may be its transport, so anything written while importing the command goes
+    # to standard error instead
+    os.dup2(2, 1)
+
+    # The server stops this process directly, and interrupts would otherwise also reach it from the terminal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        from pycli_mcp.execution.inprocess import resolve_click_command
+        from pycli_mcp.metadata.query import load_spec
+
+        command = resolve_click_command(load_spec(spec))
+    except Exception as e:  # noqa: BLE001
+        sock.send(json.dumps({"ready": False, "error": f"{type(e).__name__}: {e}"}).encode("utf-8"))
+        return
+
+    sock.send(json.dumps({"ready": True}).encode("utf-8"))
+
+    # Child exits are observed through the wakeup file descriptor so that a single selector drives everything
+    wakeup_read_fd, wakeup_write_fd = os.pipe()
+    os.set_blocking(wakeup_read_fd, False)
+    os.set_blocking(wakeup_write_fd, False)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.set_wakeup_fd(wakeup_write_fd)
+
+    children: dict[int, int] = {}
+    parent_pid = os.getppid()
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    selector.register(wakeup_read_fd, selectors.EVENT_READ)
+    while True:
+        # Datagram sockets do not signal when the server goes away
+        events = selector.select(timeout=1)
+        if not events and os.getppid() != parent_pid:
+            return
+
+        for key, _ in events:
+            if key.fileobj is not sock:
+                with contextlib.suppress(BlockingIOError):
+                    os.read(wakeup_read_fd, 4096)
+
+                reap_children(sock, children)
+                continue
+
+            try:
+                data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE_SIZE, 1)
+            except InterruptedError:
+                continue
+
+            # The server closed its end
+            if not data:
+                return
+
+            message = json.loads(data)
+            if not fds:
+                sock.send(json.dumps({"id": message["id"], "error": "No output file descriptor"}).encode("utf-8"))
+                continue
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                selector.close()
+                sock.close()
+                os.close(wakeup_read_fd)
+                os.close(wakeup_write_fd)
+                run_child(command, message, fds[0])
+
+            os.close(fds[0])
+            children[pid] = message["id"]
+            sock.send(json.dumps({"id": message["id"], "pid": pid}).encode("utf-8"))
+
+
+def reap_children(sock: socket.socket, children: dict[int, int]) -> None:
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+
+        if pid == 0:
+            return
+
+        if (request_id := children.pop(pid, None)) is not None:
+            exit_code = os.waitstatus_to_exitcode(status)
+            sock.send(json.dumps({"id": request_id, "exit_code": exit_code}).encode("utf-8"))
+
+
+def run_child(command: click.Command, message: dict[str, Any], fd: int) -> None:
+    exit_code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        # Run in a new process group so that the command and its own children can be stopped together
+        os.setsid()
+
+        os.dup2(fd, 1)
+        os.dup2(fd, 2)
+        os.close(fd)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+
+        if message["base_env"] is not None:
+            os.environ.clear()
+            os.environ.update(message["base_env"])
+
+        for key, value in message["env"].items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+        if message["cwd"] is not None:
+            os.chdir(message["cwd"])
+
+        sys.argv = message["argv"]
+        exit_code = invoke_standalone(command, sys.argv)
+    finally:
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+        os._exit(exit_code)
+
+
+def invoke_standalone(command: click.Command, argv: list[str]) -> int:
+    from pycli_mcp.execution.inprocess import get_system_exit_code
+
+    try:
+        command.main(args=argv[1:], prog_name=argv[0])
+    except SystemExit as e:
+        return get_system_exit_code(e)
+    except BaseException:  # noqa: BLE001
+        traceback.print_exc()
+        return 1
+
+    return 0
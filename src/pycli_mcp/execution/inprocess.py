@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from pycli_mcp.execution.environment import replace_environment
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+from pycli_mcp.execution.output import CaptureStream, OutputCapture
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import click
+
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+
+def resolve_click_command(command: Any, *, depth: int = 0) -> click.Command:
+    from pycli_mcp.metadata.types.typer import get_typer_command, is_typer_app, is_typer_command
+
+    if is_typer_app(command) or is_typer_command(command):
+        return get_typer_command(command)
+
+    if hasattr(command, "context_class"):
+        return command
+
+    if callable(command) and depth == 0:
+        return resolve_click_command(command(), depth=depth + 1)
+
+    msg = f"In-process execution is only supported for Click and Typer commands: {type(command)}"
+    raise NotImplementedError(msg)
+
+
+def get_system_exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def invoke_click_command(command: click.Command, args: list[str]) -> int:
+    import click
+
+    try:
+        rv = command.main(args=args[1:], prog_name=args[0], standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return get_system_exit_code(e)
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+        return 1
+
+    # Without standalone mode, `ctx.exit(code)` causes the exit code to be returned
+    return rv if isinstance(rv, int) and not isinstance(rv, bool) else 0
+
+
+class StreamRouter:
+    """
+    Stands in for a standard stream while a command runs in a worker thread, so that only the output of that thread
+    is captured and every other thread of the server keeps using the original stream.
+    """
+
+    __slots__ = ("__name", "__original")
+
+    def __init__(self, name: str, original: Any) -> None:
+        self.__name = name
+        self.__original = original
+
+    @property
+    def original(self) -> Any:
+        return self.__original
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(getattr(THREAD_STREAMS, self.__name, None) or self.__original, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(getattr(THREAD_STREAMS, self.__name, None) or self.__original)
+
+
+# The standard streams, environment variables and working directory are global to the process, so only one command
+# runs in-process at a time across all executors
+RUN_LOCK = threading.Lock()
+THREAD_STREAMS = threading.local()
+STREAM_NAMES = ("stdin", "stdout", "stderr")
+
+
+@contextmanager
+def isolate(
+    env: dict[str, str | None],
+    capture: OutputCapture,
+    profile: ResolvedProfile | None = None,
+) -> Iterator[None]:
+    """
+    Must only be used by the thread that holds the run lock.
+    """
+    output = io.TextIOWrapper(CaptureStream(capture), encoding="utf-8", errors="replace", write_through=True)
+    routers = [StreamRouter(name, getattr(sys, name)) for name in STREAM_NAMES]
+    with replace_environment(
+        env,
+        base_env=None if profile is None else profile.env,
+        cwd=None if profile is None else profile.cwd,
+    ):
+        THREAD_STREAMS.stdin = io.StringIO()
+        THREAD_STREAMS.stdout = THREAD_STREAMS.stderr = output
+        for name, router in zip(STREAM_NAMES, routers, strict=True):
+            setattr(sys, name, router)
+
+        try:
+            yield
+        finally:
+            for name, router in zip(STREAM_NAMES, routers, strict=True):
+                # The command may have replaced the stream itself
+                if getattr(sys, name) is router:
+                    setattr(sys, name, router.original)
+
+            del THREAD_STREAMS.stdin, THREAD_STREAMS.stdout, THREAD_STREAMS.stderr
+
+
+class InProcessExecutor(CommandExecutor):
+    """
+    An executor that invokes an already loaded Click or Typer command inside the server process, avoiding the
+    cost of interpreter startup and imports. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer, CommandQuery
+    from pycli_mcp.execution.inprocess import InProcessExecutor
+
+    from mypkg.cli import cmd
+
+    query = CommandQuery(cmd, executor=InProcessExecutor(cmd))
+    server = CommandMCPServer(commands=[query])
+    server.run()
+    ```
+
+    The command is called with `standalone_mode=False` in a worker thread and the output of that thread is captured.
+    Since environment variables and the working directory are global to the process, only one command runs
+    in-process at a time, even across executors, and waiting for that counts against the timeout of the call.
+    Commands that other executors start meanwhile still inherit the environment and working directory of the server.
+
+    Only use this for commands that do not modify global state, call `os._exit`, or otherwise assume that they own
+    the process. If a command returns an integer, it is interpreted as the exit code like with `ctx.exit`.
+
+    Output is only available once the command finishes, so it is never streamed. Running commands cannot be
+    interrupted: when a call times out or is cancelled it returns immediately, but the command keeps running in its
+    thread and every in-process command waits for it to finish.
+
+    Parameters:
+        command: The Click command, Typer application, or callable object that returns either.
+    """
+
+    def __init__(self, command: Any) -> None:
+        self.__command = resolve_click_command(command)
+
+    @property
+    def command(self) -> click.Command:
+        return self.__command
+
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],
+        timeout: float | None = None,
+        on_output: OutputCallback | None = None,  # noqa: ARG002
+        output_limit: OutputLimit | None = None,
+        profile: ResolvedProfile | None = None,
+    ) -> ExecutionResult:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        abandoned = threading.Event()
+        run = asyncio.ensure_future(
+            asyncio.to_thread(self.__run, command, env, output_limit, profile, deadline, abandoned)
+        )
+        try:
+            return await asyncio.wait_for(asyncio.shield(run), timeout)
+        except asyncio.TimeoutError:
+            abandoned.set()
+            return ExecutionResult(output="", exit_code=1, timed_out=True)
+        except asyncio.CancelledError:
+            abandoned.set()
+            raise
+
+    def __run(
+        self,
+        command: list[str],
+        env: dict[str, str | None],
+        output_limit: OutputLimit | None,
+        profile: ResolvedProfile | None,
+        deadline: float | None,
+        abandoned: threading.Event,
+    ) -> ExecutionResult:
+        # Threads cannot be interrupted, so the next command only starts after the previous one actually finishes
+        if not RUN_LOCK.acquire(timeout=-1 if deadline is None else max(deadline - time.monotonic(), 0)):
+            return ExecutionResult(output="", exit_code=1, timed_out=True)
+
+        try:
+            # The call timed out or was cancelled while waiting
+            if abandoned.is_set():
+                return ExecutionResult(output="", exit_code=1, timed_out=True)
+
+            capture = OutputCapture(output_limit)
+            with isolate(env, capture, profile):
+                started = time.perf_counter()
+                exit_code = invoke_click_command(self.__command, command)
+        finally:
+            RUN_LOCK.release()
+
+        return ExecutionResult(output=capture.getvalue(), exit_code=exit_code, elided=capture.elided, started=started)
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+    OutputCallback = Callable[[bytes], Awaitable[None]]
+
+
+class ExecutionResult:
+    __slots__ = ("__elided", "__exit_code", "__output", "__started", "__timed_out")
+
+    def __init__(
+        self,
+        *,
+        output: str,
+        exit_code: int,
+        timed_out: bool = False,
+        elided: int = 0,
+        started: float | None = None,
+    ) -> None:
+        self.__output = output
+        self.__exit_code = exit_code
+        self.__timed_out = timed_out
+        self.__elided = elided
+        self.__started = started
+
+    @property
+    def output(self) -> str:
+        return self.__output
+
+    @property
+    def exit_code(self) -> int:
+        return self.__exit_code
+
+    @property
+    def timed_out(self) -> bool:
+        return self.__timed_out
+
+    @property
+    def elided(self) -> int:
+        """
+        Returns:
+            The number of bytes of output that were discarded because of the output limit.
+        """
+        return self.__elided
+
+    @property
+    def started(self) -> float | None:
+        """
+        Returns:
+            The value of [`time.perf_counter`][time.perf_counter] when the command started running, if known.
+        """
+        return self.__started
+
+
+class CommandExecutor(ABC):
+    # Whether the first element of command lines is an executable, which is then resolved when the server starts
+    requires_executable: ClassVar[bool] = False
+
+    async def start(self) -> None:  # noqa: B027
+        """
+        Called once when the server starts, before any command is executed.
+        """
+
+    async def stop(self) -> None:  # noqa: B027
+        """
+        Called once when the server shuts down.
+        """
+
+    @abstractmethod
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],
+        timeout: float | None = None,
+        on_output: OutputCallback | None = None,
+        output_limit: OutputLimit | None = None,
+        profile: ResolvedProfile | None = None,
+    ) -> ExecutionResult:
+        """
+        If the task running this is cancelled, the command must be stopped without waiting for it to exit.
+
+        Parameters:
+            command: The command line constructed from the arguments of the tool call.
+            env: Environment variables to set for the command, with `None` values meaning that the variable
+                must be unset.
+            timeout: The number of seconds after which the command is stopped and the result marked as timed out.
+            on_output: Called with chunks of output as soon as they are produced by the command. Executors that
+                cannot observe output until the command finishes may call it once with the entire output, or not at
+                all.
+            output_limit: The amount of output to keep in the result. If `None`, all output is kept.
+            profile: The environment to run the command in. If `None`, the command inherits the environment and
+                working directory of the server.
+
+        Returns:
+            The combined `stdout` and `stderr` of the command and its exit code.
+        """
@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import io
+
+
+class OutputLimit:
+    """
+    The maximum amount of output kept for a command. Output beyond the limit is read and discarded so that the
+    command never blocks on a full pipe.
+
+    Parameters:
+        head: The number of bytes kept from the start of the output.
+        tail: The number of bytes kept from the end of the output.
+    """
+
+    __slots__ = ("__head", "__tail")
+
+    def __init__(self, head: int, tail: int) -> None:
+        if head < 0 or tail < 0:
+            msg = f"Output limits must not be negative: head={head}, tail={tail}"
+            raise ValueError(msg)
+
+        self.__head = head
+        self.__tail = tail
+
+    @classmethod
+    def parse(cls, value: str) -> OutputLimit:
+        """
+        Parameters:
+            value: Either `HEAD:TAIL` or a total number of bytes that is split evenly between the head and tail.
+        """
+        head, sep, tail = value.partition(":")
+        try:
+            if sep:
+                return cls(int(head), int(tail))
+
+            total = int(value)
+        except ValueError:
+            msg = f"Invalid output limit, expected `BYTES` or `HEAD:TAIL`: {value}"
+            raise ValueError(msg) from None
+
+        return cls(total // 2, total - total // 2)
+
+    @property
+    def head(self) -> int:
+        return self.__head
+
+    @property
+    def tail(self) -> int:
+        return self.__tail
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(head={self.__head}, tail={self.__tail})"
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer that keeps the most recent bytes written to it.
+    """
+
+    __slots__ = ("__buffer", "__position", "__size", "__used")
+
+    def __init__(self, size: int) -> None:
+        self.__buffer = bytearray(size)
+        self.__size = size
+        self.__position = 0
+        self.__used = 0
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def write(self, data: bytes | memoryview) -> None:
+        if not self.__size:
+            return
+
+        if len(data) >= self.__size:
+            self.__buffer[:] = data[-self.__size :]
+            self.__position = 0
+            self.__used = self.__size
+            return
+
+        first = min(len(data), self.__size - self.__position)
+        self.__buffer[self.__position : self.__position + first] = data[:first]
+        self.__buffer[: len(data) - first] = data[first:]
+        self.__position = (self.__position + len(data)) % self.__size
+        self.__used = min(self.__size, self.__used + len(data))
+
+    def getvalue(self) -> bytes:
+        if self.__used < self.__size:
+            return bytes(self.__buffer[: self.__used])
+
+        return bytes(self.__buffer[self.__position :] + self.__buffer[: self.__position])
+
+
+class OutputCapture:
+    """
+    Collects the output of a command. With a limit, memory usage is bounded by the size of the head and tail no
+    matter how much the command prints.
+
+    Parameters:
+        limit: The amount of output to keep. If `None`, all output is kept.
+    """
+
+    __slots__ = ("__head", "__head_size", "__tail", "__total")
+
+    def __init__(self, limit: OutputLimit | None = None) -> None:
+        self.__head = bytearray()
+        self.__head_size = None if limit is None else limit.head
+        self.__tail = None if limit is None else RingBuffer(limit.tail)
+        self.__total = 0
+
+    @property
+    def total(self) -> int:
+        """
+        Returns:
+            The number of bytes written, including those that were discarded.
+        """
+        return self.__total
+
+    @property
+    def elided(self) -> int:
+        """
+        Returns:
+            The number of bytes that were discarded from the middle of the output.
+        """
+        if self.__head_size is None or self.__tail is None:
+            return 0
+
+        return max(0, self.__total - self.__head_size - self.__tail.size)
+
+    def write(self, data: bytes) -> None:
+        self.__total += len(data)
+        if self.__head_size is None or self.__tail is None:
+            self.__head += data
+            return
+
+        view = memoryview(data)
+        if (remaining := self.__head_size - len(self.__head)) > 0:
+            self.__head += view[:remaining]
+            view = view[remaining:]
+
+        if view:
+            self.__tail.write(view)
+
+    def getvalue(self) -> str:
+        """
+        Returns:
+            The decoded output, with a marker in place of any discarded bytes.
+        """
+        if self.__tail is None:
+            return self.__head.decode("utf-8", errors="replace")
+
+        tail = self.__tail.getvalue()
+        if not (elided := self.elided):
+            return (self.__head + tail).decode("utf-8", errors="replace")
+
+        head = self.__head.decode("utf-8", errors="replace")
+        return f"{head}\n[... {elided} bytes of output elided ...]\n{tail.decode('utf-8', errors='replace')}"
+
+
+class CaptureStream(io.BufferedIOBase):
+    """
+    A writable binary stream that forwards everything to an output capture.
+    """
+
+    name = "<output>"
+
+    def __init__(self, capture: OutputCapture) -> None:
+        super().__init__()
+        self.__capture = capture
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes | bytearray | memoryview, /) -> int:  # type: ignore[override]
+        self.__capture.write(bytes(data))
+        return len(data)
+
+    # Text wrappers close their underlying stream when garbage collected
+    def close(self) -> None:
+        pass
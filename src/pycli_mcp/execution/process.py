@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from pycli_mcp.execution.environment import get_server_cwd, get_server_environment
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+from pycli_mcp.execution.output import OutputCapture
+from pycli_mcp.tracing import get_current_span
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+KILL_SIGNAL: int = getattr(signal, "SIGKILL", signal.SIGTERM)
+READ_CHUNK_SIZE = 64 * 1024
+# The number of seconds to keep reading the output of a command after it is stopped, since processes that left
+# its process group may keep the pipe open indefinitely
+DRAIN_TIMEOUT = 0.5
+# The number of seconds between checks of whether a stopped command exited
+EXIT_POLL_INTERVAL = 0.05
+
+
+def merge_environment(env: dict[str, str | None]) -> dict[str, str]:
+    env_vars = get_server_environment()
+    for key, value in env.items():
+        if value is None:
+            env_vars.pop(key, None)
+        else:
+            env_vars[key] = value
+
+    return env_vars
+
+
+async def read_output(
+    reader: asyncio.StreamReader,
+    capture: OutputCapture,
+    on_output: OutputCallback | None = None,
+) -> None:
+    chunk = await reader.read(READ_CHUNK_SIZE)
+    if chunk:
+        get_current_span().add_event("first_byte")
+
+    # Reading continues after the limit is reached so that the command never blocks on a full pipe
+    while chunk:
+        capture.write(chunk)
+        if on_output is not None:
+            await on_output(chunk)
+
+        chunk = await reader.read(READ_CHUNK_SIZE)
+
+
+async def drain_output(communication: asyncio.Future[Any]) -> None:
+    """
+    Waits for the rest of the output of a stopped command, giving up on output that does not arrive in time.
+    """
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(communication, DRAIN_TIMEOUT)
+
+
+async def wait_for_exit(process: asyncio.subprocess.Process) -> int:
+    # Before Python 3.12, `wait` only returns once the output pipe is closed as well, which processes that left the
+    # process group of the command may keep open
+    while process.returncode is None:
+        await asyncio.sleep(EXIT_POLL_INTERVAL)
+
+    return process.returncode
+
+
+def use_pidfd_child_watcher() -> Any:
+    """
+    Python 3.12 and later use pidfd-based reaping by default when available. Before that, the default child watcher
+    dedicates a thread to every running process.
+
+    Returns:
+        The previous child watcher if it was replaced, otherwise `None`.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return None
+
+    policy = asyncio.get_event_loop_policy()
+    if type(policy) is not asyncio.DefaultEventLoopPolicy:
+        return None
+
+    # The kernel may not support it or it may be blocked by a sandbox
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return None
+
+    previous_watcher = policy.get_child_watcher()
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    policy.set_child_watcher(watcher)
+    return previous_watcher
+
+
+class ProcessReaper:
+    """
+    Stops process groups by sending `SIGTERM`, followed by `SIGKILL` if they do not exit within a grace period.
+    """
+
+    def __init__(self, grace_period: float) -> None:
+        self.__grace_period = grace_period
+        self.__tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def grace_period(self) -> float:
+        return self.__grace_period
+
+    async def terminate(self, pid: int, exited: Awaitable[Any]) -> None:
+        exit_future = asyncio.ensure_future(exited)
+        signal_process_group(pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.shield(exit_future), self.__grace_period)
+        except asyncio.TimeoutError:
+            signal_process_group(pid, KILL_SIGNAL)
+            await exit_future
+
+    def terminate_later(self, pid: int, exited: Awaitable[Any]) -> None:
+        """
+        Used when a call is cancelled or fails so that its resources are freed without waiting for the process to exit.
+        """
+        task = asyncio.create_task(self.terminate(pid, exited))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def wait(self) -> None:
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+
+def signal_process_group(pid: int, sig: int) -> None:
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        if sys.platform == "win32":
+            os.kill(pid, sig)
+        else:
+            os.killpg(pid, sig)
+
+
+class SubprocessExecutor(CommandExecutor):
+    """
+    The default executor, which runs every command in a new process. Processes are created and read without
+    blocking the event loop, so concurrency is not limited by the size of a thread pool.
+
+    Every command runs in its own process group so that when it times out, the call is cancelled or the output
+    callback fails, any processes it started are stopped as well.
+
+    Parameters:
+        grace_period: The number of seconds to wait for a process group to exit after `SIGTERM` before sending
+            `SIGKILL`.
+    """
+
+    requires_executable = True
+
+    def __init__(self, *, grace_period: float = 5) -> None:
+        self.__reaper = ProcessReaper(grace_period)
+        self.__previous_child_watcher: Any = None
+
+    async def start(self) -> None:
+        self.__previous_child_watcher = use_pidfd_child_watcher()
+
+    async def stop(self) -> None:
+        await self.__reaper.wait()
+        if self.__previous_child_watcher is not None:
+            asyncio.get_event_loop_policy().set_child_watcher(self.__previous_child_watcher)
+            self.__previous_child_watcher = None
+
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],
+        timeout: float | None = None,
+        on_output: OutputCallback | None = None,
+        output_limit: OutputLimit | None = None,
+        profile: ResolvedProfile | None = None,
+    ) -> ExecutionResult:
+        if profile is None:
+            executable, env_vars, cwd = command[0], merge_environment(env), None
+        else:
+            executable, env_vars, cwd = profile.executable or command[0], profile.build_environment(env), profile.cwd
+
+        # An in-process command may be running in another directory
+        if cwd is None:
+            cwd = get_server_cwd()
+
+        with get_current_span().start_span("spawn"):
+            process = await asyncio.create_subprocess_exec(
+                executable,
+                *command[1:],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env=env_vars,
+                cwd=cwd,
+                start_new_session=True,
+            )
+        started = time.perf_counter()
+        capture = OutputCapture(output_limit)
+
+        async def communicate() -> None:
+            # The pipe is always set because standard output is redirected above
+            await read_output(process.stdout, capture, on_output)  # type: ignore[arg-type]
+            await process.wait()
+
+        communication = asyncio.ensure_future(communicate())
+        timed_out = False
+        try:
+            await asyncio.wait_for(asyncio.shield(communication), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            await self.__reaper.terminate(process.pid, wait_for_exit(process))
+            await drain_output(communication)
+            # Release the output pipe in case other processes still hold it open, which the process does not expose
+            process._transport.close()  # type: ignore[attr-defined]  # noqa: SLF001
+        except BaseException:
+            # The call was cancelled or the output callback failed, so nothing will read the output anymore
+            communication.cancel()
+            self.__reaper.terminate_later(process.pid, wait_for_exit(process))
+            raise
+
+        return ExecutionResult(
+            output=capture.getvalue(),
+            exit_code=process.returncode or 0,
+            timed_out=timed_out,
+            elided=capture.elided,
+            started=started,
+        )
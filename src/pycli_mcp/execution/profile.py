@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class ExecutionProfile:
+    """
+    Describes the environment that commands run in. Profiles are resolved once when the server starts so that tool
+    calls only need to apply a small overlay of per-call environment variables. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer, CommandQuery
+    from pycli_mcp.execution.profile import ExecutionProfile
+
+    from mypkg.cli import cmd
+
+    profile = ExecutionProfile(env_exclude=r"(?i)(token|secret|password)", env={"NO_COLOR": "1"}, cwd="/srv/data")
+    query = CommandQuery(cmd, profile=profile)
+    server = CommandMCPServer(commands=[query])
+    server.run()
+    ```
+
+    Parameters:
+        env_include: A regular expression matching the names of environment variables of the server that commands
+            inherit. If `None`, all variables are inherited.
+        env_exclude: A regular expression matching the names of environment variables of the server that commands
+            do not inherit.
+        env: Environment variables to set for every command, taking precedence over inherited variables.
+        cwd: The working directory of commands. If `None`, commands run in the working directory of the server.
+    """
+
+    __slots__ = ("__cwd", "__env", "__env_exclude", "__env_include")
+
+    def __init__(
+        self,
+        *,
+        env_include: str | re.Pattern | None = None,
+        env_exclude: str | re.Pattern | None = None,
+        env: dict[str, str] | None = None,
+        cwd: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self.__env_include = None if env_include is None else re.compile(env_include)
+        self.__env_exclude = None if env_exclude is None else re.compile(env_exclude)
+        self.__env = env or {}
+        self.__cwd = None if cwd is None else os.fspath(cwd)
+
+    def resolve(self, executable: str | None = None) -> ResolvedProfile:
+        """
+        Parameters:
+            executable: The name of the executable that commands start with, which is searched for using the `PATH`
+                of the resolved environment. If `None`, commands do not run executables.
+
+        Returns:
+            The resolved profile.
+
+        Raises:
+            NotADirectoryError: If the working directory does not exist.
+            FileNotFoundError: If the executable cannot be found.
+        """
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if (self.__env_include is None or self.__env_include.search(key))
+            and (self.__env_exclude is None or not self.__env_exclude.search(key))
+        }
+        env.update(self.__env)
+
+        cwd = None
+        if self.__cwd is not None:
+            cwd = os.path.abspath(self.__cwd)
+            if not os.path.isdir(cwd):
+                msg = f"Working directory does not exist: {cwd}"
+                raise NotADirectoryError(msg)
+
+        if executable is not None:
+            # Paths are resolved against the working directory just like they would be at execution time
+            if os.path.dirname(executable):
+                resolved = shutil.which(executable if cwd is None else os.path.join(cwd, executable))
+            else:
+                resolved = shutil.which(executable, path=env.get("PATH", os.defpath))
+
+            if resolved is None:
+                msg = f"Executable not found: {executable}"
+                raise FileNotFoundError(msg)
+
+            executable = os.path.abspath(resolved)
+
+        return ResolvedProfile(executable=executable, env=env, cwd=cwd)
+
+
+class ResolvedProfile:
+    __slots__ = ("__cwd", "__env", "__executable")
+
+    def __init__(self, *, executable: str | None, env: dict[str, str], cwd: str | None) -> None:
+        self.__executable = executable
+        self.__env = MappingProxyType(env)
+        self.__cwd = cwd
+
+    @property
+    def executable(self) -> str | None:
+        """
+        Returns:
+            The absolute path to the executable that commands start with, if they run one.
+        """
+        return self.__executable
+
+    @property
+    def env(self) -> Mapping[str, str]:
+        """
+        Returns:
+            The read-only base environment of commands.
+        """
+        return self.__env
+
+    @property
+    def cwd(self) -> str | None:
+        return self.__cwd
+
+    def build_environment(self, overlay: dict[str, str | None]) -> dict[str, str]:
+        """
+        Returns:
+            The environment variables of a command, with `None` values of the overlay meaning that the variable
+                is unset.
+        """
+        env = dict(self.__env)
+        for key, value in overlay.items():
+            if value is None:
+                env.pop(key, None)
+            else:
+                env[key] = value
+
+        return env
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import re
+
+
+class ToolSelector:
+    """
+    Selects tools by name with regular expressions, remembering the decision for every name it sees.
+
+    Parameters:
+        include: A regular expression matching the names of selected tools. If `None`, all tools are selected.
+        exclude: A regular expression matching the names of tools that are not selected.
+    """
+
+    __slots__ = ("__decisions", "__exclude", "__include")
+
+    def __init__(self, *, include: str | re.Pattern | None = None, exclude: str | re.Pattern | None = None) -> None:
+        self.__include = None if include is None else re.compile(include)
+        self.__exclude = None if exclude is None else re.compile(exclude)
+        self.__decisions: dict[str, bool] = {}
+
+    def __call__(self, tool_name: str) -> bool:
+        if (selected := self.__decisions.get(tool_name)) is None:
+            selected = self.__decisions[tool_name] = (
+                self.__include is None or self.__include.search(tool_name) is not None
+            ) and (self.__exclude is None or self.__exclude.search(tool_name) is None)
+
+        return selected
@@ -0,0 +1,239 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from pycli_mcp.metadata.interface import CommandMetadata
+
+# Bump this whenever the serialized format or the collected metadata changes
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 65536
+
+CLICK_OPTION_FIELDS = ("type", "required", "description", "multiple", "container", "flag", "flag_name", "path")
+ARGPARSE_OPTION_FIELDS = ("type", "required", "description", "multiple", "flag", "flag_name", "path")
+
+
+def serialize_metadata(metadata: CommandMetadata) -> dict[str, Any]:
+    from pycli_mcp.metadata.help import HelpMetadata
+    from pycli_mcp.metadata.types.argparse import ArgparseCommandMetadata
+    from pycli_mcp.metadata.types.click import ClickCommandMetadata
+
+    if isinstance(metadata, HelpMetadata):
+        # The usage of every command is computed so that it is available without inspecting the commands again
+        return {
+            "kind": "help",
+            "path": metadata.path,
+            "schema": metadata.schema,
+            "usages": {command_path: metadata.get_usage(command_path) for command_path in metadata.commands},
+        }
+
+    fields: tuple[str, ...]
+    if isinstance(metadata, ClickCommandMetadata):
+        kind, fields = "click", CLICK_OPTION_FIELDS
+    elif isinstance(metadata, ArgparseCommandMetadata):
+        kind, fields = "argparse", ARGPARSE_OPTION_FIELDS
+    else:
+        msg = f"Unable to cache command metadata of type: {type(metadata)}"
+        raise NotImplementedError(msg)
+
+    return {
+        "kind": kind,
+        "path": metadata.path,
+        "schema": metadata.schema,
+        "options": {
+            option_name: {field: getattr(option, field) for field in fields}
+            for option_name, option in metadata.options.items()
+        },
+    }
+
+
+def deserialize_metadata(data: dict[str, Any]) -> CommandMetadata:
+    if data["kind"] == "help":
+        from pycli_mcp.metadata.help import HelpMetadata
+
+        return HelpMetadata(path=data["path"], schema=data["schema"], usages=data["usages"])
+
+    if data["kind"] == "click":
+        from pycli_mcp.metadata.types.click import ClickCommandMetadata, ClickCommandOption
+
+        return ClickCommandMetadata(
+            path=data["path"],
+            schema=data["schema"],
+            options={name: ClickCommandOption(**option) for name, option in data["options"].items()},
+        )
+
+    from pycli_mcp.metadata.types.argparse import ArgparseCommandMetadata, ArgparseCommandOption
+
+    return ArgparseCommandMetadata(
+        path=data["path"],
+        schema=data["schema"],
+        options={name: ArgparseCommandOption(**option) for name, option in data["options"].items()},
+    )
+
+
+def get_distribution_versions() -> dict[str, str]:
+    from importlib.metadata import distributions
+
+    versions: dict[str, str] = {}
+    for dist in distributions():
+        # Broken installations may lack metadata
+        if name := dist.metadata["Name"]:
+            versions[name.lower()] = dist.version
+
+    return dict(sorted(versions.items()))
+
+
+def get_module_source_hashes(modules: Iterable[str]) -> dict[str, str | None]:
+    """
+    Every loaded submodule of the top-level package of each module is hashed, since commands are often defined
+    across several modules of the same package.
+    """
+    packages = {module.partition(".")[0] for module in modules}
+    hashes: dict[str, str | None] = {}
+    for name, module in sorted(sys.modules.items()):
+        if name.partition(".")[0] not in packages or name in hashes:
+            continue
+
+        path = getattr(module, "__file__", None)
+        if path is None:
+            continue
+
+        try:
+            hashes[name] = hash_file(path)
+        except OSError:
+            hashes[name] = None
+
+    return hashes
+
+
+def hash_file(path: str) -> str:
+    # This is what `hashlib.file_digest` does, which is unavailable before Python 3.11
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def get_command_module(command: Any) -> str | None:
+    """
+    Returns:
+        The name of the module that defines the callback of a Click command or Typer application, if known.
+    """
+    for callback in (
+        getattr(command, "callback", None),
+        getattr(getattr(command, "registered_callback", None), "callback", None),
+        *(getattr(info, "callback", None) for info in getattr(command, "registered_commands", ())),
+    ):
+        if callback is not None and (module := getattr(callback, "__module__", None)):
+            return module
+
+    module = getattr(command, "__module__", None)
+    # Instances of classes from command libraries say nothing about where the command is defined
+    if module and module.partition(".")[0] not in {"click", "typer", "argparse"}:
+        return module
+
+    return None
+
+
+class CatalogCache:
+    """
+    Stores collected command metadata on disk so that restarts do not walk the command tree again. Entries are keyed
+    by the collection settings, the versions of all installed distributions, and the hashes of the source files of
+    the modules that define the commands. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer, CommandQuery
+    from pycli_mcp.metadata.cache import CatalogCache
+
+    from mypkg.cli import cmd
+
+    cache = CatalogCache("~/.cache/pycli-mcp", modules=["mypkg.cli"])
+    server = CommandMCPServer(commands=[CommandQuery(cmd, catalog_cache=cache)])
+    server.run()
+    ```
+
+    Parameters:
+        directory: The directory in which to store the metadata.
+        modules: The modules that define the commands. The module of the command callback is detected for Click
+            commands and Typer applications, but must be provided for `argparse` parsers to detect changes that are
+            not accompanied by a new distribution version, such as with editable installations.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], *, modules: Sequence[str] = ()) -> None:
+        self.__directory = os.path.expanduser(os.fspath(directory))
+        self.__modules = tuple(modules)
+        self.__distribution_versions: dict[str, str] | None = None
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def get_key(self, command: Any, settings: dict[str, Any]) -> str:
+        """
+        Parameters:
+            command: The root command object.
+            settings: The settings that influence collection.
+
+        Returns:
+            The key of the collected metadata.
+        """
+        # Distributions do not change while the process is running
+        if self.__distribution_versions is None:
+            self.__distribution_versions = get_distribution_versions()
+
+        modules = list(self.__modules)
+        if (command_module := get_command_module(command)) is not None:
+            modules.append(command_module)
+
+        data = {
+            "format": CACHE_FORMAT_VERSION,
+            "python": sys.version,
+            "settings": settings,
+            "distributions": self.__distribution_versions,
+            "sources": get_module_source_hashes(modules),
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> list[CommandMetadata] | None:
+        """
+        Returns:
+            The cached metadata, or `None` if there is no valid entry.
+        """
+        try:
+            with open(os.path.join(self.__directory, f"{key}.json"), encoding="utf-8") as f:
+                entries = json.load(f)
+
+            return [deserialize_metadata(entry) for entry in entries]
+        # Missing, unreadable or corrupt entries are rebuilt
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, key: str, metadata: Sequence[CommandMetadata]) -> None:
+        """
+        Writes are atomic so that concurrent servers never read partial entries. Failures are ignored since the
+        cache is only an optimization.
+        """
+        data = json.dumps([serialize_metadata(m) for m in metadata], separators=(",", ":"))
+        with contextlib.suppress(OSError):
+            os.makedirs(self.__directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, os.path.join(self.__directory, f"{key}.json"))
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+                raise
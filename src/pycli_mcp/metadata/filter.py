@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+def compile_pattern(pattern: str | re.Pattern | None) -> re.Pattern | None:
+    return None if pattern is None else re.compile(pattern)
+
+
+def tokenize_pattern(source: str) -> Iterator[str]:
+    """
+    Yields:
+        The escape sequences, character sets and remaining single characters of a regular expression.
+    """
+    index = 0
+    length = len(source)
+    while index < length:
+        char = source[index]
+        if char == "\\":
+            yield source[index : index + 2]
+            index += 2
+        elif char == "[":
+            end = index + 1
+            if source.startswith("^", end):
+                end += 1
+            # A closing bracket at the start of a set is a literal character
+            if source.startswith("]", end):
+                end += 1
+            while end < length and source[end] != "]":
+                end += 2 if source[end] == "\\" else 1
+
+            yield source[index : end + 1]
+            index = end + 1
+        else:
+            yield char
+            index += 1
+
+
+def get_anchored_prefix(pattern: re.Pattern) -> str | None:
+    """
+    Returns:
+        The literal text that every match of a pattern anchored at the start must begin with, or `None` if the
+            pattern may match anywhere.
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+
+    tokens = list(tokenize_pattern(pattern.pattern))
+    if not tokens or tokens[0] not in {"^", r"\A"}:
+        return None
+
+    depth = 0
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif token == "|" and depth == 0:
+            return None
+
+    prefix: list[str] = []
+    for token in tokens[1:]:
+        if len(token) == 1 and token not in METACHARACTERS:
+            prefix.append(token)
+        elif len(token) == 2 and token[0] == "\\" and not token[1].isalnum():
+            prefix.append(token[1])
+        else:
+            # The last character may not be part of every match e.g. `^foo?`
+            if token in OPTIONAL_QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+
+    return "".join(prefix)
+
+
+def looks_past_match(pattern: re.Pattern) -> bool:
+    """
+    Returns:
+        Whether a pattern may inspect text after the end of a match, in which case matching a path does not imply
+            matching every path that begins with it.
+    """
+    tokens = list(tokenize_pattern(pattern.pattern))
+    for index, token in enumerate(tokens):
+        if token in {"$", r"\Z"}:
+            return True
+        if "".join(tokens[index : index + 3]) in {"(?=", "(?!", "(?("}:
+            return True
+
+    return False
+
+
+class CommandFilter:
+    """
+    Matches the paths of subcommands, without the name of the root command, against the `include` and `exclude`
+    patterns of a query. Groups may be checked before they are loaded to skip subtrees that cannot match.
+    """
+
+    __slots__ = ("__exclude", "__exclude_subtree", "__include", "__include_prefix")
+
+    def __init__(self, *, include: str | re.Pattern | None = None, exclude: str | re.Pattern | None = None) -> None:
+        self.__include = compile_pattern(include)
+        self.__exclude = compile_pattern(exclude)
+        self.__include_prefix = None if self.__include is None else get_anchored_prefix(self.__include)
+        # Excluding a group excludes all of its subcommands only if matches do not depend on the text that follows
+        self.__exclude_subtree = (
+            self.__exclude if self.__exclude is not None and not looks_past_match(self.__exclude) else None
+        )
+
+    def matches(self, path: str) -> bool:
+        """
+        Returns:
+            Whether the command at the path is exposed.
+        """
+        if self.__exclude is not None and self.__exclude.search(path):
+            return False
+
+        return self.__include is None or self.__include.search(path) is not None
+
+    def may_match_within(self, path: str) -> bool:
+        """
+        Returns:
+            Whether the command at the path, or any of its subcommands if it is a group, may be exposed.
+        """
+        if not path:
+            return True
+
+        if self.__exclude_subtree is not None and self.__exclude_subtree.search(path):
+            return False
+
+        if self.__include_prefix:
+            subtree_prefix = f"{path} "
+            length = min(len(self.__include_prefix), len(subtree_prefix))
+            return self.__include_prefix[:length] == subtree_prefix[:length]
+
+        return True
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pycli_mcp.metadata.interface import CommandMetadata
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# The maximum length of the summary of each command in the description of a summary aggregation
+SUMMARY_MAX_LENGTH = 80
+
+
+def get_summary(text: str, max_length: int = SUMMARY_MAX_LENGTH) -> str:
+    """
+    Returns:
+        The first sentence of the first paragraph of the text, truncated to the maximum length.
+    """
+    words = text.strip().split("\n\n", 1)[0].split()
+    summary = " ".join(words)
+    sentence_end = summary.find(". ")
+    if sentence_end != -1:
+        summary = summary[: sentence_end + 1]
+
+    if len(summary) > max_length:
+        summary = f"{summary[: max_length - 3].rstrip()}..."
+
+    return summary
+
+
+def build_summary_description(header: str, summaries: Iterable[tuple[str, str]], help_tool_name: str) -> str:
+    parts = [f"{header}\n"] if header else []
+    parts.append(f"Use the `{help_tool_name}` tool to view the full usage of a command.\n")
+    for command_path, summary in summaries:
+        parts.append(f"\n## {command_path}\n")
+        if summary:
+            parts.append(f"\n{summary}\n")
+
+    return "".join(parts)
+
+
+class HelpMetadata(CommandMetadata):
+    """
+    A tool that returns the full usage of a command rather than running one. Usage text is computed when it is first
+    requested and then reused.
+    """
+
+    def __init__(self, *, path: str, schema: dict[str, Any], usages: dict[str, str | Callable[[], str]]) -> None:
+        super().__init__(path=path, schema=schema)
+
+        self.__usages = usages
+
+    @classmethod
+    def from_commands(cls, root_path: str, usages: dict[str, str | Callable[[], str]]) -> HelpMetadata:
+        path = f"{root_path} help"
+        return cls(
+            path=path,
+            schema={
+                "type": "object",
+                "properties": {
+                    "command": {
+                        "type": "string",
+                        "enum": list(usages),
+                        "title": "command",
+                        "description": "The command to show the usage of",
+                    },
+                },
+                "required": ["command"],
+                "title": path,
+                "description": f"Show the full usage of a `{root_path}` command.",
+            },
+            usages=usages,
+        )
+
+    @property
+    def commands(self) -> list[str]:
+        return list(self.__usages)
+
+    def get_usage(self, command_path: str) -> str:
+        """
+        Raises:
+            ValueError: If the command is unknown.
+        """
+        try:
+            usage = self.__usages[command_path]
+        except KeyError:
+            msg = f"Unknown command: {command_path}"
+            raise ValueError(msg) from None
+
+        if not isinstance(usage, str):
+            usage = self.__usages[command_path] = usage()
+
+        return usage
+
+    def render(self, arguments: dict[str, Any] | None = None) -> str:
+        return self.get_usage((arguments or {}).get("command", ""))
+
+    def construct(self, arguments: dict[str, Any] | None = None) -> list[str]:  # noqa: ARG002
+        msg = "The help tool does not run a command"
+        raise NotImplementedError(msg)
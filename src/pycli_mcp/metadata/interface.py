@@ -6,6 +6,10 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 
+def get_tool_name(command_path: str) -> str:
+    return command_path.replace(" ", ".").replace("-", "_")
+
+
 class CommandMetadata(ABC):
     def __init__(self, *, path: str, schema: dict[str, Any]) -> None:
         self.__path = path
@@ -21,3 +25,17 @@ class CommandMetadata(ABC):
 
     @abstractmethod
     def construct(self, arguments: dict[str, Any] | None = None) -> list[str]: ...
+
+    def render(self, arguments: dict[str, Any] | None = None) -> str | None:  # noqa: ARG002, PLR6301
+        """
+        Returns:
+            The output of the tool call if it is produced without running a command, otherwise `None`.
+        """
+        return None
+
+    def get_path_arguments(self, arguments: dict[str, Any] | None = None) -> list[str]:  # noqa: ARG002, PLR6301
+        """
+        Returns:
+            The values of arguments that refer to files or directories.
+        """
+        return []
@@ -2,15 +2,44 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import re
+from importlib import import_module
 from typing import TYPE_CHECKING, Any, Literal
 
+from pycli_mcp.metadata.filter import compile_pattern
+
 if TYPE_CHECKING:
-    import re
     from collections.abc import Iterator
 
+    from pycli_mcp.execution.interface import CommandExecutor
+    from pycli_mcp.execution.profile import ExecutionProfile
+    from pycli_mcp.metadata.cache import CatalogCache
     from pycli_mcp.metadata.interface import CommandMetadata
 
 
+SPEC_PATTERN = re.compile(r"^(?P<spec>(?P<module>[\w.]+):(?P<attr>[\w.]+))$")
+
+
+def load_spec(spec: str) -> Any:
+    """
+    Returns:
+        The object referred to by an import path of the form `module:attr`.
+
+    Raises:
+        ValueError: If the import path is invalid.
+    """
+    match = SPEC_PATTERN.search(spec)
+    if match is None:
+        msg = f"Invalid spec: {spec}"
+        raise ValueError(msg)
+
+    obj = import_module(match.group("module"))
+    for attr in match.group("attr").split("."):
+        obj = getattr(obj, attr)
+
+    return obj
+
+
 class CommandQuery:
     """
     A wrapper around a root command object that influences the collection behavior. Example usage:
@@ -28,33 +57,95 @@ class CommandQuery:
 
     Parameters:
         command: The command to inspect.
-        aggregate: The level of aggregation to use.
+        aggregate: The level of aggregation to use. The `summary` level is like `root` but only lists a one-line
+            summary of every command, adding a `help` tool that returns the full usage of a command.
         name: The expected name of the root command.
         include: A regular expression to include in the query.
         exclude: A regular expression to exclude in the query.
         strict_types: Whether to error on unknown types.
+        lazy: Whether to avoid loading subcommands of Click groups that are not already registered, such as those
+            of [lazily loaded](https://click.palletsprojects.com/en/stable/complex/#lazily-loading-subcommands)
+            groups. Such subcommands are only listed by name, and require root or group aggregation. Typer
+            applications and argparse parsers are not supported.
+        executor: The executor used to run the commands. If `None`, every command runs in a new process.
+        profile: The environment to run the commands in. If `None`, commands inherit the environment of the server.
+        catalog_cache: The on-disk cache of collected metadata. If `None`, the command is inspected on every start.
     """
 
-    __slots__ = ("__aggregate", "__command", "__exclude", "__include", "__name", "__strict_types")
+    __slots__ = (
+        "__aggregate",
+        "__catalog_cache",
+        "__command",
+        "__exclude",
+        "__executor",
+        "__include",
+        "__lazy",
+        "__name",
+        "__profile",
+        "__strict_types",
+    )
 
     def __init__(
         self,
         command: Any,
         *,
-        aggregate: Literal["root", "group", "none"] | None = None,
+        aggregate: Literal["root", "group", "none", "summary"] | None = None,
         name: str | None = None,
         include: str | re.Pattern | None = None,
         exclude: str | re.Pattern | None = None,
         strict_types: bool = False,
+        lazy: bool = False,
+        executor: CommandExecutor | None = None,
+        profile: ExecutionProfile | None = None,
+        catalog_cache: CatalogCache | None = None,
     ) -> None:
         self.__command = command
         self.__aggregate = aggregate
         self.__name = name
-        self.__include = include
-        self.__exclude = exclude
+        self.__include = compile_pattern(include)
+        self.__exclude = compile_pattern(exclude)
         self.__strict_types = strict_types
+        self.__lazy = lazy
+        self.__executor = executor
+        self.__profile = profile
+        self.__catalog_cache = catalog_cache
+
+    @property
+    def executor(self) -> CommandExecutor | None:
+        return self.__executor
+
+    @property
+    def profile(self) -> ExecutionProfile | None:
+        return self.__profile
+
+    @property
+    def catalog_cache(self) -> CatalogCache | None:
+        return self.__catalog_cache
 
     def __iter__(self) -> Iterator[CommandMetadata]:
+        if self.__catalog_cache is None:
+            yield from self.__walk()
+            return
+
+        key = self.__catalog_cache.get_key(
+            self.__command,
+            {
+                "aggregate": self.__aggregate,
+                "name": self.__name,
+                "include": get_pattern_source(self.__include),
+                "exclude": get_pattern_source(self.__exclude),
+                "strict_types": self.__strict_types,
+                "lazy": self.__lazy,
+            },
+        )
+        metadata = self.__catalog_cache.load(key)
+        if metadata is None:
+            metadata = list(self.__walk())
+            self.__catalog_cache.save(key, metadata)
+
+        yield from metadata
+
+    def __walk(self) -> Iterator[CommandMetadata]:
         yield from walk_commands(
             self.__command,
             aggregate=self.__aggregate,
@@ -62,17 +153,26 @@ class CommandQuery:
             include=self.__include,
             exclude=self.__exclude,
             strict_types=self.__strict_types,
+            lazy=self.__lazy,
         )
 
 
+def get_pattern_source(pattern: str | re.Pattern | None) -> str | list[Any] | None:
+    if isinstance(pattern, re.Pattern):
+        return [pattern.pattern, pattern.flags]
+
+    return pattern
+
+
 def walk_commands(
     command: Any,
     *,
-    aggregate: Literal["root", "group", "none"] | None = None,
+    aggregate: Literal["root", "group", "none", "summary"] | None = None,
     name: str | None = None,
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     strict_types: bool = False,
+    lazy: bool = False,
 ) -> Iterator[CommandMetadata]:
     if aggregate is None:
         aggregate = "root"
@@ -84,23 +184,32 @@ def walk_commands(
         include=include,
         exclude=exclude,
         strict_types=strict_types,
+        lazy=lazy,
     )
 
 
+def check_lazy_support(*, lazy: bool) -> None:
+    if lazy:
+        msg = "Lazy loading of subcommands is only supported for Click commands"
+        raise ValueError(msg)
+
+
 def _walk_commands(
     command: Any,
     *,
-    aggregate: Literal["root", "group", "none"],
+    aggregate: Literal["root", "group", "none", "summary"],
     name: str | None,
     include: str | re.Pattern | None,
     exclude: str | re.Pattern | None,
     strict_types: bool,
+    lazy: bool,
     depth: int = 0,
 ) -> Iterator[CommandMetadata]:
     # Typer
     from pycli_mcp.metadata.types.typer import is_typer_app, is_typer_command
 
     if is_typer_app(command) or is_typer_command(command):
+        check_lazy_support(lazy=lazy)
         from pycli_mcp.metadata.types.typer import walk_commands as walk_typer_commands
 
         yield from walk_typer_commands(
@@ -124,6 +233,7 @@ def _walk_commands(
             include=include,
             exclude=exclude,
             strict_types=strict_types,
+            lazy=lazy,
         )
         return
 
@@ -132,6 +242,7 @@ def _walk_commands(
         import argparse
 
         if isinstance(command, argparse.ArgumentParser):
+            check_lazy_support(lazy=lazy)
             from pycli_mcp.metadata.types.argparse import walk_commands as walk_argparse_commands
 
             yield from walk_argparse_commands(
@@ -156,6 +267,7 @@ def _walk_commands(
             include=include,
             exclude=exclude,
             strict_types=strict_types,
+            lazy=lazy,
             depth=depth + 1,
         )
         return
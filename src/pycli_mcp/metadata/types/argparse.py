@@ -4,13 +4,22 @@ from __future__ import annotations
 
 import argparse
 import inspect
+import pathlib
 import re
-from typing import TYPE_CHECKING, Any, Literal, TypedDict
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, overload
 
-from pycli_mcp.metadata.interface import CommandMetadata
+from pycli_mcp.metadata.filter import CommandFilter
+from pycli_mcp.metadata.help import HelpMetadata, build_summary_description, get_summary
+from pycli_mcp.metadata.interface import CommandMetadata, get_tool_name
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
+
+    # Appends the command line representation of a value to the flags, options or arguments
+    OptionEmitter = Callable[[Any, list[str], list[str], list[str]], None]
+
+OPTIONAL_POSITIONAL_NARGS = frozenset({argparse.OPTIONAL, argparse.ZERO_OR_MORE, argparse.REMAINDER})
 
 
 class ArgparseCommandOptionKwargs(TypedDict, total=False):
@@ -20,6 +29,7 @@ class ArgparseCommandOptionKwargs(TypedDict, total=False):
     multiple: bool
     flag: bool
     flag_name: str
+    path: bool
 
 
 class ArgparseCommandMetadata(CommandMetadata):
@@ -27,44 +37,51 @@ class ArgparseCommandMetadata(CommandMetadata):
         super().__init__(path=path, schema=schema)
 
         self.__options = options
+        # Compiled once so that constructing a command only dispatches on the arguments that were passed
+        self.__prefix = tuple(path.split())
+        self.__emitters = {option_name: compile_option_emitter(option) for option_name, option in options.items()}
 
     @property
     def options(self) -> dict[str, ArgparseCommandOption]:
         return self.__options
 
+    def get_path_arguments(self, arguments: dict[str, Any] | None = None) -> list[str]:
+        paths: list[str] = []
+        if not arguments:
+            return paths
+
+        for option_name, value in arguments.items():
+            if value is None or not self.options[option_name].path:
+                continue
+
+            if isinstance(value, list):
+                paths.extend(map(str, value))
+            else:
+                paths.append(str(value))
+
+        return paths
+
     def construct(self, arguments: dict[str, Any] | None = None) -> list[str]:
-        command = self.path.split()
-        if arguments and self.options:
-            args: list[Any] = []
-            opts: list[Any] = []
+        command = list(self.__prefix)
+        if arguments and self.__emitters:
+            args: list[str] = []
+            opts: list[str] = []
             flags: list[str] = []
+            emitters = self.__emitters
             for option_name, value in arguments.items():
-                option = self.options[option_name]
-                if option.type == "positional":
-                    if isinstance(value, list):
-                        args.extend(value)
-                    else:
-                        args.append(value)
-                    continue
-
-                if option.flag:
-                    if value:
-                        flags.append(option.flag_name)
-                elif option.multiple:
-                    for v in value:
-                        opts.extend((option.flag_name, v))
-                else:
-                    opts.extend((option.flag_name, value))
+                # Optional arguments that are explicitly `null` use their default value
+                if value is not None:
+                    emitters[option_name](value, flags, opts, args)
 
             command.extend(flags)
-            command.extend(map(str, opts))
-            command.extend(map(str, args))
+            command.extend(opts)
+            command.extend(args)
 
         return command
 
 
 class ArgparseCommandOption:
-    __slots__ = ("__description", "__flag", "__flag_name", "__multiple", "__required", "__type")
+    __slots__ = ("__description", "__flag", "__flag_name", "__multiple", "__path", "__required", "__type")
 
     def __init__(
         self,
@@ -75,6 +92,7 @@ class ArgparseCommandOption:
         multiple: bool = False,
         flag: bool = False,
         flag_name: str = "",
+        path: bool = False,
     ) -> None:
         self.__type = type
         self.__required = required
@@ -82,6 +100,7 @@ class ArgparseCommandOption:
         self.__multiple = multiple
         self.__flag = flag
         self.__flag_name = flag_name
+        self.__path = path
 
     @property
     def type(self) -> Literal["positional", "option"]:
@@ -107,6 +126,48 @@ class ArgparseCommandOption:
     def flag_name(self) -> str:
         return self.__flag_name
 
+    @property
+    def path(self) -> bool:
+        """
+        Returns:
+            Whether values refer to files or directories.
+        """
+        return self.__path
+
+
+def compile_option_emitter(option: ArgparseCommandOption) -> OptionEmitter:
+    flag_name = option.flag_name
+    if option.type == "positional":
+
+        def emit_positional(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            if isinstance(value, list):
+                args.extend(map(str, value))
+            else:
+                args.append(str(value))
+
+        return emit_positional
+
+    if option.flag:
+
+        def emit_flag(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            if value:
+                flags.append(flag_name)
+
+        return emit_flag
+
+    if option.multiple:
+
+        def emit_multiple(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            for v in value:
+                opts.extend((flag_name, str(v)))
+
+        return emit_multiple
+
+    def emit_option(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+        opts.extend((flag_name, str(value)))
+
+    return emit_option
+
 
 def get_longest_flag(flags: list[str]) -> str:
     if not flags:
@@ -196,6 +257,7 @@ def walk_parser_tree(
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     parent_path: str = "",
+    command_filter: CommandFilter | None = None,
 ) -> Iterator[tuple[str, argparse.ArgumentParser]]:
     """
     Walk through parser tree including subparsers.
@@ -203,6 +265,9 @@ def walk_parser_tree(
     Yields:
         Command paths with their corresponding parser.
     """
+    if command_filter is None:
+        command_filter = CommandFilter(include=include, exclude=exclude)
+
     # Check if this parser has subparsers
     subparsers_action = None
     for action in parser._actions:
@@ -210,28 +275,27 @@ def walk_parser_tree(
             subparsers_action = action
             break
 
+    command_path = f"{parent_path} {name}".strip() if parent_path else name
     if not subparsers_action:
         # This is a leaf parser
-        command_path = f"{parent_path} {name}".strip() if parent_path else name
         subcommand_path = " ".join(command_path.split()[1:]) if parent_path else ""
-
-        if exclude is not None and subcommand_path and re.search(exclude, subcommand_path):
-            return
-        if include is not None and subcommand_path and not re.search(include, subcommand_path):
+        if subcommand_path and not command_filter.matches(subcommand_path):
             return
 
         yield (command_path, parser)
         return
 
     # This parser has subparsers, iterate through them
-    current_path = f"{parent_path} {name}".strip() if parent_path else name
+    group_path = " ".join(command_path.split()[1:])
     for subcommand_name, subparser in subparsers_action.choices.items():
+        if not command_filter.may_match_within(f"{group_path} {subcommand_name}".lstrip()):
+            continue
+
         yield from walk_parser_tree(
             subparser,
             name=subcommand_name,
-            include=include,
-            exclude=exclude,
-            parent_path=current_path,
+            parent_path=command_path,
+            command_filter=command_filter,
         )
 
 
@@ -261,7 +325,8 @@ def walk_commands_no_aggregation(
                 option_name = action.dest
                 option_data = {
                     "type": "positional",
-                    "required": action.required if hasattr(action, "required") else True,
+                    # Argparse marks positionals that accept no values as required, even though they may be omitted
+                    "required": action.required and action.nargs not in OPTIONAL_POSITIONAL_NARGS,
                     "multiple": action.nargs in {"*", "+"} if hasattr(action, "nargs") else False,
                 }
             else:
@@ -288,6 +353,9 @@ def walk_commands_no_aggregation(
                 prop["type"] = "array"
                 prop["items"] = {"type": "string"}
             elif hasattr(action, "type") and action.type:
+                if action.type is pathlib.Path or isinstance(action.type, argparse.FileType):
+                    option_data["path"] = True
+
                 if action.type is int:
                     if option_data.get("multiple"):
                         prop["type"] = "array"
@@ -400,17 +468,9 @@ def walk_commands_group_aggregation(
             )
             continue
 
-        description = f"""\
-Usage: {group_path} SUBCOMMAND [ARGS]...
-
-# Available subcommands
-"""
+        description_parts = [f"Usage: {group_path} SUBCOMMAND [ARGS]...\n\n# Available subcommands\n"]
         for command_name, (command_path, subparser) in commands.items():
-            description += f"""
-## {command_name}
-
-{get_parser_full_usage(subparser, command_path)}
-"""
+            description_parts.append(f"\n## {command_name}\n\n{get_parser_full_usage(subparser, command_path)}\n")
 
         yield ArgparseCommandMetadata(
             path=group_path,
@@ -433,7 +493,7 @@ Usage: {group_path} SUBCOMMAND [ARGS]...
                     },
                 },
                 "title": group_path,
-                "description": description.lstrip(),
+                "description": "".join(description_parts),
             },
             options={
                 "subcommand": ArgparseCommandOption(
@@ -450,37 +510,21 @@ Usage: {group_path} SUBCOMMAND [ARGS]...
         )
 
 
-def walk_commands_root_aggregation(
-    parser: argparse.ArgumentParser,
-    *,
-    name: str,
-    include: str | re.Pattern | None = None,
-    exclude: str | re.Pattern | None = None,
-) -> Iterator[ArgparseCommandMetadata]:
-    description = ""
-
-    # Check if parser has subparsers
-    has_subparsers = any(isinstance(action, argparse._SubParsersAction) for action in parser._actions)
-
-    if has_subparsers:
-        description += f"""\
-# {name}
+def get_root_parser_header(parser: argparse.ArgumentParser, name: str) -> str:
+    if not any(isinstance(action, argparse._SubParsersAction) for action in parser._actions):
+        return ""
 
-Usage: {name} [OPTIONS] SUBCOMMAND [ARGS]...
-"""
-        if parser_description := get_parser_description(parser):
-            description += f"\n{parser_description}\n"
-        if parser_options := get_parser_options_block(parser):
-            description += f"\nOptions:\n{parser_options}\n"
+    parts = [f"# {name}\n\nUsage: {name} [OPTIONS] SUBCOMMAND [ARGS]...\n"]
+    if parser_description := get_parser_description(parser):
+        parts.append(f"\n{parser_description}\n")
+    if parser_options := get_parser_options_block(parser):
+        parts.append(f"\nOptions:\n{parser_options}\n")
 
-    for command_path, subparser in walk_parser_tree(parser, name=name, include=include, exclude=exclude):
-        description += f"""
-## {command_path}
+    return "".join(parts)
 
-{get_parser_full_usage(subparser, command_path)}
-"""
 
-    yield ArgparseCommandMetadata(
+def get_root_parser_metadata(name: str, description: str) -> ArgparseCommandMetadata:
+    return ArgparseCommandMetadata(
         path=name,
         schema={
             "type": "object",
@@ -507,6 +551,42 @@ Usage: {name} [OPTIONS] SUBCOMMAND [ARGS]...
     )
 
 
+def walk_commands_root_aggregation(
+    parser: argparse.ArgumentParser,
+    *,
+    name: str,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+) -> Iterator[ArgparseCommandMetadata]:
+    description_parts = [get_root_parser_header(parser, name)]
+    for command_path, subparser in walk_parser_tree(parser, name=name, include=include, exclude=exclude):
+        description_parts.append(f"\n## {command_path}\n\n{get_parser_full_usage(subparser, command_path)}\n")
+
+    yield get_root_parser_metadata(name, "".join(description_parts))
+
+
+def walk_commands_summary_aggregation(
+    parser: argparse.ArgumentParser,
+    *,
+    name: str,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+) -> Iterator[CommandMetadata]:
+    summaries: list[tuple[str, str]] = []
+    usages: dict[str, str | Callable[[], str]] = {}
+    for command_path, subparser in walk_parser_tree(parser, name=name, include=include, exclude=exclude):
+        summaries.append((command_path, get_summary(get_parser_description(subparser))))
+        usages[command_path] = partial(get_parser_full_usage, subparser, command_path)
+
+    help_metadata = HelpMetadata.from_commands(name, usages)
+    yield get_root_parser_metadata(
+        name,
+        build_summary_description(get_root_parser_header(parser, name), summaries, get_tool_name(help_metadata.path)),
+    )
+    yield help_metadata
+
+
+@overload
 def walk_commands(
     parser: argparse.ArgumentParser,
     *,
@@ -515,7 +595,30 @@ def walk_commands(
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     strict_types: bool = False,
-) -> Iterator[ArgparseCommandMetadata]:
+) -> Iterator[ArgparseCommandMetadata]: ...
+
+
+@overload
+def walk_commands(
+    parser: argparse.ArgumentParser,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+) -> Iterator[CommandMetadata]: ...
+
+
+def walk_commands(
+    parser: argparse.ArgumentParser,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+) -> Iterator[CommandMetadata]:
     if aggregate == "root":
         yield from walk_commands_root_aggregation(
             parser,
@@ -530,6 +633,13 @@ def walk_commands(
             include=include,
             exclude=exclude,
         )
+    elif aggregate == "summary":
+        yield from walk_commands_summary_aggregation(
+            parser,
+            name=name,
+            include=include,
+            exclude=exclude,
+        )
     elif aggregate == "none":
         yield from walk_commands_no_aggregation(
             parser,
@@ -5,15 +5,20 @@ from __future__ import annotations
 import inspect
 import re
 from collections.abc import Callable, Iterator
-from typing import Any, Literal
+from functools import partial
+from typing import Any, Literal, overload
 
 import click
 
-from pycli_mcp.metadata.interface import CommandMetadata
+from pycli_mcp.metadata.filter import CommandFilter
+from pycli_mcp.metadata.help import HelpMetadata, build_summary_description, get_summary
+from pycli_mcp.metadata.interface import CommandMetadata, get_tool_name
 
 ParameterInfoGetter = Callable[[Any, Any], dict[str, Any]]
 CommandUsagePiecesGetter = Callable[[Any, Any], list[str]]
 CommandGroupChecker = Callable[[Any], bool]
+# Appends the command line representation of a value to the flags, options or arguments
+OptionEmitter = Callable[[Any, list[str], list[str], list[str]], None]
 
 
 class ClickCommandMetadata(CommandMetadata):
@@ -21,55 +26,62 @@ class ClickCommandMetadata(CommandMetadata):
         super().__init__(path=path, schema=schema)
 
         self.__options = options
+        # Compiled once so that constructing a command only dispatches on the arguments that were passed
+        self.__prefix = tuple(path.split())
+        self.__emitters = {option_name: compile_option_emitter(option) for option_name, option in options.items()}
 
     @property
     def options(self) -> dict[str, ClickCommandOption]:
         return self.__options
 
+    def get_path_arguments(self, arguments: dict[str, Any] | None = None) -> list[str]:
+        paths: list[str] = []
+        if not arguments:
+            return paths
+
+        for option_name, value in arguments.items():
+            if value is None or not self.options[option_name].path:
+                continue
+
+            if isinstance(value, list):
+                paths.extend(map(str, value))
+            else:
+                paths.append(str(value))
+
+        return paths
+
     def construct(self, arguments: dict[str, Any] | None = None) -> list[str]:
-        command = self.path.split()
-        if arguments and self.options:
-            args: list[Any] = []
-            opts: list[Any] = []
+        command = list(self.__prefix)
+        if arguments and self.__emitters:
+            args: list[str] = []
+            opts: list[str] = []
             flags: list[str] = []
+            emitters = self.__emitters
             for option_name, value in arguments.items():
-                option = self.options[option_name]
-                if option.type == "argument":
-                    if isinstance(value, list):
-                        args.extend(value)
-                    else:
-                        args.append(value)
-
-                    continue
-
-                if option.flag:
-                    if value:
-                        flags.append(option.flag_name)
-                elif option.multiple:
-                    if option.container:
-                        for v in value:
-                            opts.append(option.flag_name)
-                            opts.extend(v)
-                    else:
-                        for v in value:
-                            opts.extend((option.flag_name, v))
-                elif option.container:
-                    opts.append(option.flag_name)
-                    opts.extend(value)
-                else:
-                    opts.extend((option.flag_name, value))
+                # Optional arguments that are explicitly `null` use their default value
+                if value is not None:
+                    emitters[option_name](value, flags, opts, args)
 
             command.extend(flags)
-            command.extend(map(str, opts))
+            command.extend(opts)
             if args:
                 command.append("--")
-                command.extend(map(str, args))
+                command.extend(args)
 
         return command
 
 
 class ClickCommandOption:
-    __slots__ = ("__container", "__description", "__flag", "__flag_name", "__multiple", "__required", "__type")
+    __slots__ = (
+        "__container",
+        "__description",
+        "__flag",
+        "__flag_name",
+        "__multiple",
+        "__path",
+        "__required",
+        "__type",
+    )
 
     def __init__(
         self,
@@ -81,6 +93,7 @@ class ClickCommandOption:
         container: bool = False,
         flag: bool = False,
         flag_name: str = "",
+        path: bool = False,
     ) -> None:
         self.__type = type
         self.__required = required
@@ -89,6 +102,7 @@ class ClickCommandOption:
         self.__container = container
         self.__flag = flag
         self.__flag_name = flag_name
+        self.__path = path
 
     @property
     def type(self) -> Literal["argument", "option"]:
@@ -118,6 +132,81 @@ class ClickCommandOption:
     def flag_name(self) -> str:
         return self.__flag_name
 
+    @property
+    def path(self) -> bool:
+        """
+        Returns:
+            Whether values refer to files or directories.
+        """
+        return self.__path
+
+
+def compile_option_emitter(option: ClickCommandOption) -> OptionEmitter:
+    flag_name = option.flag_name
+    if option.type == "argument":
+
+        def emit_argument(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            if isinstance(value, list):
+                args.extend(map(str, value))
+            else:
+                args.append(str(value))
+
+        return emit_argument
+
+    if option.flag:
+
+        def emit_flag(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            if value:
+                flags.append(flag_name)
+
+        return emit_flag
+
+    if option.multiple and option.container:
+
+        def emit_containers(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            for v in value:
+                opts.append(flag_name)
+                opts.extend(map(str, v))
+
+        return emit_containers
+
+    if option.multiple:
+
+        def emit_multiple(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            for v in value:
+                opts.extend((flag_name, str(v)))
+
+        return emit_multiple
+
+    if option.container:
+
+        def emit_container(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+            opts.append(flag_name)
+            opts.extend(map(str, value))
+
+        return emit_container
+
+    def emit_option(value: Any, flags: list[str], opts: list[str], args: list[str]) -> None:  # noqa: ARG001
+        opts.extend((flag_name, str(value)))
+
+    return emit_option
+
+
+class LazyCommand(click.Command):
+    """
+    Stands in for a subcommand that has not been loaded so that collecting metadata does not import it.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(
+            name,
+            help="This subcommand is loaded on demand, pass `--help` as its arguments to view its usage.",
+            add_help_option=False,
+        )
+
+    def collect_usage_pieces(self, ctx: click.Context) -> list[str]:  # noqa: ARG002, PLR6301
+        return ["[ARGS]..."]
+
 
 def get_longest_flag(flags: list[str]) -> str:
     return sorted(flags, key=len)[-1]  # noqa: FURB192
@@ -132,6 +221,18 @@ def is_command_group(command: click.Command) -> bool:
     return isinstance(command, click.Group)
 
 
+def is_lazy_group(command: Any, subcommand_names: list[str]) -> bool:
+    """
+    Returns:
+        Whether the group lists subcommands that it has not registered, which are loaded by `get_command`.
+    """
+    # Collections merge the subcommands of their sources, which are already loaded
+    if isinstance(command, click.CommandCollection):
+        return False
+
+    return set(subcommand_names) != set(getattr(command, "commands", {}))
+
+
 def get_command_usage_pieces(command: click.Command, ctx: click.Context) -> list[str]:
     return list(command.collect_usage_pieces(ctx))
 
@@ -203,33 +304,49 @@ def walk_command_tree(
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     parent: click.Context | None = None,
+    lazy: bool = False,
     command_group_checker: CommandGroupChecker = is_command_group,
+    command_filter: CommandFilter | None = None,
 ) -> Iterator[click.Context]:
     if command.hidden:
         return
 
+    if command_filter is None:
+        command_filter = CommandFilter(include=include, exclude=exclude)
+
     ctx = command.context_class(command, parent=parent, info_name=name, **command.context_settings)
     if not command_group_checker(command):
-        subcommand_path = " ".join(ctx.command_path.split()[1:])
-        if exclude is not None and re.search(exclude, subcommand_path):
-            return
-        if include is not None and not re.search(include, subcommand_path):
-            return
+        if command_filter.matches(" ".join(ctx.command_path.split()[1:])):
+            yield ctx
 
-        yield ctx
         return
 
-    for subcommand_name in command.list_commands(ctx):
-        subcommand = command.get_command(ctx, subcommand_name)
-        if subcommand is None:
+    # Subcommand paths are built like `click.Context.command_path` so that subtrees may be skipped before loading
+    group_path = " ".join([
+        *ctx.command_path.split()[1:],
+        *(piece for param in command.get_params(ctx) for piece in param.get_usage_pieces(ctx)),
+    ])
+    subcommand_names = command.list_commands(ctx)
+    lazy_group = lazy and is_lazy_group(command, subcommand_names)
+    for subcommand_name in subcommand_names:
+        if not command_filter.may_match_within(f"{group_path} {subcommand_name}".lstrip()):
             continue
+
+        if lazy_group:
+            # Only subcommands that were registered directly are already loaded
+            subcommand = command.commands.get(subcommand_name) or LazyCommand(subcommand_name)
+        else:
+            subcommand = command.get_command(ctx, subcommand_name)
+            if subcommand is None:
+                continue
+
         yield from walk_command_tree(
             subcommand,
             name=subcommand_name,
-            include=include,
-            exclude=exclude,
             parent=ctx,
+            lazy=lazy,
             command_group_checker=command_group_checker,
+            command_filter=command_filter,
         )
 
 
@@ -282,32 +399,14 @@ def walk_commands_no_aggregation(
 
             # Some types are just strings
             if type_name in {"Path", "File"}:
+                option_data["path"] = True
                 type_name = "String"
 
-            if type_name == "String":
-                if info["nargs"] == -1 or info["multiple"]:
-                    prop["type"] = "array"
-                    prop["items"] = {"type": "string"}
-                else:
-                    prop["type"] = "string"
-            elif type_name == "Bool":
+            # Variadic arguments and options that may be repeated accept a list of values
+            variadic = info["nargs"] == -1 or info["multiple"]
+            if type_name == "Bool":
                 option_data["flag"] = True
                 prop["type"] = "boolean"
-            elif type_name == "Int":
-                if info["multiple"]:
-                    prop["type"] = "array"
-                    prop["items"] = {"type": "integer"}
-                else:
-                    prop["type"] = "integer"
-            elif type_name == "Float":
-                if info["multiple"]:
-                    prop["type"] = "array"
-                    prop["items"] = {"type": "number"}
-                else:
-                    prop["type"] = "number"
-            elif "choices" in type_data:
-                prop["type"] = "string"
-                prop["enum"] = list(type_data["choices"])
             elif type_name == "Tuple":
                 option_data["container"] = True
                 if info["multiple"]:
@@ -316,11 +415,26 @@ def walk_commands_no_aggregation(
                 else:
                     prop["type"] = "array"
                     prop["items"] = {"type": "string"}
-            elif strict_types:
-                msg = f"Unknown type: {type_data}\n{info}"
-                raise ValueError(msg)
             else:
-                prop["type"] = "string"
+                if type_name == "String":
+                    item_schema: dict[str, Any] = {"type": "string"}
+                elif type_name == "Int":
+                    item_schema = {"type": "integer"}
+                elif type_name == "Float":
+                    item_schema = {"type": "number"}
+                elif "choices" in type_data:
+                    item_schema = {"type": "string", "enum": list(type_data["choices"])}
+                elif strict_types:
+                    msg = f"Unknown type: {type_data}\n{info}"
+                    raise ValueError(msg)
+                else:
+                    item_schema = {"type": "string"}
+
+                if variadic:
+                    prop["type"] = "array"
+                    prop["items"] = item_schema
+                else:
+                    prop.update(item_schema)
 
             if not info["required"]:
                 prop["default"] = None if callable(info["default"]) else info["default"]
@@ -348,6 +462,7 @@ def walk_commands_group_aggregation(
     name: str | None = None,
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
+    lazy: bool = False,
     parameter_info_getter: ParameterInfoGetter = get_parameter_info,
     command_usage_pieces_getter: CommandUsagePiecesGetter = get_command_usage_pieces,
     command_group_checker: CommandGroupChecker = is_command_group,
@@ -358,6 +473,7 @@ def walk_commands_group_aggregation(
         name=name or command.name,
         include=include,
         exclude=exclude,
+        lazy=lazy,
         command_group_checker=command_group_checker,
     ):
         if ctx.parent is None:
@@ -405,22 +521,14 @@ def walk_commands_group_aggregation(
             )
             continue
 
-        description = f"""\
-Usage: {group_path} SUBCOMMAND [ARGS]...
-
-# Available subcommands
-"""
+        description_parts = [f"Usage: {group_path} SUBCOMMAND [ARGS]...\n\n# Available subcommands\n"]
         for command_name, ctx in commands.items():
             command_usage = _get_command_full_usage(
                 ctx,
                 parameter_info_getter=parameter_info_getter,
                 command_usage_pieces_getter=command_usage_pieces_getter,
             )
-            description += f"""
-## {command_name}
-
-{command_usage}
-"""
+            description_parts.append(f"\n## {command_name}\n\n{command_usage}\n")
 
         yield ClickCommandMetadata(
             path=group_path,
@@ -443,7 +551,7 @@ Usage: {group_path} SUBCOMMAND [ARGS]...
                     },
                 },
                 "title": group_path,
-                "description": description.lstrip(),
+                "description": "".join(description_parts),
             },
             options={
                 "subcommand": ClickCommandOption(
@@ -460,50 +568,29 @@ Usage: {group_path} SUBCOMMAND [ARGS]...
         )
 
 
-def walk_commands_root_aggregation(
+def get_root_command_header(
     command: Any,
+    name: str,
     *,
-    name: str | None = None,
-    include: str | re.Pattern | None = None,
-    exclude: str | re.Pattern | None = None,
     parameter_info_getter: ParameterInfoGetter = get_parameter_info,
-    command_usage_pieces_getter: CommandUsagePiecesGetter = get_command_usage_pieces,
     command_group_checker: CommandGroupChecker = is_command_group,
-) -> Iterator[ClickCommandMetadata]:
-    root_command_name = name or command.name
-    description = ""
-    if command_group_checker(command):
-        ctx = command.context_class(command, info_name=root_command_name, **command.context_settings)
-        description += f"""\
-# {root_command_name}
-
-Usage: {root_command_name} [OPTIONS] SUBCOMMAND [ARGS]...
-"""
-        if root_command_description := get_command_description(command):
-            description += f"\n{root_command_description}\n"
-        if root_command_options := _get_command_options_block(ctx, parameter_info_getter=parameter_info_getter):
-            description += f"\nOptions:\n{root_command_options}\n"
+) -> str:
+    if not command_group_checker(command):
+        return ""
 
-    for ctx in walk_command_tree(
-        command,
-        name=root_command_name,
-        include=include,
-        exclude=exclude,
-        command_group_checker=command_group_checker,
-    ):
-        command_usage = _get_command_full_usage(
-            ctx,
-            parameter_info_getter=parameter_info_getter,
-            command_usage_pieces_getter=command_usage_pieces_getter,
-        )
-        description += f"""
-## {ctx.command_path}
+    ctx = command.context_class(command, info_name=name, **command.context_settings)
+    parts = [f"# {name}\n\nUsage: {name} [OPTIONS] SUBCOMMAND [ARGS]...\n"]
+    if root_command_description := get_command_description(command):
+        parts.append(f"\n{root_command_description}\n")
+    if root_command_options := _get_command_options_block(ctx, parameter_info_getter=parameter_info_getter):
+        parts.append(f"\nOptions:\n{root_command_options}\n")
 
-{command_usage}
-"""
+    return "".join(parts)
 
-    yield ClickCommandMetadata(
-        path=root_command_name,  # type: ignore[arg-type]
+
+def get_root_command_metadata(name: str, description: str) -> ClickCommandMetadata:
+    return ClickCommandMetadata(
+        path=name,
         schema={
             "type": "object",
             "properties": {
@@ -516,7 +603,7 @@ Usage: {root_command_name} [OPTIONS] SUBCOMMAND [ARGS]...
                     "description": "The arguments to pass to the root command",
                 },
             },
-            "title": root_command_name,
+            "title": name,
             "description": description.lstrip(),
         },
         options={
@@ -529,6 +616,92 @@ Usage: {root_command_name} [OPTIONS] SUBCOMMAND [ARGS]...
     )
 
 
+def walk_commands_root_aggregation(
+    command: Any,
+    *,
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    lazy: bool = False,
+    parameter_info_getter: ParameterInfoGetter = get_parameter_info,
+    command_usage_pieces_getter: CommandUsagePiecesGetter = get_command_usage_pieces,
+    command_group_checker: CommandGroupChecker = is_command_group,
+) -> Iterator[ClickCommandMetadata]:
+    root_command_name = name or command.name
+    description_parts = [
+        get_root_command_header(
+            command,
+            root_command_name,
+            parameter_info_getter=parameter_info_getter,
+            command_group_checker=command_group_checker,
+        )
+    ]
+    for ctx in walk_command_tree(
+        command,
+        name=root_command_name,
+        include=include,
+        exclude=exclude,
+        lazy=lazy,
+        command_group_checker=command_group_checker,
+    ):
+        command_usage = _get_command_full_usage(
+            ctx,
+            parameter_info_getter=parameter_info_getter,
+            command_usage_pieces_getter=command_usage_pieces_getter,
+        )
+        description_parts.append(f"\n## {ctx.command_path}\n\n{command_usage}\n")
+
+    yield get_root_command_metadata(root_command_name, "".join(description_parts))
+
+
+def walk_commands_summary_aggregation(
+    command: Any,
+    *,
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    lazy: bool = False,
+    parameter_info_getter: ParameterInfoGetter = get_parameter_info,
+    command_usage_pieces_getter: CommandUsagePiecesGetter = get_command_usage_pieces,
+    command_group_checker: CommandGroupChecker = is_command_group,
+) -> Iterator[CommandMetadata]:
+    root_command_name = name or command.name
+    summaries: list[tuple[str, str]] = []
+    usages: dict[str, str | Callable[[], str]] = {}
+    for ctx in walk_command_tree(
+        command,
+        name=root_command_name,
+        include=include,
+        exclude=exclude,
+        lazy=lazy,
+        command_group_checker=command_group_checker,
+    ):
+        summaries.append((
+            ctx.command_path,
+            ctx.command.short_help or get_summary(get_command_description(ctx.command)),
+        ))
+        usages[ctx.command_path] = partial(
+            _get_command_full_usage,
+            ctx,
+            parameter_info_getter=parameter_info_getter,
+            command_usage_pieces_getter=command_usage_pieces_getter,
+        )
+
+    help_metadata = HelpMetadata.from_commands(root_command_name, usages)
+    header = get_root_command_header(
+        command,
+        root_command_name,
+        parameter_info_getter=parameter_info_getter,
+        command_group_checker=command_group_checker,
+    )
+    yield get_root_command_metadata(
+        root_command_name,
+        build_summary_description(header, summaries, get_tool_name(help_metadata.path)),
+    )
+    yield help_metadata
+
+
+@overload
 def walk_commands(
     command: Any,
     *,
@@ -537,7 +710,33 @@ def walk_commands(
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     strict_types: bool = False,
-) -> Iterator[ClickCommandMetadata]:
+    lazy: bool = False,
+) -> Iterator[ClickCommandMetadata]: ...
+
+
+@overload
+def walk_commands(
+    command: Any,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+    lazy: bool = False,
+) -> Iterator[CommandMetadata]: ...
+
+
+def walk_commands(
+    command: Any,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+    lazy: bool = False,
+) -> Iterator[CommandMetadata]:
     yield from _walk_commands(
         command,
         aggregate=aggregate,
@@ -545,27 +744,35 @@ def walk_commands(
         include=include,
         exclude=exclude,
         strict_types=strict_types,
+        lazy=lazy,
     )
 
 
 def _walk_commands(
     command: Any,
     *,
-    aggregate: Literal["root", "group", "none"],
+    aggregate: Literal["root", "group", "none", "summary"],
     name: str | None = None,
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     strict_types: bool = False,
+    lazy: bool = False,
     parameter_info_getter: ParameterInfoGetter = get_parameter_info,
     command_usage_pieces_getter: CommandUsagePiecesGetter = get_command_usage_pieces,
     command_group_checker: CommandGroupChecker = is_command_group,
-) -> Iterator[ClickCommandMetadata]:
+) -> Iterator[CommandMetadata]:
+    # Every tool needs the schema of its command when there is no aggregation
+    if lazy and aggregate == "none":
+        msg = "Lazy loading of subcommands requires root or group aggregation"
+        raise ValueError(msg)
+
     if aggregate == "root":
         yield from walk_commands_root_aggregation(
             command,
             name=name,
             include=include,
             exclude=exclude,
+            lazy=lazy,
             parameter_info_getter=parameter_info_getter,
             command_usage_pieces_getter=command_usage_pieces_getter,
             command_group_checker=command_group_checker,
@@ -576,6 +783,18 @@ def _walk_commands(
             name=name,
             include=include,
             exclude=exclude,
+            lazy=lazy,
+            parameter_info_getter=parameter_info_getter,
+            command_usage_pieces_getter=command_usage_pieces_getter,
+            command_group_checker=command_group_checker,
+        )
+    elif aggregate == "summary":
+        yield from walk_commands_summary_aggregation(
+            command,
+            name=name,
+            include=include,
+            exclude=exclude,
+            lazy=lazy,
             parameter_info_getter=parameter_info_getter,
             command_usage_pieces_getter=command_usage_pieces_getter,
             command_group_checker=command_group_checker,
@@ -2,16 +2,19 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import weakref
 from types import NoneType, UnionType
-from typing import TYPE_CHECKING, Any, Literal, Union, get_args, get_origin
+from typing import TYPE_CHECKING, Any, Literal, Union, get_args, get_origin, overload
 
-from pycli_mcp.metadata.types.click import ClickCommandMetadata
 from pycli_mcp.metadata.types.click import _walk_commands as walk_click_commands
 from pycli_mcp.metadata.types.click import get_parameter_info as get_click_parameter_info
 
 if TYPE_CHECKING:
     import re
-    from collections.abc import Iterator
+    from collections.abc import Callable, Hashable, Iterator
+
+    from pycli_mcp.metadata.interface import CommandMetadata
+    from pycli_mcp.metadata.types.click import ClickCommandMetadata
 
 
 def is_typer_app(command: Any) -> bool:
@@ -26,13 +29,105 @@ def is_typer_command_group(command: Any) -> bool:
     return hasattr(command, "list_commands") and hasattr(command, "get_command")
 
 
+# Converting an application and inspecting the signature of callbacks are by far the most expensive parts of
+# collection, so the results are shared by every walk of the same objects
+TYPER_COMMAND_CACHE: weakref.WeakKeyDictionary[Any, tuple[Hashable, Any]] = weakref.WeakKeyDictionary()
+TYPER_CALLBACK_CACHE: weakref.WeakKeyDictionary[Callable, TyperCallbackIntrospection] = weakref.WeakKeyDictionary()
+
+
+def get_typer_app_signature(app: Any) -> Hashable:
+    """
+    Returns:
+        A value that changes whenever commands, groups or the callback are registered on the application or any of
+            its nested applications.
+    """
+    return (
+        id(app.registered_callback),
+        tuple(id(info) for info in app.registered_commands),
+        tuple((id(info), get_typer_app_signature(info.typer_instance)) for info in app.registered_groups),
+    )
+
+
 def get_typer_command(command: Any) -> Any:
-    if is_typer_app(command):
-        from typer.main import get_command
+    if not is_typer_app(command):
+        return command
+
+    signature = get_typer_app_signature(command)
+    if (cached := TYPER_COMMAND_CACHE.get(command)) is not None and cached[0] == signature:
+        return cached[1]
+
+    from typer.main import get_command
+
+    click_command = get_command(command)
+    TYPER_COMMAND_CACHE[command] = (signature, click_command)
+    return click_command
+
+
+class TyperCallbackIntrospection:
+    """
+    The parameters of a command callback, whose type data is computed when first requested.
+    """
+
+    __slots__ = ("__params", "__type_data")
+
+    def __init__(self, callback: Callable) -> None:
+        from typer.utils import get_params_from_function
+
+        self.__params = get_params_from_function(callback)
+        self.__type_data: dict[tuple[str, str], dict[str, Any] | None] = {}
+
+    def get_type_data(self, name: str, param_type_name: str) -> dict[str, Any] | None:
+        """
+        Returns:
+            The type data of the parameter, or `None` if it is not part of the signature of the callback.
+        """
+        key = (name, param_type_name)
+        if key not in self.__type_data:
+            self.__type_data[key] = self.__get_type_data(name, param_type_name)
+
+        return self.__type_data[key]
+
+    def __get_type_data(self, name: str, param_type_name: str) -> dict[str, Any] | None:
+        from typer.models import ArgumentInfo, OptionInfo
+
+        param_meta = self.__params.get(name)
+        if param_meta is None:
+            return None
+
+        main_type = param_meta.annotation
+        origin = get_origin(main_type)
+        if origin in {UnionType, Union}:
+            union_types = [member for member in get_args(main_type) if member is not NoneType]
+            if len(union_types) == 1:
+                main_type = union_types[0]
+                origin = get_origin(main_type)
+
+        if origin is list:
+            main_type = get_args(main_type)[0]
+
+        default = param_meta.default
+        if isinstance(default, (OptionInfo, ArgumentInfo)):
+            parameter_info: Any = default
+        elif param_type_name == "option":
+            parameter_info = OptionInfo()
+        else:
+            parameter_info = ArgumentInfo()
+
+        click_type = get_typer_click_type(annotation=main_type, parameter_info=parameter_info)
+        return get_typer_type_data(click_type)
 
-        return get_command(command)
 
-    return command
+def get_typer_callback_introspection(callback: Callable) -> TyperCallbackIntrospection:
+    try:
+        introspection = TYPER_CALLBACK_CACHE.get(callback)
+    # Some callables cannot be weakly referenced
+    except TypeError:
+        return TyperCallbackIntrospection(callback)
+
+    if introspection is None:
+        introspection = TYPER_CALLBACK_CACHE[callback] = TyperCallbackIntrospection(callback)
+
+    return introspection
 
 
 def get_typer_command_usage_pieces(command: Any, ctx: Any) -> list[str]:
@@ -79,32 +174,10 @@ def get_typer_parameter_info(param: Any, ctx: Any) -> dict[str, Any]:
 
     callback = getattr(ctx.command, "callback", None)
     if callback is not None:
-        from typer.models import ArgumentInfo, OptionInfo
-        from typer.utils import get_params_from_function
-
-        param_meta = get_params_from_function(callback).get(param.name or "")
-        if param_meta is not None:
-            main_type = param_meta.annotation
-            origin = get_origin(main_type)
-            if origin in {UnionType, Union}:
-                union_types = [member for member in get_args(main_type) if member is not NoneType]
-                if len(union_types) == 1:
-                    main_type = union_types[0]
-                    origin = get_origin(main_type)
-
-            if origin is list:
-                main_type = get_args(main_type)[0]
-
-            default = param_meta.default
-            if isinstance(default, (OptionInfo, ArgumentInfo)):
-                parameter_info: Any = default
-            elif getattr(param, "param_type_name", "option") == "option":
-                parameter_info = OptionInfo()
-            else:
-                parameter_info = ArgumentInfo()
-
-            click_type = get_typer_click_type(annotation=main_type, parameter_info=parameter_info)
-            type_data = get_typer_type_data(click_type)
+        introspection = get_typer_callback_introspection(callback)
+        param_type_name = getattr(param, "param_type_name", "option")
+        if (callback_type_data := introspection.get_type_data(param.name or "", param_type_name)) is not None:
+            type_data = callback_type_data
 
     return {
         "name": getattr(param, "name", None),
@@ -121,6 +194,7 @@ def get_typer_parameter_info(param: Any, ctx: Any) -> dict[str, Any]:
     }
 
 
+@overload
 def walk_commands(
     command: Any,
     *,
@@ -129,7 +203,30 @@ def walk_commands(
     include: str | re.Pattern | None = None,
     exclude: str | re.Pattern | None = None,
     strict_types: bool = False,
-) -> Iterator[ClickCommandMetadata]:
+) -> Iterator[ClickCommandMetadata]: ...
+
+
+@overload
+def walk_commands(
+    command: Any,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+) -> Iterator[CommandMetadata]: ...
+
+
+def walk_commands(
+    command: Any,
+    *,
+    aggregate: Literal["root", "group", "none", "summary"],
+    name: str | None = None,
+    include: str | re.Pattern | None = None,
+    exclude: str | re.Pattern | None = None,
+    strict_types: bool = False,
+) -> Iterator[CommandMetadata]:
     yield from walk_click_commands(
         get_typer_command(command),
         aggregate=aggregate,
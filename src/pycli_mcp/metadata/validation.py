@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    # Returns an error message for invalid values, or `None` for valid values
+    ValueChecker = Callable[[Any], str | None]
+
+
+def is_string(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def is_integer(value: Any) -> bool:
+    # JSON has no separate boolean and integer types like Python does
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_boolean(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+def is_array(value: Any) -> bool:
+    return isinstance(value, list)
+
+
+def is_object(value: Any) -> bool:
+    return isinstance(value, dict)
+
+
+TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": is_string,
+    "integer": is_integer,
+    "number": is_number,
+    "boolean": is_boolean,
+    "array": is_array,
+    "object": is_object,
+}
+
+JSON_TYPE_NAMES: dict[type, str] = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+    type(None): "null",
+}
+
+
+def get_json_type_name(value: Any) -> str:
+    return JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def compile_value_checker(schema: dict[str, Any]) -> ValueChecker:
+    """
+    Returns:
+        A function that checks values against the subset of JSON Schema used for the input of tools, which is the
+            `type`, `items` and `enum` keywords.
+    """
+    checks: list[ValueChecker] = []
+    if (type_name := schema.get("type")) is not None and (type_check := TYPE_CHECKS.get(type_name)) is not None:
+
+        def check_type(value: Any) -> str | None:
+            if type_check(value):
+                return None
+
+            return f"must be of type {type_name}, got {get_json_type_name(value)}"
+
+        checks.append(check_type)
+
+    if (items_schema := schema.get("items")) is not None:
+        check_item = compile_value_checker(items_schema)
+
+        def check_items(value: Any) -> str | None:
+            if not isinstance(value, list):
+                return None
+
+            for index, item in enumerate(value):
+                if (message := check_item(item)) is not None:
+                    return f"item {index} {message}"
+
+            return None
+
+        checks.append(check_items)
+
+    if (choices := schema.get("enum")) is not None:
+        allowed = frozenset(choice for choice in choices if isinstance(choice, (str, int, float, bool)))
+        choice_list = ", ".join(map(str, choices))
+
+        def check_enum(value: Any) -> str | None:
+            if isinstance(value, (str, int, float, bool)) and value in allowed:
+                return None
+
+            return f"must be one of: {choice_list}"
+
+        checks.append(check_enum)
+
+    if not checks:
+        return lambda _: None
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any) -> str | None:
+        for check in checks:
+            if (message := check(value)) is not None:
+                return message
+
+        return None
+
+    return check_all
+
+
+class ArgumentValidator:
+    """
+    Validates the arguments of a tool call against the input schema of the tool. The schema is compiled once so that
+    invalid calls are rejected without constructing or running a command.
+    """
+
+    __slots__ = ("__checkers", "__nullable", "__required")
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        properties: dict[str, dict[str, Any]] = schema.get("properties", {})
+        self.__checkers = {name: compile_value_checker(prop) for name, prop in properties.items()}
+        self.__required = tuple(schema.get("required", ()))
+        # Optional arguments have a default of `null` so clients may send it explicitly
+        self.__nullable = frozenset(
+            name for name, prop in properties.items() if "default" in prop and prop["default"] is None
+        )
+
+    def __call__(self, arguments: dict[str, Any] | None) -> None:
+        """
+        Raises:
+            ValueError: If the arguments are invalid.
+        """
+        if arguments is None:
+            arguments = {}
+
+        for name in self.__required:
+            if arguments.get(name) is None:
+                msg = f"Missing required argument: {name}"
+                raise ValueError(msg)
+
+        for name, value in arguments.items():
+            checker = self.__checkers.get(name)
+            if checker is None:
+                msg = f"Unknown argument: {name}"
+                raise ValueError(msg)
+
+            if value is None and name in self.__nullable:
+                continue
+
+            if (message := checker(value)) is not None:
+                msg = f"Argument `{name}` {message}"
+                raise ValueError(msg)
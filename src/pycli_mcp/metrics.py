@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pycli_mcp.execution.interface import ExecutionResult
+
+# https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+TOOL_HISTOGRAMS = (
+    ("construct", "pycli_mcp_tool_construct_seconds", "Time spent constructing command lines from tool arguments"),
+    ("queue_wait", "pycli_mcp_tool_queue_wait_seconds", "Time tool calls waited to be admitted"),
+    ("spawn", "pycli_mcp_tool_spawn_seconds", "Time from admission until commands started running"),
+    ("run", "pycli_mcp_tool_run_seconds", "Time commands spent running"),
+    ("output", "pycli_mcp_tool_output_bytes", "Size of the output of commands, including elided output"),
+)
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{key}="{escape_label_value(value)}"' for key, value in labels.items())
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if isinstance(value, int) or value.is_integer() else repr(value)
+
+
+class Histogram:
+    """
+    A histogram with fixed buckets, updated without locks since every observation happens on the event loop.
+    """
+
+    __slots__ = ("__buckets", "__counts", "__sum")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.__buckets = tuple(buckets)
+        # The last count is for observations greater than every bucket
+        self.__counts = [0] * (len(self.__buckets) + 1)
+        self.__sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.__counts)
+
+    @property
+    def sum(self) -> float:
+        return self.__sum
+
+    def observe(self, value: float) -> None:
+        # Buckets are inclusive upper bounds
+        self.__counts[bisect_left(self.__buckets, value)] += 1
+        self.__sum += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines: list[str] = []
+        cumulative = 0
+        for bucket, count in zip(self.__buckets, self.__counts, strict=False):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{format_value(bucket)}"}} {cumulative}')
+
+        cumulative += self.__counts[-1]
+        lines.extend((
+            f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}',
+            f"{name}_sum{{{labels}}} {format_value(self.__sum)}",
+            f"{name}_count{{{labels}}} {cumulative}",
+        ))
+        return lines
+
+
+class ToolMetrics:
+    __slots__ = ("__exit_codes", "__histograms", "__in_flight", "__timeouts")
+
+    def __init__(self) -> None:
+        self.__histograms = {
+            key: Histogram(SIZE_BUCKETS if key == "output" else LATENCY_BUCKETS) for key, _, _ in TOOL_HISTOGRAMS
+        }
+        self.__exit_codes: dict[int, int] = {}
+        self.__timeouts = 0
+        self.__in_flight = 0
+
+    @property
+    def histograms(self) -> dict[str, Histogram]:
+        return self.__histograms
+
+    @property
+    def exit_codes(self) -> dict[int, int]:
+        return self.__exit_codes
+
+    @property
+    def timeouts(self) -> int:
+        return self.__timeouts
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    def observe_construct(self, seconds: float) -> None:
+        self.__histograms["construct"].observe(seconds)
+
+    def start(self, queue_wait: float) -> None:
+        self.__histograms["queue_wait"].observe(queue_wait)
+        self.__in_flight += 1
+
+    def abort(self) -> None:
+        self.__in_flight -= 1
+
+    def finish(self, result: ExecutionResult, admitted: float, finished: float) -> None:
+        """
+        Parameters:
+            result: The result of the command.
+            admitted: The value of `time.perf_counter` when the call was admitted.
+            finished: The value of `time.perf_counter` when the command finished.
+        """
+        self.__in_flight -= 1
+        if result.started is None:
+            self.__histograms["run"].observe(finished - admitted)
+        else:
+            self.__histograms["spawn"].observe(result.started - admitted)
+            self.__histograms["run"].observe(finished - result.started)
+
+        self.__histograms["output"].observe(len(result.output.encode("utf-8")) + result.elided)
+        if result.timed_out:
+            self.__timeouts += 1
+        else:
+            self.__exit_codes[result.exit_code] = self.__exit_codes.get(result.exit_code, 0) + 1
+
+
+class ServerMetrics:
+    """
+    Collects metrics about tool calls and the collection of commands, which are exported in the Prometheus
+    [text format](https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format).
+    Recording only updates plain counters on the event loop, so it is cheap enough to always be enabled.
+    """
+
+    __slots__ = ("__catalog_build_times", "__tools")
+
+    def __init__(self) -> None:
+        self.__tools: dict[str, ToolMetrics] = {}
+        self.__catalog_build_times: dict[tuple[str, str], float] = {}
+
+    def get_tool_metrics(self, tool_name: str) -> ToolMetrics:
+        if (tool_metrics := self.__tools.get(tool_name)) is None:
+            tool_metrics = self.__tools[tool_name] = ToolMetrics()
+
+        return tool_metrics
+
+    def set_catalog_build_time(self, query: str, command: str, seconds: float) -> None:
+        self.__catalog_build_times[query, command] = seconds
+
+    def render(self) -> str:
+        lines: list[str] = []
+        tools = sorted(self.__tools.items())
+        for key, name, description in TOOL_HISTOGRAMS:
+            lines.extend((f"# HELP {name} {description}", f"# TYPE {name} histogram"))
+            for tool_name, tool_metrics in tools:
+                lines.extend(tool_metrics.histograms[key].render(name, format_labels({"tool": tool_name})))
+
+        name = "pycli_mcp_tool_exit_codes_total"
+        lines.extend((f"# HELP {name} Commands that exited, by exit code", f"# TYPE {name} counter"))
+        for tool_name, tool_metrics in tools:
+            for exit_code, count in sorted(tool_metrics.exit_codes.items()):
+                lines.append(f"{name}{{{format_labels({'tool': tool_name, 'code': str(exit_code)})}}} {count}")
+
+        name = "pycli_mcp_tool_timeouts_total"
+        lines.extend((f"# HELP {name} Commands that were stopped after timing out", f"# TYPE {name} counter"))
+        lines.extend(
+            f"{name}{{{format_labels({'tool': tool_name})}}} {tool_metrics.timeouts}"
+            for tool_name, tool_metrics in tools
+        )
+
+        name = "pycli_mcp_tool_in_flight"
+        lines.extend((f"# HELP {name} Commands that are currently running", f"# TYPE {name} gauge"))
+        lines.extend(
+            f"{name}{{{format_labels({'tool': tool_name})}}} {tool_metrics.in_flight}"
+            for tool_name, tool_metrics in tools
+        )
+
+        name = "pycli_mcp_catalog_build_seconds"
+        lines.extend((f"# HELP {name} Time spent collecting the commands of each query", f"# TYPE {name} gauge"))
+        lines.extend(
+            f"{name}{{{format_labels({'query': query, 'command': command})}}} {format_value(seconds)}"
+            for (query, command), seconds in sorted(self.__catalog_build_times.items())
+        )
+
+        lines.append("")
+        return "\n".join(lines)
@@ -2,42 +2,79 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-import asyncio
+import codecs
+import contextlib
+import hashlib
+import json
 import logging
 import os
-import subprocess
-from contextlib import asynccontextmanager
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
 from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
+import anyio
 import uvicorn
-from mcp.server.lowlevel import Server
+from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.shared.exceptions import McpError
 from mcp.types import (
+    INVALID_PARAMS,
     CallToolRequest,
     CallToolResult,
+    ErrorData,
     ListToolsRequest,
     ListToolsResult,
     ServerResult,
     TextContent,
     Tool,
 )
+from pydantic import PrivateAttr
 from starlette.applications import Starlette
-from starlette.routing import Mount
-
+from starlette.responses import Response
+from starlette.routing import BaseRoute, Mount, Route
+
+from pycli_mcp.execution.admission import AdmissionController, ServerBusyError
+from pycli_mcp.execution.cache import get_cache_key, get_modification_times
+from pycli_mcp.execution.environment import get_server_cwd
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.execution.profile import ExecutionProfile
+from pycli_mcp.metadata.interface import get_tool_name
 from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.metadata.validation import ArgumentValidator
+from pycli_mcp.metrics import CONTENT_TYPE, ServerMetrics
+from pycli_mcp.tracing import Tracer, get_current_span, use_span
 
 logger = logging.getLogger(__name__)
 
 TOOL_NAME_ENV_VAR = "PYCLI_MCP_TOOL_NAME"
+DEADLINE_ENV_VAR = "PYCLI_MCP_DEADLINE"
 USER_AGENT_ENV_VAR = "PYCLI_MCP_USER_AGENT"
 
+# The SDK serializes every result with these options before sending it
+RESULT_SERIALIZATION_OPTIONS: dict[str, Any] = {"by_alias": True, "mode": "json", "exclude_none": True}
+
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Sequence
 
+    from mcp.server.models import InitializationOptions
+    from mcp.server.session import ServerSession
     from mcp.server.streamable_http import EventStore
-
+    from mcp.types import ProgressToken, RequestId
+    from starlette.requests import Request
+
+    from pycli_mcp.execution.cache import ResultCache
+    from pycli_mcp.execution.coalescing import CallCoalescer
+    from pycli_mcp.execution.interface import (
+        CommandExecutor,
+        ExecutionResult,
+        OutputCallback,
+    )
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
     from pycli_mcp.metadata.interface import CommandMetadata
+    from pycli_mcp.tracing import Span
 
 
 def get_http_user_agent(request: Any | None) -> str | None:
@@ -51,12 +88,167 @@ def log_http_user_agent(method: str, user_agent: str | None) -> None:
     logger.debug("HTTP User-Agent for MCP method `%s`: %r", method, user_agent)
 
 
+class SerializedResult(ServerResult):
+    """
+    A result that is only serialized once, no matter how many times it is sent.
+    """
+
+    _serialized: dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_result(cls, result: Any, serialized: dict[str, Any] | None = None) -> SerializedResult:
+        instance = cls(result)
+        instance._serialized = (
+            instance.root.model_dump(**RESULT_SERIALIZATION_OPTIONS) if serialized is None else serialized
+        )
+        return instance
+
+    @property
+    def serialized(self) -> dict[str, Any]:
+        return self._serialized
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:  # type: ignore[override]
+        if kwargs == RESULT_SERIALIZATION_OPTIONS:
+            return self._serialized
+
+        return super().model_dump(**kwargs)
+
+
+def check_page_size(page_size: int | None) -> None:
+    if page_size is not None and page_size < 1:
+        msg = f"The page size must be at least 1: {page_size}"
+        raise ValueError(msg)
+
+
+class ToolCatalog:
+    """
+    The response to `tools/list`, serialized once and versioned by a hash of its content. When a page size is set,
+    the tools are split into pages ahead of time and every page but the last links to the next with a cursor. Cursors
+    embed the version of the catalog so that cursors from before a reload are rejected rather than skipping tools.
+    """
+
+    __slots__ = ("__etag", "__pages", "__size")
+
+    def __init__(self, tools: list[Tool], *, page_size: int | None = None) -> None:
+        check_page_size(page_size)
+        serialized_tools = [tool.model_dump(**RESULT_SERIALIZATION_OPTIONS) for tool in tools]
+        data = json.dumps({"tools": serialized_tools}, separators=(",", ":")).encode("utf-8")
+        self.__etag = hashlib.sha256(data).hexdigest()
+        self.__size = len(data)
+
+        if not page_size or page_size >= len(tools):
+            self.__pages = [SerializedResult.from_result(ListToolsResult(tools=tools), {"tools": serialized_tools})]
+            return
+
+        self.__pages = []
+        for start in range(0, len(tools), page_size):
+            end = start + page_size
+            next_cursor = self.get_cursor(end // page_size) if end < len(tools) else None
+            serialized: dict[str, Any] = {"tools": serialized_tools[start:end]}
+            if next_cursor is not None:
+                serialized["nextCursor"] = next_cursor
+
+            self.__pages.append(
+                SerializedResult.from_result(
+                    ListToolsResult(tools=tools[start:end], nextCursor=next_cursor), serialized
+                )
+            )
+
+    @property
+    def result(self) -> SerializedResult:
+        """
+        Returns:
+            The first page of the response.
+        """
+        return self.__pages[0]
+
+    @property
+    def pages(self) -> list[SerializedResult]:
+        return self.__pages
+
+    @property
+    def etag(self) -> str:
+        return self.__etag
+
+    @property
+    def size(self) -> int:
+        """
+        Returns:
+            The number of bytes of the serialized tools.
+        """
+        return self.__size
+
+    def get_cursor(self, page: int) -> str:
+        return f"{self.__etag[:16]}:{page}"
+
+    def get_page(self, cursor: str | None) -> SerializedResult:
+        """
+        Returns:
+            The page that the cursor refers to, or the first page if there is no cursor.
+
+        Raises:
+            ValueError: If the cursor is invalid or from a previous version of the catalog.
+        """
+        if cursor is None:
+            return self.__pages[0]
+
+        version, _, page = cursor.partition(":")
+        if version != self.__etag[:16] or not page.isdigit() or not 0 < int(page) < len(self.__pages):
+            msg = f"Invalid cursor: {cursor}"
+            raise ValueError(msg)
+
+        return self.__pages[int(page)]
+
+
+class CommandServer(Server):
+    def create_initialization_options(
+        self,
+        notification_options: NotificationOptions | None = None,
+        experimental_capabilities: dict[str, dict[str, Any]] | None = None,
+    ) -> InitializationOptions:
+        # Clients are notified when the tools change after reloading the commands
+        if notification_options is None:
+            notification_options = NotificationOptions(tools_changed=True)
+
+        return super().create_initialization_options(notification_options, experimental_capabilities)
+
+
+class ProgressStream:
+    """
+    Forwards command output to the client as progress notifications, with the number of bytes received so far as the
+    progress and the decoded chunk as the message.
+    """
+
+    __slots__ = ("__decoder", "__progress_token", "__received", "__request_id", "__session")
+
+    def __init__(self, session: ServerSession, progress_token: ProgressToken, request_id: RequestId) -> None:
+        self.__session = session
+        self.__progress_token = progress_token
+        self.__request_id = str(request_id)
+        self.__decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.__received = 0
+
+    async def send(self, chunk: bytes) -> None:
+        self.__received += len(chunk)
+        # Multi-byte characters may be split across chunks
+        if text := self.__decoder.decode(chunk):
+            await self.__session.send_progress_notification(
+                self.__progress_token,
+                self.__received,
+                message=text,
+                related_request_id=self.__request_id,
+            )
+
+
 class Command:
-    __slots__ = ("__metadata", "__tool")
+    __slots__ = ("__executor", "__metadata", "__profile", "__tool", "__validator")
 
-    def __init__(self, metadata: CommandMetadata, tool: Tool):
+    def __init__(self, metadata: CommandMetadata, tool: Tool, executor: CommandExecutor, profile: ResolvedProfile):
         self.__metadata = metadata
         self.__tool = tool
+        self.__executor = executor
+        self.__profile = profile
+        self.__validator = ArgumentValidator(metadata.schema)
 
     @property
     def metadata(self) -> CommandMetadata:
@@ -66,6 +258,18 @@ class Command:
     def tool(self) -> Tool:
         return self.__tool
 
+    @property
+    def executor(self) -> CommandExecutor:
+        return self.__executor
+
+    @property
+    def profile(self) -> ResolvedProfile:
+        return self.__profile
+
+    @property
+    def validator(self) -> ArgumentValidator:
+        return self.__validator
+
 
 class CommandMCPServer:
     """
@@ -90,6 +294,27 @@ class CommandMCPServer:
             resumable.
         stateless: Whether to create a completely fresh transport for each request with no session tracking or state
             persistence between requests.
+        streaming: Whether to respond with [SSE](https://developer.mozilla.org/en-US/docs/Web/API/Server-sent_events)
+            streams rather than JSON, forwarding command output as progress notifications while it runs for tool calls
+            that request progress.
+        executor: The executor used for commands whose query does not set one. If `None`, every command runs in a
+            new [process][pycli_mcp.execution.process.SubprocessExecutor].
+        admission: The [admission controller][pycli_mcp.execution.admission.AdmissionController] that limits the
+            number of concurrent tool calls. If `None`, there are no limits.
+        timeout: The default number of seconds after which commands are stopped. If `None`, there is no limit.
+        tool_timeouts: The number of seconds after which commands are stopped for specific tool names, overriding
+            the default.
+        output_limit: The default [amount of output][pycli_mcp.execution.output.OutputLimit] kept for every command.
+            If `None`, all output is kept.
+        tool_output_limits: The amount of output kept for specific tool names, overriding the default.
+        result_cache: The [cache][pycli_mcp.execution.cache.ResultCache] used to reuse the results of tool calls.
+            If `None`, every call runs its command.
+        coalescer: The [coalescer][pycli_mcp.execution.coalescing.CallCoalescer] used to share runs between
+            identical tool calls that are in flight at the same time. If `None`, every call runs its own command.
+        page_size: The maximum number of tools in each response to `tools/list`, with clients fetching the rest
+            using cursors. If `None`, all tools are sent at once.
+        tracer: The [tracer][pycli_mcp.tracing.Tracer] that receives spans around every phase of tool calls and the
+            collection of commands. If `None`, spans are not recorded.
         **app_settings: Additional settings to pass to the Starlette [application][starlette.applications.Starlette].
     """
 
@@ -99,16 +324,41 @@ class CommandMCPServer:
         *,
         event_store: EventStore | None = None,
         stateless: bool = False,
+        streaming: bool = False,
+        executor: CommandExecutor | None = None,
+        admission: AdmissionController | None = None,
+        timeout: float | None = None,
+        tool_timeouts: dict[str, float] | None = None,
+        output_limit: OutputLimit | None = None,
+        tool_output_limits: dict[str, OutputLimit] | None = None,
+        result_cache: ResultCache | None = None,
+        coalescer: CallCoalescer | None = None,
+        page_size: int | None = None,
+        tracer: Tracer | None = None,
         **app_settings: Any,
     ) -> None:
+        check_page_size(page_size)
         self.__command_queries = [c if isinstance(c, CommandQuery) else CommandQuery(c) for c in commands]
         self.__app_settings = app_settings
-        self.__server: Server = Server("pycli_mcp")
+        self.__streaming = streaming
+        self.__default_executor = executor or SubprocessExecutor()
+        self.__admission = admission or AdmissionController()
+        self.__timeout = timeout
+        self.__tool_timeouts = tool_timeouts or {}
+        self.__output_limit = output_limit
+        self.__tool_output_limits = tool_output_limits or {}
+        self.__result_cache = result_cache
+        self.__coalescer = coalescer
+        self.__page_size = page_size
+        self.__metrics = ServerMetrics()
+        self.__tracer = tracer or Tracer()
+        self.__sessions: weakref.WeakSet[ServerSession] = weakref.WeakSet()
+        self.__server: Server = CommandServer("pycli_mcp")
         self.__session_manager = StreamableHTTPSessionManager(
             app=self.__server,
             event_store=event_store,
             stateless=stateless,
-            json_response=True,
+            json_response=not streaming,
         )
 
         # Register handlers
@@ -133,45 +383,181 @@ class CommandMCPServer:
         """
         return self.__session_manager
 
+    @property
+    def admission(self) -> AdmissionController:
+        """
+        Returns:
+            The admission controller that limits the number of concurrent tool calls.
+        """
+        return self.__admission
+
+    @property
+    def metrics(self) -> ServerMetrics:
+        """
+        Returns:
+            The metrics about tool calls and the collection of commands, served by the `/metrics` route.
+        """
+        return self.__metrics
+
+    @property
+    def tracer(self) -> Tracer:
+        return self.__tracer
+
     @cached_property
     def commands(self) -> dict[str, Command]:
         """
+        Execution profiles are resolved here, so this raises an error if an executable or working directory
+        does not exist.
+
         Returns:
             Dictionary used internally to store metadata about the exposed commands. Although it should not be modified,
                 the keys are the available MCP tool names and useful to know when overriding the default handlers.
         """
         commands: dict[str, Command] = {}
-        for query in self.__command_queries:
-            for metadata in query:
-                tool_name = metadata.path.replace(" ", ".").replace("-", "_")
-                tool = Tool(
-                    name=tool_name,
-                    description=metadata.schema["description"],
-                    inputSchema=metadata.schema,
-                )
-                commands[tool_name] = Command(metadata, tool)
+        for index, query in enumerate(self.__command_queries):
+            executor = query.executor or self.__default_executor
+            profile = query.profile or ExecutionProfile()
+            # Commands of the same query usually share the executable of the root command
+            resolved_profiles: dict[str | None, ResolvedProfile] = {}
+            root_name = ""
+            tool_count = len(commands)
+            start = time.perf_counter()
+            with self.tracer.start_span("collect", {"query": str(index)}) as span:
+                for metadata in query:
+                    root_name = root_name or metadata.path.split()[0]
+                    tool_name = get_tool_name(metadata.path)
+                    tool = Tool(
+                        name=tool_name,
+                        description=metadata.schema["description"],
+                        inputSchema=metadata.schema,
+                    )
+                    executable = metadata.path.split()[0] if executor.requires_executable else None
+                    if (resolved_profile := resolved_profiles.get(executable)) is None:
+                        resolved_profile = resolved_profiles[executable] = profile.resolve(executable)
+
+                    commands[tool_name] = Command(metadata, tool, executor, resolved_profile)
+
+                span.set_attributes({"command": root_name, "tools": len(commands) - tool_count})
+
+            self.metrics.set_catalog_build_time(str(index), root_name, time.perf_counter() - start)
 
         return commands
 
     @cached_property
-    def routes(self) -> list[Mount]:
+    def catalog(self) -> ToolCatalog:
+        """
+        Returns:
+            The serialized response to `tools/list`, which is built once and reused until the commands are reloaded.
         """
-        This would only be used directly if you want to add more routes in addition to the default `/mcp` route.
+        return ToolCatalog(self.list_command_tools(), page_size=self.__page_size)
+
+    async def reload_commands(self) -> bool:
+        """
+        Collects the commands again, for example after the CLIs changed. Connected clients are notified only if the
+        resulting tools differ.
+
+        Returns:
+            Whether the tools changed.
+        """
+        previous_etag = self.catalog.etag
+        for attr in ("commands", "catalog"):
+            self.__dict__.pop(attr, None)
+
+        if self.catalog.etag == previous_etag:
+            return False
+
+        for session in list(self.__sessions):
+            # The session may have been closed
+            with contextlib.suppress(Exception):
+                await session.send_tool_list_changed()
+
+        return True
+
+    @cached_property
+    def routes(self) -> list[BaseRoute]:
+        """
+        This would only be used directly if you want to add more routes in addition to the default `/mcp` and
+        `/metrics` routes.
 
         Returns:
             The [routes](https://www.starlette.io/routing/#http-routing) to mount in the Starlette
                 [application][starlette.applications.Starlette].
         """
-        return [Mount("/mcp", app=self.session_manager.handle_request)]
+        return [
+            Mount("/mcp", app=self.session_manager.handle_request),
+            Route("/metrics", endpoint=self.metrics_endpoint, methods=["GET"]),
+        ]
+
+    async def metrics_endpoint(self, request: Request) -> Response:  # noqa: ARG002
+        """
+        The endpoint of the `/metrics` route.
+
+        Returns:
+            The [metrics][pycli_mcp.server.CommandMCPServer.metrics] in the Prometheus text format.
+        """
+        return Response(self.metrics.render(), media_type=CONTENT_TYPE)
 
     @asynccontextmanager
     async def lifespan(self, app: Starlette) -> AsyncIterator[None]:  # noqa: ARG002
         """
         The default lifespan context manager used by the Starlette [application][starlette.applications.Starlette].
         """
-        async with self.session_manager.run():
+        async with self.session_manager.run(), self.executors():
             yield
 
+    @asynccontextmanager
+    async def executors(self) -> AsyncIterator[None]:
+        """
+        This would only be used directly if you want to override the `lifespan` context manager.
+
+        Starts every executor used by the commands and stops them on exit.
+        """
+        executors = {id(command.executor): command.executor for command in self.commands.values()}
+        async with AsyncExitStack() as stack:
+            for executor in executors.values():
+                await executor.start()
+                stack.push_async_callback(executor.stop)
+
+            yield
+
+    @property
+    def result_cache(self) -> ResultCache | None:
+        """
+        Returns:
+            The cache of tool call results, if enabled.
+        """
+        return self.__result_cache
+
+    @property
+    def coalescer(self) -> CallCoalescer | None:
+        """
+        Returns:
+            The coalescer that shares runs between identical tool calls, if enabled.
+        """
+        return self.__coalescer
+
+    @property
+    def streaming(self) -> bool:
+        """
+        Returns:
+            Whether command output is forwarded to clients while it runs.
+        """
+        return self.__streaming
+
+    def get_tool_timeout(self, tool_name: str) -> float | None:
+        """
+        Returns:
+            The number of seconds after which commands of the tool are stopped, if any.
+        """
+        return self.__tool_timeouts.get(tool_name, self.__timeout)
+
+    def get_tool_output_limit(self, tool_name: str) -> OutputLimit | None:
+        """
+        Returns:
+            The amount of output kept for commands of the tool, if limited.
+        """
+        return self.__tool_output_limits.get(tool_name, self.__output_limit)
+
     def list_command_tools(self) -> list[Tool]:
         """
         This would only be used directly if you want to override the handler for the `ListToolsRequest`.
@@ -181,15 +567,24 @@ class CommandMCPServer:
         """
         return [command.tool for command in self.commands.values()]
 
-    async def list_tools_handler(self, _: ListToolsRequest) -> ServerResult:
+    async def list_tools_handler(self, req: ListToolsRequest) -> ServerResult:
         """
         The default handler for the `ListToolsRequest`.
 
         Returns:
             The available MCP tools.
+
+        Raises:
+            McpError: If the cursor is invalid.
         """
-        log_http_user_agent("tools/list", get_http_user_agent(self.server.request_context.request))
-        return ServerResult(ListToolsResult(tools=self.list_command_tools()))
+        context = self.server.request_context
+        log_http_user_agent("tools/list", get_http_user_agent(context.request))
+        self.__sessions.add(context.session)
+        cursor = req.params.cursor if req.params is not None else None
+        try:
+            return self.catalog.get_page(cursor)
+        except ValueError as e:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e))) from None
 
     async def call_tool_handler(self, req: CallToolRequest) -> ServerResult:
         """
@@ -198,42 +593,176 @@ class CommandMCPServer:
         Returns:
             The command output.
         """
-        command = self.commands[req.params.name].metadata.construct(req.params.arguments)
-        env_vars = dict(os.environ)
-        env_vars[TOOL_NAME_ENV_VAR] = req.params.name
-        user_agent = get_http_user_agent(self.server.request_context.request)
-        log_http_user_agent("tools/call", user_agent)
-        env_vars.pop(USER_AGENT_ENV_VAR, None)
-        if user_agent is not None:
-            env_vars[USER_AGENT_ENV_VAR] = user_agent
+        with self.tracer.start_span("tools/call", {"tool": req.params.name}) as span:
+            result = await self.__call_tool(req, span)
+            with span.start_span("serialize"):
+                return SerializedResult.from_result(result)
 
+    async def __call_tool(self, req: CallToolRequest, span: Span) -> CallToolResult:
+        target = self.commands[req.params.name]
         try:
-            process = await asyncio.to_thread(
-                subprocess.run,
-                command,
-                encoding="utf-8",
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                env=env_vars,
-                check=False,
-            )
+            with span.start_span("validate"):
+                target.validator(req.params.arguments)
+            output = target.metadata.render(req.params.arguments)
+        except ValueError as e:
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+
+        if output is not None:
+            return CallToolResult(content=[TextContent(type="text", text=output)])
+
+        start = time.perf_counter()
+        try:
+            with span.start_span("construct"):
+                command = target.metadata.construct(req.params.arguments)
+        # Validation only checks the types of values, which emitters may still reject
+        except (TypeError, ValueError) as e:
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+
+        self.metrics.get_tool_metrics(req.params.name).observe_construct(time.perf_counter() - start)
+        log_http_user_agent("tools/call", get_http_user_agent(self.server.request_context.request))
+        timeout = self.get_tool_timeout(req.params.name)
+
+        try:
+            with span.start_span("execute") as execute_span, use_span(execute_span):
+                cache = self.result_cache
+                if cache is None or not cache.enabled(req.params.name):
+                    result = await self.execute_tool(req.params.name, target, command)
+                else:
+                    result = await self.execute_cached_tool(
+                        cache, req.params.name, target, command, req.params.arguments
+                    )
+        except ServerBusyError as e:
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
         # This can happen if the command is not found
         except OSError as e:
-            return ServerResult(CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True))
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+
+        if result.timed_out:
+            msg = f"{result.output}\nThis command timed out after {timeout} seconds: {command}"
+            return CallToolResult(content=[TextContent(type="text", text=msg)], isError=True)
+
+        if result.exit_code:
+            msg = f"{result.output}\nThis command exited with non-zero exit code `{result.exit_code}`: {command}"
+            return CallToolResult(content=[TextContent(type="text", text=msg)], isError=True)
+
+        return CallToolResult(content=[TextContent(type="text", text=result.output)])
+
+    async def execute_tool(self, tool_name: str, target: Command, command: list[str]) -> ExecutionResult:
+        """
+        This would only be used directly if you want to override the handler for the `CallToolRequest`.
+
+        Returns:
+            The result of running the command once it is admitted, which may be shared with identical calls that
+                are in flight if the tool is coalesced.
+
+        Raises:
+            ServerBusyError: If the call is not admitted.
+        """
+        if self.coalescer is not None and self.coalescer.enabled(tool_name):
+            return await self.coalescer.run(
+                (tool_name, *command),
+                lambda: self.__execute_tool(tool_name, target, command),
+            )
+
+        return await self.__execute_tool(tool_name, target, command)
+
+    async def __execute_tool(self, tool_name: str, target: Command, command: list[str]) -> ExecutionResult:
+        context = self.server.request_context
+        env_vars: dict[str, str | None] = {
+            TOOL_NAME_ENV_VAR: tool_name,
+            USER_AGENT_ENV_VAR: get_http_user_agent(context.request),
+        }
+        timeout = self.get_tool_timeout(tool_name)
+        on_output: OutputCallback | None = None
+        if self.streaming and context.meta is not None and context.meta.progressToken is not None:
+            on_output = ProgressStream(context.session, context.meta.progressToken, context.request_id).send
+
+        tool_metrics = self.metrics.get_tool_metrics(tool_name)
+        queued = time.perf_counter()
+        async with self.admission.admit(tool_name):
+            admitted = time.perf_counter()
+            tool_metrics.start(admitted - queued)
+            env_vars[DEADLINE_ENV_VAR] = None if timeout is None else str(time.time() + timeout)
+            try:
+                result = await target.executor.execute(
+                    command,
+                    env=env_vars,
+                    timeout=timeout,
+                    on_output=on_output,
+                    output_limit=self.get_tool_output_limit(tool_name),
+                    profile=target.profile,
+                )
+            except BaseException:
+                tool_metrics.abort()
+                raise
+
+            tool_metrics.finish(result, admitted, time.perf_counter())
+            get_current_span().add_event("exit", {"exit_code": result.exit_code, "timed_out": result.timed_out})
+            return result
+
+    async def execute_cached_tool(
+        self,
+        cache: ResultCache,
+        tool_name: str,
+        target: Command,
+        command: list[str],
+        arguments: dict[str, Any] | None,
+    ) -> ExecutionResult:
+        """
+        This would only be used directly if you want to override the handler for the `CallToolRequest`.
 
-        if process.returncode:
-            msg = f"{process.stdout}\nThis command exited with non-zero exit code `{process.returncode}`: {command}"
-            return ServerResult(CallToolResult(content=[TextContent(type="text", text=msg)], isError=True))
+        Returns:
+            The cached result of the tool call, running the command only if there is none.
+        """
+        key = get_cache_key(tool_name, arguments)
+        if (result := cache.get(key)) is not None:
+            return result
+
+        paths: list[str] = []
+        modification_times = None
+        if cache.watch_paths:
+            cwd = target.profile.cwd or get_server_cwd()
+            paths = [os.path.join(cwd, path) for path in target.metadata.get_path_arguments(arguments)]
+            modification_times = get_modification_times(paths)
 
-        return ServerResult(CallToolResult(content=[TextContent(type="text", text=process.stdout)]))
+        result = await self.execute_tool(tool_name, target, command)
+        cache.set(key, result, paths=paths, modification_times=modification_times)
+        return result
 
     def run(self, **kwargs: Any) -> None:
         """
         Other parameters:
             **kwargs: Additional settings to pass to the [`uvicorn.run`](https://www.uvicorn.org/#uvicornrun) function.
         """
+        uvicorn.run(self.create_app(), **kwargs)
+
+    def create_app(self) -> Starlette:
+        """
+        This would only be used directly to run the server with multiple Uvicorn
+        [workers](https://www.uvicorn.org/deployment/), which requires an application factory that creates the server
+        in every worker process.
+
+        Returns:
+            The Starlette [application][starlette.applications.Starlette] that serves the `/mcp` and `/metrics`
+                routes.
+        """
         app_settings = self.__app_settings.copy()
         app_settings["routes"] = self.routes
         app_settings.setdefault("lifespan", self.lifespan)
-        app = Starlette(**app_settings)
-        uvicorn.run(app, **kwargs)
+        return Starlette(**app_settings)
+
+    async def run_stdio_async(self) -> None:
+        """
+        Serves a single client over standard input and output, such as an agent that starts the server as a child
+        process, without the HTTP stack.
+        """
+        from mcp.server.stdio import stdio_server
+
+        async with self.executors(), stdio_server() as (read_stream, write_stream):
+            await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+
+    def run_stdio(self) -> None:
+        """
+        The synchronous version of [`run_stdio_async`][pycli_mcp.server.CommandMCPServer.run_stdio_async].
+        """
+        anyio.run(self.run_stdio_async)
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from contextvars import Token
+    from types import TracebackType
+
+
+class Span:
+    """
+    A phase of handling a request. The default implementation does nothing, and tracers return subclasses that
+    forward spans to a tracing backend. Spans end when they are used as context managers and the block exits.
+    """
+
+    __slots__ = ()
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:  # noqa: ARG002
+        """
+        Returns:
+            A new span that is a child of this one.
+        """
+        return self
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        """
+        Records a point in time within the span, such as when a command produced its first byte of output.
+        """
+
+    def end(self, error: BaseException | None = None) -> None:
+        """
+        Parameters:
+            error: The exception that ended the span, if any.
+        """
+
+    def __enter__(self) -> Span:  # noqa: PYI034
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.end(exc_value)
+
+
+NOOP_SPAN = Span()
+CURRENT_SPAN: ContextVar[Span] = ContextVar("pycli_mcp_current_span", default=NOOP_SPAN)
+
+
+class Tracer:
+    """
+    Receives spans around every phase of tool calls and the collection of commands, so that a tracing backend
+    can be used without overriding any handler. The default implementation does nothing. Example usage:
+
+    ```python
+    from pycli_mcp import CommandMCPServer
+    from pycli_mcp.tracing import Span, Tracer
+
+    from mypkg.cli import cmd
+
+
+    class PrintSpan(Span):
+        def __init__(self, name):
+            self.name = name
+
+        def start_span(self, name, attributes=None):
+            return PrintSpan(f"{self.name}.{name}")
+
+        def add_event(self, name, attributes=None):
+            print(f"{self.name}: {name} {attributes or {}}")
+
+        def end(self, error=None):
+            print(f"{self.name}: end")
+
+
+    class PrintTracer(Tracer):
+        def start_span(self, name, attributes=None):
+            return PrintSpan(name)
+
+
+    server = CommandMCPServer(commands=[cmd], tracer=PrintTracer())
+    server.run()
+    ```
+
+    The server starts the following root spans:
+
+    - `tools/call` with a `tool` attribute, whose children are `validate`, `construct`, `execute` and
+      `serialize`. Within `execute`, executors that run commands in new processes start a `spawn` span and
+      record a `first_byte` event, and the server records an `exit` event with `exit_code` and `timed_out`
+      attributes.
+    - `collect` with a `query` attribute for the collection of the commands of every query, which sets the
+      `command` and `tools` attributes when it ends.
+    """
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:  # noqa: ARG002
+        """
+        Returns:
+            A new root span.
+        """
+        return NOOP_SPAN
+
+
+def get_current_span() -> Span:
+    """
+    Executors use this to start child spans of the `execute` span of the tool call that they run.
+
+    Returns:
+        The span of the current phase, or a span that does nothing if there is none.
+    """
+    return CURRENT_SPAN.get()
+
+
+class SpanScope:
+    # This is cheaper than a generator-based context manager, which matters because every tool call uses one
+    __slots__ = ("__span", "__token")
+
+    def __init__(self, span: Span) -> None:
+        self.__span = span
+        self.__token: Token[Span] | None = None
+
+    def __enter__(self) -> Span:
+        self.__token = CURRENT_SPAN.set(self.__span)
+        return self.__span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self.__token is not None:
+            CURRENT_SPAN.reset(self.__token)
+            self.__token = None
+
+
+def use_span(span: Span) -> SpanScope:
+    """
+    Returns:
+        A context manager that makes the span current within its block, without ending it.
+    """
+    return SpanScope(span)
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import argparse
 
+import pytest
+
+from pycli_mcp.metadata.query import walk_commands as walk_queried_commands
 from pycli_mcp.metadata.types.argparse import walk_commands
 
 
@@ -217,6 +220,15 @@ def test_exclude_filter_override() -> None:
     assert len(commands) == 0  # All excluded
 
 
+def test_filter_nested_subtrees() -> None:
+    parser = create_filter_test_parser()
+    commands = list(walk_commands(parser, aggregate="none", name="my-cli", include=r"^subg-1 subc-2$"))
+    assert [cmd.path for cmd in commands] == ["my-cli subg-1 subc-2"]
+
+    commands = list(walk_commands(parser, aggregate="none", name="my-cli", exclude=r"^subg-1$"))
+    assert [cmd.path for cmd in commands] == ["my-cli subc-1", "my-cli subg-1 subc-2"]
+
+
 def test_aggregate_group() -> None:
     parser = argparse.ArgumentParser(prog="cli")
     subparsers = parser.add_subparsers(dest="command")
@@ -441,3 +453,24 @@ help
         "title": "cli",
         "type": "object",
     }
+
+
+def test_aggregate_summary() -> None:
+    parser = argparse.ArgumentParser(prog="cli")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("run", description="Run the thing. With details.")
+    subparsers.add_parser("stop")
+
+    root, help_metadata = walk_commands(parser, aggregate="summary", name="cli")
+    assert root.schema["description"].endswith(
+        "Use the `cli.help` tool to view the full usage of a command.\n\n## cli run\n\nRun the thing.\n\n## cli stop\n"
+    )
+    assert help_metadata.schema["properties"]["command"]["enum"] == ["cli run", "cli stop"]
+    assert help_metadata.render({"command": "cli run"}) == "Usage: cli run [-h]\n\nRun the thing. With details."
+
+
+def test_lazy_not_supported() -> None:
+    parser = create_filter_test_parser()
+
+    with pytest.raises(ValueError, match="Lazy loading of subcommands is only supported for Click commands"):
+        list(walk_queried_commands(parser, aggregate="root", lazy=True))
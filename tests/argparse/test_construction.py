@@ -115,6 +115,17 @@ def test_multiple_values_option() -> None:
     ]
 
 
+def test_null_values() -> None:
+    parser = argparse.ArgumentParser(prog="cli")
+    parser.add_argument("--name")
+    parser.add_argument("--tags", nargs="+")
+
+    commands = list(walk_commands(parser, aggregate="none", name="cli"))
+    metadata = commands[0]
+
+    assert metadata.construct({"name": None, "tags": None}) == ["cli"]
+
+
 def test_subcommand() -> None:
     parser = argparse.ArgumentParser(prog="cli")
     subparsers = parser.add_subparsers(dest="command")
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import argparse
 
+import pytest
+
 from pycli_mcp.metadata.types.argparse import walk_commands
+from pycli_mcp.metadata.validation import ArgumentValidator
 
 
 def test_basic() -> None:
@@ -274,6 +277,24 @@ def test_optional_positional() -> None:
     }
     assert metadata.options["files"].type == "positional"
     assert metadata.options["files"].multiple
+    assert not metadata.options["files"].required
+    assert "required" not in metadata.schema
+
+
+def test_omitted_positionals_are_valid() -> None:
+    parser = argparse.ArgumentParser(prog="cli")
+    parser.add_argument("name")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("mode", nargs="?")
+
+    (metadata,) = walk_commands(parser, aggregate="none", name="cli")
+    assert metadata.schema["required"] == ["name"]
+
+    # Argparse itself accepts the command without the other positionals
+    parser.parse_args(["foo"])
+    ArgumentValidator(metadata.schema)({"name": "foo"})
+    with pytest.raises(ValueError, match="Missing required argument: name"):
+        ArgumentValidator(metadata.schema)({"files": ["bar"]})
 
 
 def test_required_option() -> None:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import click
+import pytest
 
 from pycli_mcp.metadata.types.click import walk_commands
 
@@ -297,6 +298,50 @@ def test_exclude_filter_override() -> None:
     assert not list(walk_commands(cli, aggregate="none", include=r"^subc-1$", exclude=r"^subc-1"))
 
 
+def test_filter_skips_subtrees() -> None:
+    loaded: list[str] = []
+
+    class TrackingGroup(click.Group):
+        def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+            loaded.append(cmd_name)
+            return super().get_command(ctx, cmd_name)
+
+    @click.group(cls=TrackingGroup)
+    def cli() -> None:
+        pass
+
+    @cli.command()
+    def subc_1() -> None:
+        pass
+
+    @cli.group(cls=TrackingGroup)
+    def subg_1() -> None:
+        pass
+
+    @subg_1.command()
+    def subc_2() -> None:
+        pass
+
+    @subg_1.command()
+    def subc_3() -> None:
+        pass
+
+    commands = list(walk_commands(cli, aggregate="none", include=r"^subg-1 subc-2$"))
+    assert [metadata.path for metadata in commands] == ["cli subg-1 subc-2"]
+    assert loaded == ["subg-1", "subc-2"]
+
+    loaded.clear()
+    commands = list(walk_commands(cli, aggregate="none", exclude=r"^subg-1"))
+    assert [metadata.path for metadata in commands] == ["cli subc-1"]
+    assert loaded == ["subc-1"]
+
+    # Patterns that look past the end of a match cannot exclude whole subtrees
+    loaded.clear()
+    commands = list(walk_commands(cli, aggregate="none", exclude=r"^subg-1$"))
+    assert [metadata.path for metadata in commands] == ["cli subc-1", "cli subg-1 subc-2", "cli subg-1 subc-3"]
+    assert loaded == ["subc-1", "subg-1", "subc-2", "subc-3"]
+
+
 def test_aggregate_group() -> None:
     @click.group()
     def cli() -> None:
@@ -543,3 +588,127 @@ Options:
         "title": "cli",
         "type": "object",
     }
+
+
+def test_lazy_subcommands() -> None:
+    loaded: list[str] = []
+
+    class LazyGroup(click.Group):
+        def list_commands(self, ctx: click.Context) -> list[str]:
+            return sorted([*super().list_commands(ctx), "lazy"])
+
+        def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+            if cmd_name == "lazy":
+                loaded.append(cmd_name)
+                return click.Command("lazy", help="Lazy help")
+
+            return super().get_command(ctx, cmd_name)
+
+    @click.group(cls=LazyGroup)
+    def cli() -> None:
+        pass
+
+    @cli.command()
+    @click.option("--name", help="The name")
+    def eager(*, name: str) -> None:
+        pass
+
+    (root,) = walk_commands(cli, aggregate="root", lazy=True)
+    (group,) = walk_commands(cli, aggregate="group", lazy=True)
+    assert not loaded
+
+    assert "--name TEXT  The name" in root.schema["description"]
+    assert (
+        "## cli lazy\n\nUsage: cli lazy [ARGS]...\n\nThis subcommand is loaded on demand" in root.schema["description"]
+    )
+    assert group.schema["properties"]["subcommand"]["enum"] == ["eager", "lazy"]
+    assert group.construct({"subcommand": "lazy", "args": ["--help"]}) == ["cli", "--", "lazy", "--help"]
+
+    (root,) = walk_commands(cli, aggregate="root")
+    assert "Lazy help" in root.schema["description"]
+    assert loaded == ["lazy"]
+
+
+def test_lazy_command_collection() -> None:
+    @click.group()
+    def first() -> None:
+        pass
+
+    @first.command(help="Foo help")
+    def foo() -> None:
+        pass
+
+    @first.group()
+    def sub() -> None:
+        pass
+
+    @sub.command(help="Bar help")
+    def bar() -> None:
+        pass
+
+    @click.group()
+    def second() -> None:
+        pass
+
+    @second.command(help="Baz help")
+    def baz() -> None:
+        pass
+
+    cli = click.CommandCollection(sources=[first, second])
+    (root,) = walk_commands(cli, aggregate="root", name="cli", lazy=True)
+    description = root.schema["description"]
+    assert "loaded on demand" not in description
+    assert "## cli foo\n\nUsage: cli foo [OPTIONS]\n\nFoo help" in description
+    assert "## cli sub bar\n\nUsage: cli sub bar [OPTIONS]\n\nBar help" in description
+    assert "## cli baz\n\nUsage: cli baz [OPTIONS]\n\nBaz help" in description
+
+
+def test_lazy_requires_aggregation() -> None:
+    @click.group()
+    def cli() -> None:
+        pass
+
+    with pytest.raises(ValueError, match="requires root or group aggregation"):
+        list(walk_commands(cli, aggregate="none", lazy=True))
+
+
+def test_aggregate_summary() -> None:
+    @click.group(help="Root help")
+    @click.option("--verbose", is_flag=True, help="Show more output")
+    def cli(*, verbose: bool) -> None:
+        pass
+
+    @cli.command(help="Show the status. More details.\n\nSecond paragraph")
+    @click.option("--name", help="The name")
+    def status(*, name: str) -> None:
+        pass
+
+    @cli.group()
+    def sub() -> None:
+        pass
+
+    @sub.command(short_help="Go deep")
+    def deep() -> None:
+        pass
+
+    root, help_metadata = walk_commands(cli, aggregate="summary")
+    assert root.path == "cli"
+    assert root.schema["description"] == (
+        "# cli\n\nUsage: cli [OPTIONS] SUBCOMMAND [ARGS]...\n\nRoot help\n\n"
+        "Options:\n--verbose  Show more output\n\n"
+        "Use the `cli.help` tool to view the full usage of a command.\n\n"
+        "## cli status\n\nShow the status.\n\n"
+        "## cli sub deep\n\nGo deep\n"
+    )
+
+    assert help_metadata.path == "cli help"
+    assert help_metadata.schema["properties"]["command"]["enum"] == ["cli status", "cli sub deep"]
+    usage = help_metadata.render({"command": "cli status"})
+    assert usage == (
+        "Usage: cli status [OPTIONS]\n\nShow the status. More details.\n\nSecond paragraph\n\n"
+        "Options:\n--name TEXT  The name"
+    )
+    assert help_metadata.render({"command": "cli status"}) is usage
+
+    with pytest.raises(ValueError, match="Unknown command: cli other"):
+        help_metadata.render({"command": "cli other"})
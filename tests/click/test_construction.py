@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+from typing import Any
+
 import click
 
 from pycli_mcp.metadata.query import walk_commands
@@ -100,6 +102,29 @@ def test_options() -> None:
     ]
 
 
+def test_multiple_choice() -> None:
+    @click.command()
+    @click.option("--color", type=click.Choice(["red", "blue"]), multiple=True)
+    @click.argument("dates", type=click.DateTime(), nargs=-1)
+    def cli(*, color: tuple[str, ...], dates: tuple[Any, ...]) -> None:
+        pass
+
+    commands = list(walk_commands(cli, aggregate="none"))
+    assert len(commands) == 1, commands
+
+    metadata = commands[0]
+    assert metadata.construct({"color": ["red", "blue"], "dates": ["2020-01-01", "2020-01-02"]}) == [
+        "cli",
+        "--color",
+        "red",
+        "--color",
+        "blue",
+        "--",
+        "2020-01-01",
+        "2020-01-02",
+    ]
+
+
 def test_arguments() -> None:
     @click.command()
     @click.argument("arg")
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+from typing import Any
+
 import click
 
 from pycli_mcp.metadata.types.click import walk_commands
@@ -267,6 +269,36 @@ def test_multiple_allowed() -> None:
     assert sorted(metadata.options) == ["bar", "baz", "foo"]
 
 
+def test_multiple_choice() -> None:
+    @click.command()
+    @click.option("--foo", type=click.Choice(["a", "b"]), multiple=True, help="foo help")
+    @click.option("--bar", type=click.DateTime(), multiple=True, help="bar help")
+    @click.argument("baz", type=click.DateTime(), nargs=-1)
+    def cli(*, foo: tuple[str, ...] | None, bar: tuple[Any, ...] | None, baz: tuple[Any, ...]) -> None:
+        pass
+
+    commands = list(walk_commands(cli, aggregate="none"))
+    assert len(commands) == 1, commands
+
+    metadata = commands[0]
+    assert metadata.schema["properties"]["foo"] == {
+        "default": None,
+        "description": "foo help",
+        "items": {"type": "string", "enum": ["a", "b"]},
+        "title": "foo",
+        "type": "array",
+    }
+    assert metadata.schema["properties"]["bar"] == {
+        "default": None,
+        "description": "bar help",
+        "items": {"type": "string"},
+        "title": "bar",
+        "type": "array",
+    }
+    assert metadata.schema["properties"]["baz"]["type"] == "array"
+    assert metadata.schema["properties"]["baz"]["items"] == {"type": "string"}
+
+
 def test_container() -> None:
     @click.command()
     @click.option("--foo", type=(str, str), help="foo help")
@@ -0,0 +1,2 @@
+# SPDX-FileCopyrightText: 2025-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
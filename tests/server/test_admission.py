@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+
+import anyio
+import click
+import pytest
+
+from pycli_mcp.execution.admission import AdmissionController, ServerBusyError
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import BlockingExecutor, connect
+
+
+async def hold(admission: AdmissionController, tool_name: str, release: asyncio.Event) -> float:
+    async with admission.admit(tool_name) as waited:
+        await release.wait()
+        return waited
+
+
+def test_no_limits() -> None:
+    async def main() -> None:
+        admission = AdmissionController()
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(hold(admission, "foo", release)) for _ in range(100)]
+        await asyncio.sleep(0)
+        assert admission.running == 100
+        assert admission.waiting == 0
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admission.running == 0
+
+    asyncio.run(main())
+
+
+def test_queue_full() -> None:
+    async def main() -> None:
+        admission = AdmissionController(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(admission, "foo", release))
+        queued = asyncio.create_task(hold(admission, "bar", release))
+        await asyncio.sleep(0)
+        assert admission.running == 1
+        assert admission.waiting == 1
+
+        with pytest.raises(ServerBusyError, match="too many tool calls are waiting"):
+            await hold(admission, "baz", release)
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert admission.running == 0
+        assert admission.waiting == 0
+
+    asyncio.run(main())
+
+
+def test_queue_timeout() -> None:
+    async def main() -> None:
+        admission = AdmissionController(max_concurrency=1, queue_timeout=0.1)
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(admission, "foo", release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServerBusyError, match=r"waited more than 0\.1 seconds"):
+            await hold(admission, "bar", release)
+
+        assert admission.waiting == 0
+        release.set()
+        await running
+
+    asyncio.run(main())
+
+
+def test_tool_limits() -> None:
+    async def main() -> None:
+        admission = AdmissionController(max_concurrency=3, tool_concurrency={"foo": 1})
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(hold(admission, "foo", release)) for _ in range(2)]
+        tasks.extend(asyncio.create_task(hold(admission, "bar", release)) for _ in range(2))
+        await asyncio.sleep(0)
+
+        # The waiting call for `foo` does not take one of the global slots
+        assert admission.running == 3
+        assert admission.waiting == 1
+
+        release.set()
+        waited = await asyncio.gather(*tasks)
+        assert waited[1] > 0
+
+    asyncio.run(main())
+
+
+def test_server_busy() -> None:
+    @click.command()
+    def cli() -> None:
+        pass
+
+    executor = BlockingExecutor()
+    admission = AdmissionController(max_concurrency=1, max_queue=0)
+    server = CommandMCPServer([CommandQuery(cli, executor=executor)], admission=admission)
+
+    async def main() -> None:
+        async with connect(server) as client, anyio.create_task_group() as tg:
+            tg.start_soon(client.call_tool, "cli", {})
+            while not executor.running:
+                await anyio.sleep(0.01)
+
+            result = await client.call_tool("cli", {})
+            assert result.isError
+            assert "Server busy" in result.content[0].text  # type: ignore[union-attr]
+
+            executor.released.set()
+
+    anyio.run(main)
+    assert len(executor.commands) == 1
@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+import anyio
+import click
+import httpx
+
+from pycli_mcp.cli import APP_SETTINGS_ENV_VAR, create_app, pycli_mcp
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    click.echo(f"Hello, {name}!")
+
+
+@cli.command()
+def settings() -> None:
+    click.echo(os.environ.get(APP_SETTINGS_ENV_VAR, "unset"))
+
+
+def get_settings(*args: str) -> dict[str, Any]:
+    ctx = pycli_mcp.make_context("pycli-mcp", list(args))
+    return {
+        key: value
+        for key, value in ctx.params.items()
+        if key not in {"transport", "workers", "host", "port", "log_level", "log_config", "options"}
+    }
+
+
+def call_app_tool(name: str, arguments: dict[str, Any]) -> httpx.Response:
+    async def main() -> httpx.Response:
+        app = create_app()
+        transport = httpx.ASGITransport(app=app)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=transport, base_url="http://testserver") as client,
+        ):
+            return await client.post(
+                "/mcp/",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "tools/call",
+                    "params": {"name": name, "arguments": arguments},
+                },
+                headers={"Accept": "application/json, text/event-stream"},
+            )
+
+    return anyio.run(main)
+
+
+def set_app_settings(monkeypatch) -> None:
+    settings = get_settings(f"{__name__}:cli", "--aggregate", "none", "--executor", "inprocess")
+    monkeypatch.setenv(APP_SETTINGS_ENV_VAR, json.dumps({"settings": settings, "log_level": None, "log_config": None}))
+
+
+def test_create_app(monkeypatch) -> None:
+    set_app_settings(monkeypatch)
+
+    response = call_app_tool("cli.greet", {"name": "World"})
+    assert response.status_code == 200
+    assert response.json()["result"] == {
+        "content": [{"type": "text", "text": "Hello, World!\n"}],
+        "isError": False,
+    }
+
+
+def test_settings_not_inherited(monkeypatch) -> None:
+    set_app_settings(monkeypatch)
+
+    response = call_app_tool("cli.settings", {})
+    assert APP_SETTINGS_ENV_VAR not in os.environ
+    assert response.status_code == 200
+    assert response.json()["result"] == {
+        "content": [{"type": "text", "text": "unset\n"}],
+        "isError": False,
+    }
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import time
+from typing import TYPE_CHECKING
+
+import anyio
+import click
+
+from pycli_mcp.execution.cache import ResultCache, get_cache_key
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import call_tool, connect
+
+if TYPE_CHECKING:
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+
+
+class CountingExecutor(CommandExecutor):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],  # noqa: ARG002
+        timeout: float | None = None,  # noqa: ARG002
+        on_output: OutputCallback | None = None,  # noqa: ARG002
+        output_limit: OutputLimit | None = None,  # noqa: ARG002
+        profile: ResolvedProfile | None = None,  # noqa: ARG002
+    ) -> ExecutionResult:
+        self.calls += 1
+        return ExecutionResult(output=f"{self.calls} {' '.join(command)}", exit_code=0)
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.argument("name")
+def status(*, name: str) -> None:
+    pass
+
+
+@cli.command()
+@click.argument("path", type=click.Path())
+def show(*, path: str) -> None:
+    pass
+
+
+@cli.command()
+def deploy() -> None:
+    pass
+
+
+def get_server(cache: ResultCache) -> tuple[CommandMCPServer, CountingExecutor]:
+    executor = CountingExecutor()
+    query = CommandQuery(cli, aggregate="none", executor=executor)
+    return CommandMCPServer([query], result_cache=cache), executor
+
+
+def test_key_ignores_argument_order() -> None:
+    assert get_cache_key("foo", {"a": 1, "b": [2]}) == get_cache_key("foo", {"b": [2], "a": 1})
+    assert get_cache_key("foo", None) == get_cache_key("foo", {})
+    assert get_cache_key("foo", {"a": 1}) != get_cache_key("bar", {"a": 1})
+
+
+def test_enabled() -> None:
+    cache = ResultCache(include=r"\.(status|show)$", exclude=r"show")
+
+    assert cache.enabled("cli.status")
+    assert not cache.enabled("cli.show")
+    assert not cache.enabled("cli.deploy")
+
+
+def test_expiration() -> None:
+    cache = ResultCache(ttl=0.1)
+    cache.set("key", ExecutionResult(output="foo", exit_code=0))
+    assert cache.get("key") is not None
+
+    time.sleep(0.2)
+    assert cache.get("key") is None
+    assert not len(cache)
+    assert cache.size == 0
+
+
+def test_least_recently_used_eviction() -> None:
+    cache = ResultCache(max_entries=2)
+    cache.set("a", ExecutionResult(output="a", exit_code=0))
+    cache.set("b", ExecutionResult(output="b", exit_code=0))
+    cache.get("a")
+    cache.set("c", ExecutionResult(output="c", exit_code=0))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_size_eviction() -> None:
+    cache = ResultCache(max_bytes=10)
+    cache.set("a", ExecutionResult(output="x" * 6, exit_code=0))
+    cache.set("b", ExecutionResult(output="x" * 6, exit_code=0))
+    cache.set("c", ExecutionResult(output="x" * 11, exit_code=0))
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is None
+    assert cache.size == 6
+
+
+def test_unsuccessful_results_not_cached() -> None:
+    cache = ResultCache()
+    cache.set("a", ExecutionResult(output="", exit_code=1))
+    cache.set("b", ExecutionResult(output="", exit_code=0, timed_out=True))
+
+    assert not len(cache)
+
+
+def test_path_invalidation(tmp_path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("foo")
+    cache = ResultCache(watch_paths=True)
+    cache.set("key", ExecutionResult(output="foo", exit_code=0), paths=[str(path)])
+    assert cache.get("key") is not None
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get("key") is None
+
+
+def test_path_arguments() -> None:
+    parser = argparse.ArgumentParser(prog="app")
+    parser.add_argument("source", type=pathlib.Path)
+    parser.add_argument("--output", type=argparse.FileType("w"))
+    parser.add_argument("--name")
+    (argparse_metadata,) = CommandQuery(parser, aggregate="none")
+    click_metadata = {metadata.path: metadata for metadata in CommandQuery(cli, aggregate="none")}
+
+    assert argparse_metadata.get_path_arguments({"source": "a", "output": "b", "name": "c"}) == ["a", "b"]
+    assert click_metadata["cli show"].get_path_arguments({"path": "a"}) == ["a"]
+    assert click_metadata["cli status"].get_path_arguments({"name": "a"}) == []
+
+
+def test_server_hits() -> None:
+    server, executor = get_server(ResultCache(include=r"\.status$"))
+
+    async def main() -> list[str]:
+        outputs: list[str] = []
+        async with connect(server) as client:
+            for tool_name, arguments in (
+                ("cli.status", {"name": "foo"}),
+                ("cli.status", {"name": "foo"}),
+                ("cli.status", {"name": "bar"}),
+                ("cli.deploy", {}),
+                ("cli.deploy", {}),
+            ):
+                result = await client.call_tool(tool_name, arguments)
+                outputs.append(result.content[0].text)  # type: ignore[union-attr]
+
+        return outputs
+
+    assert anyio.run(main) == [
+        "1 cli status -- foo",
+        "1 cli status -- foo",
+        "2 cli status -- bar",
+        "3 cli deploy",
+        "4 cli deploy",
+    ]
+    assert executor.calls == 4
+    assert server.result_cache is not None
+    assert server.result_cache.hits == 1
+
+
+def test_server_watch_paths(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "file.txt"
+    path.write_text("foo")
+    server, executor = get_server(ResultCache(watch_paths=True))
+
+    def show() -> str:
+        return call_tool(server, "cli.show", {"path": "file.txt"}).content[0].text  # type: ignore[union-attr]
+
+    assert show() == "1 cli show -- file.txt"
+    assert show() == "1 cli show -- file.txt"
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert show() == "2 cli show -- file.txt"
+    assert executor.calls == 2
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import anyio
+import click
+import pytest
+from click.testing import CliRunner
+from mcp.shared.exceptions import McpError
+from mcp.types import ListToolsResult, ServerNotification, ToolListChangedNotification
+
+from pycli_mcp.cli import pycli_mcp
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer, ToolCatalog
+from tests.server.utils import BlockingExecutor, connect
+
+
+def get_cli() -> click.Group:
+    @click.group()
+    def cli() -> None:
+        pass
+
+    @cli.command()
+    @click.option("--name")
+    def status(*, name: str) -> None:
+        pass
+
+    return cli
+
+
+def get_server(cli: click.Group, **kwargs: Any) -> CommandMCPServer:
+    return CommandMCPServer([CommandQuery(cli, aggregate="none", executor=BlockingExecutor())], **kwargs)
+
+
+def get_wide_cli(width: int) -> click.Group:
+    cli = get_cli()
+    for i in range(width):
+        cli.add_command(click.Command(f"cmd{i:02}"))
+
+    return cli
+
+
+def test_serialized_once() -> None:
+    server = get_server(get_cli())
+
+    async def list_twice() -> tuple[ListToolsResult, ListToolsResult]:
+        async with connect(server) as client:
+            return await client.list_tools(), await client.list_tools()
+
+    first, second = anyio.run(list_twice)
+    assert first == second
+    assert [tool.name for tool in first.tools] == ["cli.status"]
+    assert server.catalog.result.model_dump(by_alias=True, mode="json", exclude_none=True) is (
+        server.catalog.result.serialized
+    )
+    assert server.catalog.size == len(json.dumps(server.catalog.result.serialized, separators=(",", ":")))
+
+
+def test_etag() -> None:
+    assert get_server(get_cli()).catalog.etag == get_server(get_cli()).catalog.etag
+
+    cli = get_cli()
+    cli.add_command(click.Command("other"))
+    assert get_server(cli).catalog.etag != get_server(get_cli()).catalog.etag
+
+
+def test_reload_notifies_only_on_change() -> None:
+    cli = get_cli()
+    server = get_server(cli)
+
+    async def main() -> tuple[list[bool], int, list[str]]:
+        notifications: list[Any] = []
+
+        async def message_handler(message: Any) -> None:
+            if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+                notifications.append(message)
+
+        changes: list[bool] = []
+        async with connect(server, message_handler=message_handler) as client:
+            await client.list_tools()
+            changes.append(await server.reload_commands())
+
+            cli.add_command(click.Command("other"))
+            changes.append(await server.reload_commands())
+
+            with anyio.fail_after(5):
+                while not notifications:
+                    await anyio.sleep(0.01)
+
+            result = await client.list_tools()
+
+        return changes, len(notifications), [tool.name for tool in result.tools]
+
+    changes, notifications, tool_names = anyio.run(main)
+    assert changes == [False, True]
+    assert notifications == 1
+    assert tool_names == ["cli.other", "cli.status"]
+
+
+def test_pagination() -> None:
+    server = get_server(get_wide_cli(6), page_size=3)
+
+    async def main() -> list[list[str]]:
+        pages: list[list[str]] = []
+        async with connect(server) as client:
+            cursor = None
+            while True:
+                result = await client.list_tools(cursor=cursor)
+                pages.append([tool.name for tool in result.tools])
+                if (cursor := result.nextCursor) is None:
+                    break
+
+        return pages
+
+    assert anyio.run(main) == [
+        ["cli.cmd00", "cli.cmd01", "cli.cmd02"],
+        ["cli.cmd03", "cli.cmd04", "cli.cmd05"],
+        ["cli.status"],
+    ]
+    assert server.catalog.etag == get_server(get_wide_cli(6)).catalog.etag
+
+
+def test_pagination_exact_fit() -> None:
+    server = get_server(get_wide_cli(3), page_size=4)
+
+    assert len(server.catalog.pages) == 1
+    assert "nextCursor" not in server.catalog.result.serialized
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_invalid_page_size(page_size: int) -> None:
+    with pytest.raises(ValueError, match=f"The page size must be at least 1: {page_size}"):
+        get_server(get_cli(), page_size=page_size)
+
+    with pytest.raises(ValueError, match=f"The page size must be at least 1: {page_size}"):
+        ToolCatalog([], page_size=page_size)
+
+    result = CliRunner().invoke(pycli_mcp, ["--page-size", str(page_size), f"{__name__}:get_cli"])
+    assert result.exit_code == 2
+    assert "Invalid value for '--page-size'" in result.output
+
+
+def test_invalid_cursor() -> None:
+    cli = get_wide_cli(3)
+    server = get_server(cli, page_size=2)
+    cursor = server.catalog.result.serialized["nextCursor"]
+
+    async def main() -> list[str]:
+        messages: list[str] = []
+        async with connect(server) as client:
+            for invalid_cursor in ("foo", cursor.replace(":1", ":9")):
+                with pytest.raises(McpError) as exc_info:
+                    await client.list_tools(cursor=invalid_cursor)
+                messages.append(exc_info.value.error.message)
+
+            # Cursors from before the tools changed are rejected
+            cli.add_command(click.Command("other"))
+            await server.reload_commands()
+            with pytest.raises(McpError):
+                await client.list_tools(cursor=cursor)
+
+        return messages
+
+    assert anyio.run(main) == ["Invalid cursor: foo", f"Invalid cursor: {cursor.replace(':1', ':9')}"]
+
+
+def test_help_tool() -> None:
+    executor = BlockingExecutor()
+    server = CommandMCPServer([CommandQuery(get_cli(), aggregate="summary", executor=executor)])
+
+    async def main() -> tuple[list[str], str, str]:
+        async with connect(server) as client:
+            result = await client.list_tools()
+            usage = await client.call_tool("cli.help", {"command": "cli status"})
+            error = await client.call_tool("cli.help", {"command": "cli other"})
+
+        return (
+            [tool.name for tool in result.tools],
+            usage.content[0].text,  # type: ignore[union-attr]
+            error.content[0].text,  # type: ignore[union-attr]
+        )
+
+    tool_names, usage, error = anyio.run(main)
+    assert tool_names == ["cli", "cli.help"]
+    assert usage == "Usage: cli status [OPTIONS]\n\nOptions:\n--name TEXT"
+    assert error == "Argument `command` must be one of: cli status"
+    assert not executor.commands
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import importlib
+import pathlib
+import sys
+from typing import TYPE_CHECKING, Any
+
+import click
+import pytest
+
+from pycli_mcp.metadata import query
+from pycli_mcp.metadata.cache import CatalogCache
+from pycli_mcp.metadata.query import CommandQuery
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+SOURCE = """\
+import click
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--name", help="The name")
+@click.argument("path", type=click.Path())
+def status(name, path):
+    pass
+"""
+
+
+@pytest.fixture
+def cli_module(tmp_path, monkeypatch) -> Iterator[pathlib.Path]:
+    package = tmp_path / "catalog_cache_pkg"
+    package.mkdir()
+    (package / "__init__.py").touch()
+    (package / "cli.py").write_text(SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package / "cli.py"
+    for name in [name for name in sys.modules if name.startswith("catalog_cache_pkg")]:
+        del sys.modules[name]
+
+
+def load_cli() -> click.Group:
+    return importlib.import_module("catalog_cache_pkg.cli").cli
+
+
+def forbid_walk(monkeypatch) -> None:
+    def walk_commands(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError
+
+    monkeypatch.setattr(query, "walk_commands", walk_commands)
+
+
+def get_state(query: CommandQuery) -> list[tuple[str, dict[str, Any], list[str]]]:
+    return [(metadata.path, metadata.schema, metadata.construct({"name": "foo", "path": "bar"})) for metadata in query]
+
+
+def test_warm_load(cli_module, tmp_path, monkeypatch) -> None:  # noqa: ARG001
+    cache = CatalogCache(tmp_path / "cache")
+    expected = get_state(CommandQuery(load_cli(), aggregate="none", catalog_cache=cache))
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    forbid_walk(monkeypatch)
+    loaded = list(CommandQuery(load_cli(), aggregate="none", catalog_cache=CatalogCache(tmp_path / "cache")))
+    assert [(m.path, m.schema, m.construct({"name": "foo", "path": "bar"})) for m in loaded] == expected
+    assert loaded[0].get_path_arguments({"name": "foo", "path": "bar"}) == ["bar"]
+
+
+def test_source_change(cli_module, tmp_path) -> None:
+    cache = CatalogCache(tmp_path / "cache")
+    key = cache.get_key(load_cli(), {})
+
+    cli_module.write_text(SOURCE.replace("The name", "The new name"))
+    assert cache.get_key(load_cli(), {}) != key
+
+
+def test_settings_change(cli_module, tmp_path) -> None:  # noqa: ARG001
+    cache = CatalogCache(tmp_path / "cache")
+    list(CommandQuery(load_cli(), aggregate="none", catalog_cache=cache))
+    list(CommandQuery(load_cli(), aggregate="root", catalog_cache=cache))
+
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_corrupt_entry(cli_module, tmp_path, monkeypatch) -> None:  # noqa: ARG001
+    cache = CatalogCache(tmp_path / "cache")
+    list(CommandQuery(load_cli(), aggregate="none", catalog_cache=cache))
+    (entry,) = (tmp_path / "cache").iterdir()
+    entry.write_text("{")
+
+    paths = [metadata.path for metadata in CommandQuery(load_cli(), aggregate="none", catalog_cache=cache)]
+    assert paths == ["cli status"]
+    assert entry.read_text().startswith("[")
+
+
+def test_argparse(tmp_path, monkeypatch) -> None:
+    parser = argparse.ArgumentParser(prog="app")
+    parser.add_argument("source", type=pathlib.Path)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--tag", action="append")
+    cache = CatalogCache(tmp_path / "cache", modules=[__name__])
+    arguments = {"source": "a", "verbose": True, "tag": ["x", "y"]}
+    (expected,) = CommandQuery(parser, aggregate="none", catalog_cache=cache)
+
+    forbid_walk(monkeypatch)
+    (loaded,) = CommandQuery(parser, aggregate="none", catalog_cache=cache)
+    assert loaded.schema == expected.schema
+    assert loaded.construct(arguments) == expected.construct(arguments)
+    assert loaded.get_path_arguments(arguments) == ["a"]
+
+
+def test_help_tool(cli_module, tmp_path, monkeypatch) -> None:  # noqa: ARG001
+    cache = CatalogCache(tmp_path / "cache")
+    _, expected = CommandQuery(load_cli(), aggregate="summary", catalog_cache=cache)
+
+    forbid_walk(monkeypatch)
+    _, loaded = CommandQuery(load_cli(), aggregate="summary", catalog_cache=cache)
+    assert loaded.schema == expected.schema
+    assert loaded.render({"command": "cli status"}) == expected.render({"command": "cli status"})
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+
+import anyio
+import click
+import pytest
+
+from pycli_mcp.execution.coalescing import CallCoalescer
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import BlockingExecutor, connect
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.argument("name")
+def status(*, name: str) -> None:
+    pass
+
+
+@cli.command()
+@click.argument("name")
+def deploy(*, name: str) -> None:
+    pass
+
+
+def test_shared_run() -> None:
+    async def main() -> tuple[list[int], bool]:
+        coalescer = CallCoalescer()
+        started = asyncio.Event()
+        runs: list[int] = []
+
+        async def run() -> int:
+            runs.append(len(runs))
+            started.set()
+            await asyncio.sleep(0.1)
+            return len(runs)
+
+        results = await asyncio.gather(*(coalescer.run("key", run) for _ in range(5)))
+        assert coalescer.coalesced == 4
+        assert not coalescer.in_flight
+        return results, started.is_set()
+
+    results, started = anyio.run(main)
+    assert results == [1] * 5
+    assert started
+
+
+def test_cancelled_caller_does_not_stop_others() -> None:
+    async def main() -> tuple[str, bool]:
+        coalescer = CallCoalescer()
+        release = asyncio.Event()
+
+        async def run() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(coalescer.run("key", run))
+        second = asyncio.ensure_future(coalescer.run("key", run))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await second, first.cancelled()
+
+    assert anyio.run(main) == ("done", True)
+
+
+def test_all_callers_cancelled_stops_run() -> None:
+    async def main() -> tuple[bool, int]:
+        coalescer = CallCoalescer()
+        stopped = asyncio.Event()
+
+        async def run() -> None:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        callers = [asyncio.ensure_future(coalescer.run("key", run)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+
+        for caller in callers:
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+
+        await asyncio.wait_for(stopped.wait(), 1)
+        return stopped.is_set(), coalescer.in_flight
+
+    assert anyio.run(main) == (True, 0)
+
+
+def test_server() -> None:
+    executor = BlockingExecutor()
+    query = CommandQuery(cli, aggregate="none", executor=executor)
+    server = CommandMCPServer([query], coalescer=CallCoalescer(include=r"\.status$"))
+
+    async def main() -> list[str]:
+        outputs: list[str] = []
+        async with connect(server) as client, anyio.create_task_group() as tg:
+
+            async def call(tool_name: str, name: str) -> None:
+                result = await client.call_tool(tool_name, {"name": name})
+                outputs.append(result.content[0].text)  # type: ignore[union-attr]
+
+            for _ in range(3):
+                tg.start_soon(call, "cli.status", "foo")
+            tg.start_soon(call, "cli.status", "bar")
+            for _ in range(2):
+                tg.start_soon(call, "cli.deploy", "foo")
+
+            while executor.running < 4:
+                await anyio.sleep(0.01)
+
+            await anyio.sleep(0.1)
+            executor.released.set()
+
+        return outputs
+
+    outputs = anyio.run(main)
+    assert sorted(outputs) == [
+        "cli deploy -- foo",
+        "cli deploy -- foo",
+        "cli status -- bar",
+        "cli status -- foo",
+        "cli status -- foo",
+        "cli status -- foo",
+    ]
+    assert len(executor.commands) == 4
+    assert server.coalescer is not None
+    assert server.coalescer.coalesced == 2
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import anyio
+import pytest
+from mcp.types import JSONRPCMessage, JSONRPCNotification
+
+from pycli_mcp.events.memory import MemoryEventStore
+from pycli_mcp.events.sqlite import SQLiteEventStore
+
+if TYPE_CHECKING:
+    from mcp.server.streamable_http import EventMessage, EventStore
+
+
+def create_message(index: int) -> JSONRPCMessage:
+    return JSONRPCMessage(JSONRPCNotification(jsonrpc="2.0", method="notifications/message", params={"i": index}))
+
+
+def get_index(event: EventMessage) -> int:
+    notification = event.message.root
+    assert isinstance(notification, JSONRPCNotification)
+    assert notification.params is not None
+    return notification.params["i"]
+
+
+async def store(event_store: EventStore, stream_id: str, *indices: int) -> list[str]:
+    return [await event_store.store_event(stream_id, create_message(index)) for index in indices]
+
+
+async def replay(event_store: EventStore, last_event_id: str) -> tuple[str | None, list[EventMessage]]:
+    events: list[EventMessage] = []
+
+    async def send(event: EventMessage) -> None:
+        events.append(event)
+
+    stream_id = await event_store.replay_events_after(last_event_id, send)
+    return stream_id, events
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def create_store(request, tmp_path):
+    stores: list[SQLiteEventStore] = []
+
+    def create(**kwargs):
+        if request.param == "memory":
+            return MemoryEventStore(**kwargs)
+
+        event_store = SQLiteEventStore(tmp_path / "events.db", **kwargs)
+        stores.append(event_store)
+        return event_store
+
+    yield create
+    for event_store in stores:
+        event_store.close()
+
+
+def test_replay(create_store) -> None:
+    event_store = create_store()
+    # The transport ignores event stores that are falsy
+    assert event_store
+
+    async def main() -> None:
+        priming_id = await event_store.store_event("s1", None)
+        first_id, second_id, _ = await store(event_store, "s1", 1, 2, 3)
+        await store(event_store, "s2", 4)
+
+        stream_id, events = await replay(event_store, priming_id)
+        assert stream_id == "s1"
+        assert [get_index(event) for event in events] == [1, 2, 3]
+
+        stream_id, events = await replay(event_store, second_id)
+        assert stream_id == "s1"
+        assert [get_index(event) for event in events] == [3]
+        assert events[0].event_id not in {first_id, second_id}
+
+        assert await replay(event_store, "unknown") == (None, [])
+
+    anyio.run(main)
+
+
+def test_max_events(create_store) -> None:
+    event_store = create_store(max_events=2)
+
+    async def main() -> None:
+        event_ids = await store(event_store, "s1", 1, 2, 3, 4)
+        await store(event_store, "s2", 5)
+        assert event_store.count == 3
+
+        _, events = await replay(event_store, event_ids[2])
+        assert [get_index(event) for event in events] == [4]
+
+    anyio.run(main)
+
+
+def test_evicted_replay(create_store) -> None:
+    event_store = create_store(max_events=10)
+
+    async def main() -> None:
+        event_ids = await store(event_store, "s1", *range(100))
+        assert event_store.count == 10
+
+        # The stream cannot be replayed without a gap
+        assert await replay(event_store, event_ids[50]) == (None, [])
+        assert await replay(event_store, event_ids[88]) == (None, [])
+
+        stream_id, events = await replay(event_store, event_ids[90])
+        assert stream_id == "s1"
+        assert [get_index(event) for event in events] == list(range(91, 100))
+
+    anyio.run(main)
+
+
+def test_max_bytes(create_store) -> None:
+    size = len(create_message(1).model_dump_json(by_alias=True, exclude_none=True))
+    event_store = create_store(max_bytes=size * 2)
+
+    async def main() -> None:
+        await store(event_store, "s1", 1, 2, 3)
+        assert event_store.count == 2
+
+    anyio.run(main)
+
+
+def test_max_events_and_bytes(create_store) -> None:
+    size = len(create_message(1).model_dump_json(by_alias=True, exclude_none=True))
+    event_store = create_store(max_events=3, max_bytes=size * 2)
+
+    async def main() -> None:
+        event_ids = await store(event_store, "s1", 1, 2, 3, 4, 5)
+        assert event_store.count == 2
+
+        _, events = await replay(event_store, event_ids[3])
+        assert [get_index(event) for event in events] == [5]
+
+    anyio.run(main)
+
+
+def test_max_age(create_store, monkeypatch) -> None:
+    event_store = create_store(max_age=10)
+    now = time.time()
+    monotonic_now = time.monotonic()
+
+    async def main() -> None:
+        (event_id,) = await store(event_store, "s1", 1)
+        await store(event_store, "s1", 2)
+
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        monkeypatch.setattr(time, "monotonic", lambda: monotonic_now + 11)
+        (new_id,) = await store(event_store, "s2", 3)
+        await store(event_store, "s2", 4)
+
+        assert await replay(event_store, event_id) == (None, [])
+        _, events = await replay(event_store, new_id)
+        assert [get_index(event) for event in events] == [4]
+
+    anyio.run(main)
+
+
+def test_memory_max_streams() -> None:
+    event_store = MemoryEventStore(max_streams=2)
+
+    async def main() -> None:
+        (event_id,) = await store(event_store, "s1", 1)
+        await store(event_store, "s2", 2)
+        await store(event_store, "s3", 3)
+        assert event_store.count == 2
+        assert await replay(event_store, event_id) == (None, [])
+
+    anyio.run(main)
+
+
+def test_sqlite_persistence(tmp_path) -> None:
+    path = tmp_path / "events.db"
+
+    async def main() -> None:
+        event_store = SQLiteEventStore(path)
+        event_ids = await store(event_store, "s1", 1, 2)
+        event_store.close()
+
+        event_store = SQLiteEventStore(path)
+        try:
+            stream_id, events = await replay(event_store, event_ids[0])
+            assert stream_id == "s1"
+            assert [get_index(event) for event in events] == [2]
+
+            # Event IDs keep increasing after a restart
+            (event_id,) = await store(event_store, "s1", 3)
+            assert int(event_id) > int(event_ids[1])
+        finally:
+            event_store.close()
+
+    anyio.run(main)
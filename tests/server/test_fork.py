@@ -0,0 +1,251 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from functools import partial
+
+import anyio
+import click
+import pytest
+
+from pycli_mcp.execution.interface import ExecutionResult
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import TOOL_NAME_ENV_VAR, CommandMCPServer
+from tests.server.utils import call_tool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires `os.fork`")
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    click.echo(f"Hello, {name}!")
+    click.echo(f"tool={os.environ.get(TOOL_NAME_ENV_VAR)} pid={os.getpid() != os.getppid()}", err=True)
+
+
+@cli.command()
+@click.argument("code", type=int)
+def fail(*, code: int) -> None:
+    click.echo("failing")
+    sys.exit(code)
+
+
+def get_server() -> CommandMCPServer:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    executor = ForkServerExecutor(f"{__name__}:cli")
+    return CommandMCPServer([CommandQuery(cli, aggregate="none", executor=executor)])
+
+
+def test_output() -> None:
+    result = call_tool(get_server(), "cli.greet", {"name": "foo"})
+
+    assert not result.isError
+    assert result.content[0].text == "Hello, foo!\ntool=cli.greet pid=True\n"  # type: ignore[union-attr]
+
+
+@cli.command()
+def where() -> None:
+    click.echo(os.getcwd())
+    click.echo(os.environ.get("PROFILE_TEST_SECRET", "unset"))
+
+
+def test_profile(monkeypatch, tmp_path) -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+    from pycli_mcp.execution.profile import ExecutionProfile
+
+    monkeypatch.setenv("PROFILE_TEST_SECRET", "1")
+    profile = ExecutionProfile(env_exclude=r"SECRET", cwd=tmp_path)
+    executor = ForkServerExecutor(f"{__name__}:cli")
+    server = CommandMCPServer([CommandQuery(cli, aggregate="none", executor=executor, profile=profile)])
+    result = call_tool(server, "cli.where")
+
+    assert not result.isError
+    assert result.content[0].text.splitlines() == [os.path.realpath(tmp_path), "unset"]  # type: ignore[union-attr]
+
+
+def test_exit_code() -> None:
+    result = call_tool(get_server(), "cli.fail", {"code": 3})
+
+    assert result.isError
+    assert result.content[0].text == (  # type: ignore[union-attr]
+        "failing\n\nThis command exited with non-zero exit code `3`: ['cli', 'fail', '--', '3']"
+    )
+
+
+def test_concurrent_calls() -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    async def main() -> list[str]:
+        executor = ForkServerExecutor(f"{__name__}:cli")
+        await executor.start()
+        try:
+            results: list[str] = []
+
+            async def run(name: str) -> None:
+                result = await executor.execute(["cli", "greet", "--name", name], env={})
+                results.append(result.output.splitlines()[0])
+
+            async with anyio.create_task_group() as tg:
+                for i in range(10):
+                    tg.start_soon(run, str(i))
+
+            return results
+        finally:
+            await executor.stop()
+
+    assert sorted(anyio.run(main)) == sorted(f"Hello, {i}!" for i in range(10))
+
+
+def test_invalid_spec() -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    async def main() -> None:
+        await ForkServerExecutor(f"{__name__}:missing").start()
+
+    with pytest.raises(RuntimeError, match="AttributeError"):
+        anyio.run(main)
+
+
+@cli.command()
+def hang() -> None:
+    click.echo("started")
+    time.sleep(60)
+
+
+def test_timeout() -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    async def main() -> tuple[float, ExecutionResult]:
+        executor = ForkServerExecutor(f"{__name__}:cli", grace_period=1)
+        await executor.start()
+        try:
+            start = time.monotonic()
+            result = await executor.execute(["cli", "hang"], env={}, timeout=0.5)
+            return time.monotonic() - start, result
+        finally:
+            await executor.stop()
+
+    elapsed, result = anyio.run(main)
+    assert elapsed < 5
+    assert result.timed_out
+    assert result.output == "started\n"
+
+
+@cli.command()
+def detach() -> None:
+    subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"], start_new_session=True)
+    click.echo("started")
+    time.sleep(60)
+
+
+def test_timeout_output_held_open() -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    async def main() -> tuple[float, ExecutionResult]:
+        executor = ForkServerExecutor(f"{__name__}:cli", grace_period=0.5)
+        await executor.start()
+        try:
+            start = time.monotonic()
+            result = await executor.execute(["cli", "detach"], env={}, timeout=0.5)
+            return time.monotonic() - start, result
+        finally:
+            await executor.stop()
+
+    # The process in the new session is not stopped and keeps the output pipe open
+    elapsed, result = anyio.run(main)
+    assert elapsed < 5
+    assert result.timed_out
+    assert result.output == "started\n"
+
+
+@cli.command()
+def report_pid() -> None:
+    click.echo(os.getpid())
+    time.sleep(60)
+
+
+def test_failing_callback_kills_process() -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    pids: list[int] = []
+
+    async def on_output(chunk: bytes) -> None:
+        pids.append(int(chunk))
+        msg = "callback failed"
+        raise RuntimeError(msg)
+
+    async def main() -> float:
+        executor = ForkServerExecutor(f"{__name__}:cli", grace_period=1)
+        await executor.start()
+        try:
+            start = time.monotonic()
+            with pytest.raises(RuntimeError, match="callback failed"):
+                await executor.execute(["cli", "report-pid"], env={}, on_output=on_output)
+        finally:
+            await executor.stop()
+
+        return time.monotonic() - start
+
+    assert anyio.run(main) < 5
+    with pytest.raises(ProcessLookupError):
+        os.kill(pids[0], 0)
+
+
+@cli.command()
+@click.argument("path")
+def record_pid(*, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+
+    time.sleep(60)
+
+
+def test_cancellation_before_fork(tmp_path) -> None:
+    from pycli_mcp.execution.fork import ForkServerExecutor
+
+    path = tmp_path / "pid"
+
+    async def main() -> bool:
+        executor = ForkServerExecutor(f"{__name__}:cli", grace_period=1)
+        await executor.start()
+        try:
+            # The call is cancelled as soon as the request is sent, before the PID is reported
+            with anyio.CancelScope() as scope:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(partial(executor.execute, ["cli", "record-pid", str(path)], env={}))
+                    await anyio.lowlevel.checkpoint()
+                    scope.cancel()
+
+            # The command may be stopped before it records its PID
+            with anyio.move_on_after(2):
+                while not path.exists() or not path.read_text(encoding="utf-8"):
+                    await anyio.sleep(0.01)
+
+            pid = path.read_text(encoding="utf-8") if path.exists() else ""
+            if not pid:
+                return True
+
+            with anyio.move_on_after(5):
+                while True:
+                    try:
+                        os.kill(int(pid), 0)
+                    except ProcessLookupError:
+                        return True
+
+                    await anyio.sleep(0.01)
+
+            return False
+        finally:
+            await executor.stop()
+
+    assert anyio.run(main)
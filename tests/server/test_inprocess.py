@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import click
+import pytest
+import typer
+
+from pycli_mcp.execution.inprocess import InProcessExecutor
+from pycli_mcp.execution.interface import ExecutionResult
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.execution.profile import ExecutionProfile
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import TOOL_NAME_ENV_VAR, CommandMCPServer
+from tests.server.utils import call_tool
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    click.echo(f"Hello, {name}!")
+    click.echo(f"tool={os.environ.get(TOOL_NAME_ENV_VAR)}", err=True)
+
+
+@cli.command()
+@click.argument("code", type=int)
+def fail(*, code: int) -> None:
+    click.echo("failing")
+    click.get_current_context().exit(code)
+
+
+@cli.command()
+@click.argument("count", type=click.IntRange(1, 3))
+def pick(*, count: int) -> None:
+    click.echo(count)
+
+
+@cli.command()
+def crash() -> None:
+    msg = "boom"
+    raise RuntimeError(msg)
+
+
+def get_server() -> CommandMCPServer:
+    return CommandMCPServer([CommandQuery(cli, aggregate="none", executor=InProcessExecutor(cli))])
+
+
+def test_output() -> None:
+    result = call_tool(get_server(), "cli.greet", {"name": "foo"})
+
+    assert not result.isError
+    assert result.content[0].text == "Hello, foo!\ntool=cli.greet\n"  # type: ignore[union-attr]
+    assert TOOL_NAME_ENV_VAR not in os.environ
+
+
+def test_exit_code() -> None:
+    result = call_tool(get_server(), "cli.fail", {"code": 3})
+
+    assert result.isError
+    assert result.content[0].text == (  # type: ignore[union-attr]
+        "failing\n\nThis command exited with non-zero exit code `3`: ['cli', 'fail', '--', '3']"
+    )
+
+
+def test_usage_error() -> None:
+    result = call_tool(get_server(), "cli.pick", {"count": "9"})
+
+    assert result.isError
+    text = result.content[0].text  # type: ignore[union-attr]
+    assert "Error: Invalid value for 'COUNT'" in text
+    assert "non-zero exit code `2`" in text
+
+
+def test_exception() -> None:
+    result = call_tool(get_server(), "cli.crash")
+
+    assert result.isError
+    text = result.content[0].text  # type: ignore[union-attr]
+    assert "RuntimeError: boom" in text
+    assert "non-zero exit code `1`" in text
+
+
+def test_typer() -> None:
+    app = typer.Typer()
+
+    @app.command()
+    def main(name: str) -> None:
+        print(f"Hello, {name}!")
+
+    server = CommandMCPServer([CommandQuery(app, name="app", aggregate="none", executor=InProcessExecutor(app))])
+    result = call_tool(server, "app", {"name": "foo"})
+
+    assert not result.isError
+    assert result.content[0].text == "Hello, foo!\n"  # type: ignore[union-attr]
+
+
+def test_unsupported() -> None:
+    import argparse
+
+    with pytest.raises(NotImplementedError, match="only supported for Click and Typer commands"):
+        InProcessExecutor(argparse.ArgumentParser())
+
+
+def test_concurrent_executors(tmp_path) -> None:
+    started = threading.Event()
+
+    @click.command()
+    @click.argument("name")
+    def slow(*, name: str) -> None:
+        click.echo(f"{name}-start")
+        started.set()
+        time.sleep(0.2)
+        click.echo(f"{name}-end cwd={os.path.basename(os.getcwd())} var={os.environ.get('FOO')}")
+
+    profile = ExecutionProfile(cwd=tmp_path).resolve()
+    server_cwd = os.getcwd()
+    original_streams = sys.stdin, sys.stdout, sys.stderr
+    script = "import os; print(os.getcwd())"
+
+    async def main() -> list[ExecutionResult]:
+        first = asyncio.ensure_future(InProcessExecutor(slow).execute(["slow", "A"], env={"FOO": "a"}, profile=profile))
+        await asyncio.to_thread(started.wait)
+        # Commands started while an in-process command runs inherit the environment of the server
+        subprocess_result = await SubprocessExecutor().execute([sys.executable, "-c", script], env={})
+        second = InProcessExecutor(slow).execute(["slow", "B"], env={"FOO": "b"})
+        return [await first, await second, subprocess_result]
+
+    first, second, subprocess_result = asyncio.run(main())
+
+    assert first.output == f"A-start\nA-end cwd={tmp_path.name} var=a\n"
+    assert second.output == f"B-start\nB-end cwd={os.path.basename(server_cwd)} var=b\n"
+    assert subprocess_result.output.strip() == server_cwd
+    assert (sys.stdin, sys.stdout, sys.stderr) == original_streams
+    assert os.getcwd() == server_cwd
+    assert "FOO" not in os.environ
+
+
+def test_lock_wait_counts_against_timeout() -> None:
+    release = threading.Event()
+
+    @click.command()
+    def hang() -> None:
+        release.wait(5)
+
+    executor = InProcessExecutor(hang)
+
+    async def main() -> tuple[ExecutionResult, ExecutionResult, float]:
+        first = await executor.execute(["hang"], env={}, timeout=0.1)
+        start = time.monotonic()
+        second = await executor.execute(["hang"], env={}, timeout=0.2)
+        elapsed = time.monotonic() - start
+        release.set()
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(main())
+    assert first.timed_out
+    assert second.timed_out
+    assert elapsed < 1
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import anyio
+import click
+import httpx
+import pytest
+
+from pycli_mcp.execution.inprocess import InProcessExecutor
+from pycli_mcp.execution.interface import ExecutionResult
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.metrics import CONTENT_TYPE, Histogram, ServerMetrics
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import call_tool
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    click.echo(f"Hello, {name}!")
+
+
+@cli.command()
+@click.argument("code", type=int)
+def fail(*, code: int) -> None:
+    click.get_current_context().exit(code)
+
+
+def get_server() -> CommandMCPServer:
+    return CommandMCPServer([CommandQuery(cli, aggregate="none", executor=InProcessExecutor(cli))])
+
+
+def test_histogram() -> None:
+    histogram = Histogram((1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(14.5)
+    assert histogram.render("latency", 'tool="foo"') == [
+        'latency_bucket{tool="foo",le="1"} 2',
+        'latency_bucket{tool="foo",le="5"} 3',
+        'latency_bucket{tool="foo",le="+Inf"} 4',
+        'latency_sum{tool="foo"} 14.5',
+        'latency_count{tool="foo"} 4',
+    ]
+
+
+def test_tool_metrics() -> None:
+    metrics = ServerMetrics()
+    tool_metrics = metrics.get_tool_metrics('a"b')
+    assert metrics.get_tool_metrics('a"b') is tool_metrics
+
+    tool_metrics.start(0.1)
+    assert tool_metrics.in_flight == 1
+    tool_metrics.finish(ExecutionResult(output="é", exit_code=2, elided=10, started=1.5), 1.0, 4.0)
+    tool_metrics.start(0)
+    tool_metrics.finish(ExecutionResult(output="", exit_code=1, timed_out=True), 1.0, 2.0)
+
+    assert tool_metrics.in_flight == 0
+    assert tool_metrics.exit_codes == {2: 1}
+    assert tool_metrics.timeouts == 1
+    assert tool_metrics.histograms["queue_wait"].count == 2
+    assert tool_metrics.histograms["spawn"].sum == pytest.approx(0.5)
+    assert tool_metrics.histograms["run"].sum == pytest.approx(3.5)
+    assert tool_metrics.histograms["output"].sum == 12
+
+    text = metrics.render()
+    assert 'pycli_mcp_tool_exit_codes_total{tool="a\\"b",code="2"} 1\n' in text
+    assert 'pycli_mcp_tool_timeouts_total{tool="a\\"b"} 1\n' in text
+    assert 'pycli_mcp_tool_in_flight{tool="a\\"b"} 0\n' in text
+
+
+def test_tool_calls() -> None:
+    server = get_server()
+    call_tool(server, "cli.greet", {"name": "foo"})
+    call_tool(server, "cli.fail", {"code": 3})
+    call_tool(server, "cli.fail", {"code": 3})
+
+    greet_metrics = server.metrics.get_tool_metrics("cli.greet")
+    assert greet_metrics.exit_codes == {0: 1}
+    assert greet_metrics.histograms["output"].sum == len("Hello, foo!\n")
+    for key in ("construct", "queue_wait", "spawn", "run"):
+        assert greet_metrics.histograms[key].count == 1
+
+    assert server.metrics.get_tool_metrics("cli.fail").exit_codes == {3: 2}
+
+
+def test_endpoint() -> None:
+    server = get_server()
+    call_tool(server, "cli.greet", {"name": "foo"})
+
+    async def main() -> httpx.Response:
+        app = server.create_app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/metrics")
+
+    response = anyio.run(main)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert "# TYPE pycli_mcp_tool_run_seconds histogram\n" in response.text
+    assert 'pycli_mcp_tool_run_seconds_count{tool="cli.greet"} 1\n' in response.text
+    assert 'pycli_mcp_tool_exit_codes_total{tool="cli.greet",code="0"} 1\n' in response.text
+    assert 'pycli_mcp_catalog_build_seconds{query="0",command="cli"} ' in response.text
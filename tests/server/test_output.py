@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+
+import pytest
+
+from pycli_mcp.execution.output import OutputCapture, OutputLimit, RingBuffer
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import call_tool
+
+
+@pytest.mark.parametrize(
+    ("value", "head", "tail"),
+    [
+        pytest.param("100", 50, 50, id="total"),
+        pytest.param("7", 3, 4, id="odd total"),
+        pytest.param("10:20", 10, 20, id="head and tail"),
+        pytest.param("0:20", 0, 20, id="tail only"),
+    ],
+)
+def test_parse_limit(value: str, head: int, tail: int) -> None:
+    limit = OutputLimit.parse(value)
+    assert limit.head == head
+    assert limit.tail == tail
+
+
+def test_parse_limit_invalid() -> None:
+    with pytest.raises(ValueError, match="Invalid output limit"):
+        OutputLimit.parse("foo")
+
+
+def test_ring_buffer() -> None:
+    buffer = RingBuffer(5)
+    buffer.write(b"abc")
+    assert buffer.getvalue() == b"abc"
+    buffer.write(b"def")
+    assert buffer.getvalue() == b"bcdef"
+    buffer.write(b"g")
+    assert buffer.getvalue() == b"cdefg"
+    buffer.write(b"0123456789")
+    assert buffer.getvalue() == b"56789"
+
+
+def test_capture_unlimited() -> None:
+    capture = OutputCapture()
+    for chunk in (b"foo", b"bar", b"baz"):
+        capture.write(chunk)
+
+    assert capture.getvalue() == "foobarbaz"
+    assert capture.elided == 0
+    assert capture.total == 9
+
+
+def test_capture_within_limit() -> None:
+    capture = OutputCapture(OutputLimit(4, 4))
+    capture.write(b"foobar")
+    capture.write(b"ba")
+
+    assert capture.getvalue() == "foobarba"
+    assert capture.elided == 0
+
+
+def test_capture_elided() -> None:
+    capture = OutputCapture(OutputLimit(4, 3))
+    for _ in range(1000):
+        capture.write(b"0123456789")
+
+    assert capture.total == 10000
+    assert capture.elided == 10000 - 7
+    assert capture.getvalue() == f"0123\n[... {10000 - 7} bytes of output elided ...]\n789"
+
+
+def test_capture_multibyte_character_across_buffers() -> None:
+    capture = OutputCapture(OutputLimit(1, 4))
+    capture.write("aéb".encode())
+
+    assert capture.getvalue() == "aéb"
+
+
+def test_executor_output_limit() -> None:
+    script = "import sys; sys.stdout.write('start' + 'x' * 10_000_000 + 'end')"
+    result = asyncio.run(
+        SubprocessExecutor().execute([sys.executable, "-c", script], env={}, output_limit=OutputLimit(5, 3))
+    )
+
+    assert result.exit_code == 0
+    assert result.elided == 10_000_000
+    assert result.output == "start\n[... 10000000 bytes of output elided ...]\nend"
+
+
+def test_tool_output_limits() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    query = CommandQuery(parser, name=sys.executable, aggregate="none")
+    server = CommandMCPServer([query])
+    tool_name = next(iter(server.commands))
+    server = CommandMCPServer(
+        [query],
+        output_limit=OutputLimit(1, 1),
+        tool_output_limits={tool_name: OutputLimit(2, 2)},
+    )
+
+    result = call_tool(server, tool_name, {"code": "print('abcdef', end='')"})
+    assert not result.isError
+    assert result.content[0].text == "ab\n[... 2 bytes of output elided ...]\nef"  # type: ignore[union-attr]
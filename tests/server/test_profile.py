@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+import click
+import pytest
+
+from pycli_mcp.execution.inprocess import InProcessExecutor
+from pycli_mcp.execution.profile import ExecutionProfile
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import TOOL_NAME_ENV_VAR, CommandMCPServer
+from tests.server.utils import call_tool
+
+SCRIPT = (
+    "import os; "
+    "print(os.getcwd()); "
+    "print(sorted(k for k in os.environ if k.startswith('PROFILE_TEST_'))); "
+    f"print(os.environ['{TOOL_NAME_ENV_VAR}'])"
+)
+
+
+@click.command()
+def show() -> None:
+    exec(SCRIPT)  # noqa: S102
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    return parser
+
+
+def test_environment_filters(monkeypatch) -> None:
+    monkeypatch.setenv("PROFILE_TEST_KEEP", "1")
+    monkeypatch.setenv("PROFILE_TEST_SECRET", "1")
+    monkeypatch.setenv("UNRELATED", "1")
+    profile = ExecutionProfile(env_include=r"^PROFILE_TEST_", env_exclude=r"SECRET", env={"PROFILE_TEST_EXTRA": "2"})
+    resolved = profile.resolve()
+
+    assert dict(resolved.env) == {"PROFILE_TEST_KEEP": "1", "PROFILE_TEST_EXTRA": "2"}
+    assert resolved.executable is None
+    assert resolved.cwd is None
+
+    with pytest.raises(TypeError):
+        resolved.env["FOO"] = "bar"  # type: ignore[index]
+
+
+def test_build_environment() -> None:
+    resolved = ExecutionProfile(env_include=r"^$", env={"FOO": "1", "BAR": "2"}).resolve()
+
+    assert resolved.build_environment({"FOO": None, "BAZ": "3"}) == {"BAR": "2", "BAZ": "3"}
+    assert dict(resolved.env) == {"FOO": "1", "BAR": "2"}
+
+
+def test_resolve_executable() -> None:
+    resolved = ExecutionProfile().resolve(os.path.basename(sys.executable))
+
+    assert resolved.executable is not None
+    assert os.path.isabs(resolved.executable)
+
+
+def test_missing_executable() -> None:
+    with pytest.raises(FileNotFoundError, match="Executable not found: pycli-mcp-missing"):
+        ExecutionProfile().resolve("pycli-mcp-missing")
+
+
+def test_missing_working_directory(tmp_path) -> None:
+    with pytest.raises(NotADirectoryError, match="Working directory does not exist"):
+        ExecutionProfile(cwd=tmp_path / "missing").resolve()
+
+
+def test_server_fails_at_startup() -> None:
+    server = CommandMCPServer([CommandQuery(get_parser(), name="pycli-mcp-missing", aggregate="none")])
+
+    with pytest.raises(FileNotFoundError, match="Executable not found: pycli-mcp-missing"):
+        _ = server.commands
+
+
+def test_subprocess(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("PROFILE_TEST_SECRET", "1")
+    profile = ExecutionProfile(env_exclude=r"SECRET", env={"PROFILE_TEST_EXTRA": "1"}, cwd=tmp_path)
+    query = CommandQuery(get_parser(), name=os.path.basename(sys.executable), aggregate="none", profile=profile)
+    server = CommandMCPServer([query])
+    tool_name, command = next(iter(server.commands.items()))
+    assert command.profile.executable is not None
+    assert os.path.isabs(command.profile.executable)
+
+    result = call_tool(server, tool_name, {"code": SCRIPT})
+    assert not result.isError
+    assert result.content[0].text.splitlines() == [  # type: ignore[union-attr]
+        os.path.realpath(tmp_path),
+        "['PROFILE_TEST_EXTRA']",
+        tool_name,
+    ]
+
+
+def test_inprocess(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("PROFILE_TEST_SECRET", "1")
+    original_cwd = os.getcwd()
+    profile = ExecutionProfile(env_exclude=r"SECRET", env={"PROFILE_TEST_EXTRA": "1"}, cwd=tmp_path)
+    query = CommandQuery(show, name="show", executor=InProcessExecutor(show), profile=profile)
+    server = CommandMCPServer([query])
+    tool_name, command = next(iter(server.commands.items()))
+    assert command.profile.executable is None
+
+    result = call_tool(server, tool_name)
+    assert not result.isError
+    assert result.content[0].text.splitlines() == [  # type: ignore[union-attr]
+        os.path.realpath(tmp_path),
+        "['PROFILE_TEST_EXTRA']",
+        tool_name,
+    ]
+    assert os.getcwd() == original_cwd
+    assert os.environ["PROFILE_TEST_SECRET"] == "1"
+    assert TOOL_NAME_ENV_VAR not in os.environ
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import sys
+
+import anyio
+import click
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.types import CallToolResult, ListToolsResult, TextContent
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("--name", required=True)
+def greet(*, name: str) -> None:
+    click.echo(f"Hello, {name}!")
+
+
+def test_stdio_transport() -> None:
+    parameters = StdioServerParameters(
+        command=sys.executable,
+        args=[
+            "-m",
+            "pycli_mcp",
+            f"{__name__}:cli",
+            "--aggregate",
+            "none",
+            "--executor",
+            "inprocess",
+            "--transport",
+            "stdio",
+        ],
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+
+    async def main() -> tuple[ListToolsResult, CallToolResult]:
+        with anyio.fail_after(30), open(os.devnull, "w", encoding="utf-8") as errlog:  # noqa: ASYNC230
+            async with stdio_client(parameters, errlog=errlog) as streams, ClientSession(*streams) as client:
+                await client.initialize()
+                tools = await client.list_tools()
+                result = await client.call_tool("cli.greet", {"name": "World"})
+
+        return tools, result
+
+    tools, result = anyio.run(main)
+
+    assert [tool.name for tool in tools.tools] == ["cli.greet"]
+    assert not result.isError
+    assert isinstance(result.content[0], TextContent)
+    assert result.content[0].text == "Hello, World!\n"
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import anyio
+
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import connect
+
+SCRIPT = "import time; print('first', flush=True); time.sleep(1); print('second')"
+
+
+def get_server(*, streaming: bool) -> CommandMCPServer:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    query = CommandQuery(parser, name=sys.executable, aggregate="none")
+    return CommandMCPServer([query], streaming=streaming)
+
+
+def test_executor_output_before_exit() -> None:
+    async def main() -> tuple[list[tuple[bytes, float]], float, str]:
+        chunks: list[tuple[bytes, float]] = []
+
+        async def on_output(chunk: bytes) -> None:
+            chunks.append((chunk, time.monotonic()))
+
+        result = await SubprocessExecutor().execute([sys.executable, "-c", SCRIPT], env={}, on_output=on_output)
+        return chunks, time.monotonic(), result.output
+
+    chunks, finished, output = anyio.run(main)
+    assert b"".join(chunk for chunk, _ in chunks) == output.encode()
+    assert chunks[0][0].strip() == b"first"
+    assert finished - chunks[0][1] > 0.5
+
+
+def test_progress_notifications() -> None:
+    server = get_server(streaming=True)
+    tool_name = next(iter(server.commands))
+
+    async def main() -> tuple[list[tuple[float, str | None, float]], float, str]:
+        notifications: list[tuple[float, str | None, float]] = []
+
+        async def on_progress(progress: float, total: float | None, message: str | None) -> None:  # noqa: ARG001
+            notifications.append((progress, message, time.monotonic()))
+
+        async with connect(server) as client:
+            result = await client.call_tool(tool_name, {"code": SCRIPT}, progress_callback=on_progress)
+
+        return notifications, time.monotonic(), result.content[0].text  # type: ignore[union-attr]
+
+    notifications, finished, output = anyio.run(main)
+    assert "".join(message or "" for _, message, _ in notifications) == output
+    assert notifications[0][1] is not None
+    assert notifications[0][1].startswith("first")
+    assert finished - notifications[0][2] > 0.5
+    assert [progress for progress, _, _ in notifications] == sorted(progress for progress, _, _ in notifications)
+
+
+def test_no_progress_notifications_by_default() -> None:
+    server = get_server(streaming=False)
+    tool_name = next(iter(server.commands))
+
+    async def main() -> tuple[list[float], str]:
+        notifications: list[float] = []
+
+        async def on_progress(progress: float, total: float | None, message: str | None) -> None:  # noqa: ARG001
+            notifications.append(progress)
+
+        async with connect(server) as client:
+            result = await client.call_tool(tool_name, {"code": "print('done')"}, progress_callback=on_progress)
+
+        return notifications, result.content[0].text  # type: ignore[union-attr]
+
+    notifications, output = anyio.run(main)
+    assert not notifications
+    assert output == "done\n"
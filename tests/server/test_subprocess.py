@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+
+import anyio
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, CancelledNotification, CancelledNotificationParams, ClientNotification
+
+from pycli_mcp.execution.admission import AdmissionController
+from pycli_mcp.execution.interface import ExecutionResult
+from pycli_mcp.execution.process import SubprocessExecutor
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import DEADLINE_ENV_VAR, CommandMCPServer
+from tests.server.utils import call_tool, connect
+
+
+def test_output() -> None:
+    script = "import os, sys; print('out'); print(os.environ['FOO'], file=sys.stderr); sys.exit(3)"
+    result = asyncio.run(SubprocessExecutor().execute([sys.executable, "-c", script], env={"FOO": "bar"}))
+
+    assert result.output.splitlines() == ["out", "bar"]
+    assert result.exit_code == 3
+
+
+def test_unset_environment_variable(monkeypatch) -> None:
+    monkeypatch.setenv("FOO", "bar")
+    script = "import os; print(os.environ.get('FOO', 'unset'))"
+    result = asyncio.run(SubprocessExecutor().execute([sys.executable, "-c", script], env={"FOO": None}))
+
+    assert result.output.strip() == "unset"
+    assert result.exit_code == 0
+
+
+def test_no_stdin() -> None:
+    script = "import sys; print(repr(sys.stdin.read()))"
+    result = asyncio.run(SubprocessExecutor().execute([sys.executable, "-c", script], env={}))
+
+    assert result.output.strip() == "''"
+
+
+def test_concurrency_not_limited_by_threads() -> None:
+    executor = SubprocessExecutor()
+    command = [sys.executable, "-c", "import time; time.sleep(1)"]
+    calls = 2 * min(32, (os.cpu_count() or 1) + 4)
+
+    async def main() -> float:
+        await executor.start()
+        try:
+            start = time.monotonic()
+            await asyncio.gather(*(executor.execute(command, env={}) for _ in range(calls)))
+            return time.monotonic() - start
+        finally:
+            await executor.stop()
+
+    # Thread-offloaded calls would take at least two rounds of the default thread pool
+    assert asyncio.run(main()) < 2
+
+
+def test_cancellation_kills_process() -> None:
+    executor = SubprocessExecutor()
+    command = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+    async def main() -> float:
+        start = time.monotonic()
+        task = asyncio.create_task(executor.execute(command, env={}))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        elapsed = time.monotonic() - start
+        await executor.stop()
+        return elapsed
+
+    assert asyncio.run(main()) < 5
+
+
+def test_failing_callback_kills_process() -> None:
+    executor = SubprocessExecutor(grace_period=1)
+    command = [sys.executable, "-c", "import os, time; print(os.getpid(), flush=True); time.sleep(60)"]
+    pids: list[int] = []
+
+    async def on_output(chunk: bytes) -> None:
+        pids.append(int(chunk))
+        msg = "callback failed"
+        raise RuntimeError(msg)
+
+    async def main() -> float:
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="callback failed"):
+            await executor.execute(command, env={}, on_output=on_output)
+
+        await executor.stop()
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 5
+    with pytest.raises(ProcessLookupError):
+        os.kill(pids[0], 0)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires process groups")
+def test_timeout_kills_process_group() -> None:
+    executor = SubprocessExecutor(grace_period=1)
+    script = """
+import subprocess, sys, time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print("started", flush=True)
+time.sleep(60)
+"""
+
+    async def main() -> tuple[float, ExecutionResult]:
+        start = time.monotonic()
+        result = await executor.execute([sys.executable, "-c", script], env={}, timeout=1)
+        return time.monotonic() - start, result
+
+    # The grandchild would otherwise keep the output pipe open
+    elapsed, result = asyncio.run(main())
+    assert elapsed < 10
+    assert result.timed_out
+    assert result.output == "started\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires sessions")
+def test_timeout_output_held_open() -> None:
+    executor = SubprocessExecutor(grace_period=0.5)
+    script = """
+import subprocess, sys, time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"], start_new_session=True)
+print("started", flush=True)
+time.sleep(60)
+"""
+
+    async def main() -> tuple[float, ExecutionResult]:
+        start = time.monotonic()
+        result = await executor.execute([sys.executable, "-c", script], env={}, timeout=1)
+        return time.monotonic() - start, result
+
+    # The process in the new session is not stopped and keeps the output pipe open
+    elapsed, result = asyncio.run(main())
+    assert elapsed < 5
+    assert result.timed_out
+    assert result.output == "started\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires signals")
+def test_timeout_grace_period() -> None:
+    executor = SubprocessExecutor(grace_period=0.5)
+    script = """
+import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+print("started", flush=True)
+time.sleep(60)
+"""
+
+    async def main() -> ExecutionResult:
+        return await executor.execute([sys.executable, "-c", script], env={}, timeout=1)
+
+    result = asyncio.run(main())
+    assert result.timed_out
+    assert result.exit_code == -signal.SIGKILL
+
+
+def test_server_timeout() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    server = CommandMCPServer([CommandQuery(parser, name=sys.executable, aggregate="none")], timeout=1)
+    tool_name = next(iter(server.commands))
+    script = (
+        f"import os, time; print(float(os.environ['{DEADLINE_ENV_VAR}']) > time.time(), flush=True); time.sleep(60)"
+    )
+
+    result = call_tool(server, tool_name, {"code": script})
+    assert result.isError
+    assert result.content[0].text.startswith("True\n\nThis command timed out after 1 seconds: ")  # type: ignore[union-attr]
+
+
+def test_tool_timeout_override() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    query = CommandQuery(parser, name=sys.executable, aggregate="none")
+    server = CommandMCPServer([query], timeout=0.1)
+    tool_name = next(iter(server.commands))
+    server = CommandMCPServer([query], timeout=0.1, tool_timeouts={tool_name: 30})
+
+    result = call_tool(server, tool_name, {"code": "import time; time.sleep(0.5); print('done')"})
+    assert not result.isError
+    assert result.content[0].text == "done\n"  # type: ignore[union-attr]
+
+
+def test_server_cancellation() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code")
+    query = CommandQuery(parser, name=sys.executable, aggregate="none")
+    server = CommandMCPServer([query], admission=AdmissionController(max_concurrency=1))
+    tool_name = next(iter(server.commands))
+
+    async def main() -> tuple[float, CallToolResult]:
+        async with connect(server) as client, anyio.create_task_group() as tg:
+
+            async def call_cancelled() -> None:
+                with pytest.raises(McpError, match="Request cancelled"):
+                    await client.call_tool(tool_name, {"code": "import time; time.sleep(60)"})
+
+            request_id = client._request_id  # noqa: SLF001
+            tg.start_soon(call_cancelled)
+            while not server.admission.running:
+                await anyio.sleep(0.01)
+
+            start = time.monotonic()
+            params = CancelledNotificationParams(requestId=request_id)
+            await client.send_notification(ClientNotification(CancelledNotification(params=params)))
+            result = await client.call_tool(tool_name, {"code": "print('done')"})
+
+        return time.monotonic() - start, result
+
+    # The slot is released without waiting for the cancelled command to exit
+    elapsed, result = anyio.run(main)
+    assert elapsed < 5
+    assert not result.isError
+    assert result.content[0].text == "done\n"  # type: ignore[union-attr]
@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any
+
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.server import CommandMCPServer
+from pycli_mcp.tracing import NOOP_SPAN, Span, Tracer, get_current_span
+from tests.server.utils import call_tool
+
+
+class RecordingSpan(Span):
+    def __init__(self, records: list[tuple[str, ...]], name: str, attributes: dict[str, Any] | None) -> None:
+        self.records = records
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.records.append(("start", name))
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        return RecordingSpan(self.records, f"{self.name}/{name}", attributes)
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:  # noqa: ARG002
+        self.records.append(("event", f"{self.name}:{name}"))
+
+    def end(self, error: BaseException | None = None) -> None:
+        self.records.append(("end", self.name) if error is None else ("error", self.name, type(error).__name__))
+
+
+class RecordingTracer(Tracer):
+    def __init__(self) -> None:
+        self.records: list[tuple[str, ...]] = []
+        self.spans: list[RecordingSpan] = []
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        span = RecordingSpan(self.records, name, attributes)
+        self.spans.append(span)
+        return span
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", dest="code", required=True)
+    return parser
+
+
+def test_noop() -> None:
+    assert Tracer().start_span("foo") is NOOP_SPAN
+    assert get_current_span() is NOOP_SPAN
+    with NOOP_SPAN.start_span("bar") as span:
+        span.add_event("baz")
+
+    assert span is NOOP_SPAN
+
+
+def test_collect() -> None:
+    tracer = RecordingTracer()
+    server = CommandMCPServer([CommandQuery(get_parser(), name=sys.executable, aggregate="none")], tracer=tracer)
+    assert len(server.commands) == 1
+
+    (span,) = tracer.spans
+    assert span.name == "collect"
+    assert span.attributes == {"query": "0", "command": sys.executable, "tools": 1}
+    assert tracer.records == [("start", "collect"), ("end", "collect")]
+
+
+def test_tool_call() -> None:
+    tracer = RecordingTracer()
+    server = CommandMCPServer([CommandQuery(get_parser(), name=sys.executable, aggregate="none")], tracer=tracer)
+    tool_name = next(iter(server.commands))
+    tracer.records.clear()
+
+    result = call_tool(server, tool_name, {"code": "print('foo')"})
+    assert not result.isError
+    assert tracer.records == [
+        ("start", "tools/call"),
+        ("start", "tools/call/validate"),
+        ("end", "tools/call/validate"),
+        ("start", "tools/call/construct"),
+        ("end", "tools/call/construct"),
+        ("start", "tools/call/execute"),
+        ("start", "tools/call/execute/spawn"),
+        ("end", "tools/call/execute/spawn"),
+        ("event", "tools/call/execute:first_byte"),
+        ("event", "tools/call/execute:exit"),
+        ("end", "tools/call/execute"),
+        ("start", "tools/call/serialize"),
+        ("end", "tools/call/serialize"),
+        ("end", "tools/call"),
+    ]
+
+
+def test_validation_error() -> None:
+    tracer = RecordingTracer()
+    server = CommandMCPServer([CommandQuery(get_parser(), name=sys.executable, aggregate="none")], tracer=tracer)
+    tool_name = next(iter(server.commands))
+    tracer.records.clear()
+
+    result = call_tool(server, tool_name, {"unknown": 1})
+    assert result.isError
+    assert tracer.records == [
+        ("start", "tools/call"),
+        ("start", "tools/call/validate"),
+        ("error", "tools/call/validate", "ValueError"),
+        ("start", "tools/call/serialize"),
+        ("end", "tools/call/serialize"),
+        ("end", "tools/call"),
+    ]
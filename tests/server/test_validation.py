@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import Any
+
+import click
+import pytest
+
+from pycli_mcp.metadata.query import CommandQuery
+from pycli_mcp.metadata.validation import ArgumentValidator
+from pycli_mcp.server import CommandMCPServer
+from tests.server.utils import BlockingExecutor, call_tool
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.argument("name")
+@click.option("--count", type=int, default=1)
+@click.option("--ratio", type=float)
+@click.option("--tag", multiple=True)
+@click.option("--color", type=click.Choice(["red", "blue"]))
+@click.option("--verbose", is_flag=True)
+@click.option("--region", type=click.Choice(["us", "eu"]), multiple=True)
+@click.option("--after", type=click.DateTime(), multiple=True)
+@click.option("--pair", type=(str, int))
+@click.argument("extra", nargs=-1)
+def deploy(
+    *,
+    name: str,
+    count: int,
+    ratio: float | None,
+    tag: tuple[str, ...],
+    color: str | None,
+    verbose: bool,
+    region: tuple[str, ...],
+    after: tuple[Any, ...],
+    pair: tuple[str, int] | None,
+    extra: tuple[str, ...],
+) -> None:
+    pass
+
+
+def get_validator() -> ArgumentValidator:
+    (metadata,) = CommandQuery(cli, aggregate="none")
+    return ArgumentValidator(metadata.schema)
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"name": "foo"},
+        {"name": "foo", "count": 2, "ratio": 1, "tag": ["a", "b"], "color": "red", "verbose": True},
+        {"name": "foo", "ratio": 0.5, "color": None, "tag": []},
+        {"name": "foo", "region": ["us", "eu"], "after": ["2020-01-01"]},
+    ],
+)
+def test_valid(arguments: dict[str, Any]) -> None:
+    get_validator()(arguments)
+
+
+@pytest.mark.parametrize(
+    ("arguments", "message"),
+    [
+        (None, "Missing required argument: name"),
+        ({"name": None}, "Missing required argument: name"),
+        ({"name": "foo", "other": 1}, "Unknown argument: other"),
+        ({"name": 1}, "Argument `name` must be of type string, got integer"),
+        ({"name": "foo", "count": "2"}, "Argument `count` must be of type integer, got string"),
+        ({"name": "foo", "count": True}, "Argument `count` must be of type integer, got boolean"),
+        ({"name": "foo", "ratio": "1"}, "Argument `ratio` must be of type number, got string"),
+        ({"name": "foo", "tag": "a"}, "Argument `tag` must be of type array, got string"),
+        ({"name": "foo", "tag": ["a", 2]}, "Argument `tag` item 1 must be of type string, got integer"),
+        ({"name": "foo", "color": "green"}, "Argument `color` must be one of: red, blue"),
+        ({"name": "foo", "region": "us"}, "Argument `region` must be of type array, got string"),
+        ({"name": "foo", "region": ["us", "asia"]}, "Argument `region` item 1 must be one of: us, eu"),
+        ({"name": "foo", "after": "2020-01-01"}, "Argument `after` must be of type array, got string"),
+        ({"name": "foo", "verbose": "yes"}, "Argument `verbose` must be of type boolean, got string"),
+    ],
+)
+def test_invalid(arguments: dict[str, Any] | None, message: str) -> None:
+    with pytest.raises(ValueError, match=f"^{message}$"):
+        get_validator()(arguments)
+
+
+def test_null_arguments() -> None:
+    (metadata,) = CommandQuery(cli, aggregate="none")
+    arguments: dict[str, Any] = {
+        name: None for name, prop in metadata.schema["properties"].items() if prop.get("default", 0) is None
+    }
+    assert sorted(arguments) == ["after", "color", "extra", "pair", "ratio", "region", "tag"]
+    arguments["name"] = "foo"
+    get_validator()(arguments)
+
+    assert metadata.construct(arguments) == ["cli", "deploy", "--", "foo"]
+
+
+def test_server_construction_error(monkeypatch) -> None:
+    executor = BlockingExecutor()
+    server = CommandMCPServer([CommandQuery(cli, aggregate="none", executor=executor)])
+    metadata = server.commands["cli.deploy"].metadata
+
+    def construct(arguments: dict[str, Any] | None = None) -> list[str]:
+        msg = "'int' object is not iterable"
+        raise TypeError(msg)
+
+    monkeypatch.setattr(metadata, "construct", construct)
+    result = call_tool(server, "cli.deploy", {"name": "foo"})
+
+    assert result.isError
+    assert result.content[0].text == "'int' object is not iterable"  # type: ignore[union-attr]
+    assert not executor.commands
+
+
+def test_server_rejects_before_running() -> None:
+    executor = BlockingExecutor()
+    server = CommandMCPServer([CommandQuery(cli, aggregate="none", executor=executor)])
+    result = call_tool(server, "cli.deploy", {"name": "foo", "count": "many"})
+
+    assert result.isError
+    assert result.content[0].text == "Argument `count` must be of type integer, got string"  # type: ignore[union-attr]
+    assert not executor.commands
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2026-present Ofek Lev <oss@ofek.dev>
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import anyio
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from pycli_mcp.execution.interface import CommandExecutor, ExecutionResult
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from mcp.client.session import ClientSession
+    from mcp.types import CallToolResult
+
+    from pycli_mcp.execution.interface import OutputCallback
+    from pycli_mcp.execution.output import OutputLimit
+    from pycli_mcp.execution.profile import ResolvedProfile
+    from pycli_mcp.server import CommandMCPServer
+
+
+@asynccontextmanager
+async def connect(server: CommandMCPServer, **kwargs: Any) -> AsyncIterator[ClientSession]:
+    async with server.executors(), create_connected_server_and_client_session(server.server, **kwargs) as client:
+        yield client
+
+
+def call_tool(server: CommandMCPServer, name: str, arguments: dict[str, Any] | None = None) -> CallToolResult:
+    async def main() -> CallToolResult:
+        async with connect(server) as client:
+            return await client.call_tool(name, arguments)
+
+    return anyio.run(main)
+
+
+class BlockingExecutor(CommandExecutor):
+    """
+    Records the commands it receives and only finishes them once released.
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[list[str]] = []
+        self.running = 0
+        self.released = asyncio.Event()
+
+    async def execute(
+        self,
+        command: list[str],
+        *,
+        env: dict[str, str | None],  # noqa: ARG002
+        timeout: float | None = None,  # noqa: ARG002
+        on_output: OutputCallback | None = None,  # noqa: ARG002
+        output_limit: OutputLimit | None = None,  # noqa: ARG002
+        profile: ResolvedProfile | None = None,  # noqa: ARG002
+    ) -> ExecutionResult:
+        self.commands.append(command)
+        self.running += 1
+        try:
+            await self.released.wait()
+        finally:
+            self.running -= 1
+
+        return ExecutionResult(output=" ".join(command), exit_code=0)
@@ -2,6 +2,9 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+from typing import Any
+
+import pytest
 import typer
 from typer.main import get_command
 
@@ -428,3 +431,76 @@ Options:
         "title": "cli",
         "type": "object",
     }
+
+
+def test_converted_command_reused() -> None:
+    from pycli_mcp.metadata.types.typer import get_typer_command
+
+    app = typer.Typer(add_completion=False)
+    sub_app = typer.Typer()
+    app.add_typer(sub_app, name="sub")
+
+    @app.command()
+    def foo(name: str) -> None:
+        pass
+
+    @sub_app.command()
+    def bar() -> None:
+        pass
+
+    command = get_typer_command(app)
+    assert get_typer_command(app) is command
+    assert [metadata.path for metadata in walk_commands(app, aggregate="none", name="cli")] == [
+        "cli foo",
+        "cli sub bar",
+    ]
+
+    # Registering commands on nested applications invalidates the converted command
+    @sub_app.command()
+    def baz() -> None:
+        pass
+
+    assert get_typer_command(app) is not command
+    assert [metadata.path for metadata in walk_commands(app, aggregate="none", name="cli")] == [
+        "cli foo",
+        "cli sub bar",
+        "cli sub baz",
+    ]
+
+
+def test_callback_inspected_once(monkeypatch) -> None:
+    import typer.utils
+
+    calls: list[str] = []
+    get_params_from_function = typer.utils.get_params_from_function
+
+    def counting_get_params_from_function(func: Any) -> Any:
+        calls.append(func.__name__)
+        return get_params_from_function(func)
+
+    monkeypatch.setattr(typer.utils, "get_params_from_function", counting_get_params_from_function)
+    app = typer.Typer(add_completion=False)
+
+    @app.command()
+    def foo(name: str, count: int = 1, *, verbose: bool = False) -> None:
+        pass
+
+    @app.command()
+    def bar(path: str) -> None:
+        pass
+
+    for aggregate in ("none", "group", "root"):
+        list(walk_commands(app, aggregate=aggregate))  # type: ignore[arg-type]
+
+    assert sorted(calls) == ["bar", "foo"]
+
+
+def test_lazy_not_supported() -> None:
+    app = typer.Typer(add_completion=False)
+
+    @app.command()
+    def cli() -> None:
+        pass
+
+    with pytest.raises(ValueError, match="Lazy loading of subcommands is only supported for Click commands"):
+        list(walk_commands(app, aggregate="root", lazy=True))